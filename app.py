@@ -2,18 +2,29 @@
 GradeFlow - Professional Student Grade Management & Analytics System
 Main application file with modular architecture
 """
+import os
+from datetime import datetime
+
 import streamlit as st
 import pandas as pd
 from config import *
 
 # Import modules from organized folder structure
-from src.core.validators import DataValidator
-from src.core.grade_calculator import GradeCalculator
 from src.core.analytics import Analytics
+from src.core.validators import DataValidator
 from src.ui.ui_components import apply_custom_css
-from src.ui.sidebar import render_sidebar
+from src.ui.sidebar import render_sidebar, render_grade_simulator_section, render_latency_section
 from src.ui.help_components import display_welcome_section
 from src.utils.data_processor import DataProcessor
+from src.utils.data_index import StudentIndex
+from src.utils.expression_filter import ExpressionError
+from src.utils.export_file import ExportFile
+from src.utils.report_cards import ReportCardGenerator
+from src.utils.split_export import SplitExporter
+from src.utils.watch_folder import FolderWatcher
+from src.utils.job_runner import JobRunner
+from src.utils.latency import track_latency
+from src.utils.pipeline import ProcessingPipeline, PIPELINE_STAGES
 
 # Page configuration
 st.set_page_config(
@@ -26,6 +37,7 @@ st.set_page_config(
 # Apply custom CSS
 apply_custom_css()
 
+@track_latency("Full page")
 def main():
     # Main application header
     st.markdown(f'<h1 class="main-header">{APP_ICON} GradeFlow</h1>', unsafe_allow_html=True)
@@ -43,12 +55,16 @@ def render_file_upload_section():
     st.header("📁 Data Upload")
     col1, col2 = st.columns([2, 1])
 
+    read_options = None
     with col1:
         uploaded_file = st.file_uploader(
             "Upload student result file", 
             type=ALLOWED_FILE_TYPES,
             help=f"Supported formats: {', '.join(ALLOWED_FILE_TYPES)}. Required columns: {', '.join(REQUIRED_COLUMNS)}"
         )
+        if uploaded_file is not None and uploaded_file.name.endswith('.xlsx'):
+            read_options = render_excel_options(uploaded_file)
+        render_watch_folder_controls()
 
     with col2:
         if uploaded_file:
@@ -59,43 +75,253 @@ def render_file_upload_section():
             }
             st.json(file_info)
 
+    job_key = None
     if uploaded_file is not None:
-        process_uploaded_file(uploaded_file)
-    else:
+        job_key = submit_processing_job(uploaded_file, read_options)
+
+    render_job_status(job_key)
+    if 'watch_folder' in st.session_state:
+        render_watch_status()
+
+    if st.session_state.get('results'):
+        display_selected_result()
+    elif uploaded_file is None and 'watch_folder' not in st.session_state:
         display_welcome_section()
 
 
-def process_uploaded_file(uploaded_file):
-    """Process uploaded file and display analysis"""
-    with st.spinner("Processing file..."):
-        try:
-            # Read file using DataProcessor
-            processor = DataProcessor()
-            df = processor.read_uploaded_file(uploaded_file)
-            
-            st.success("✅ File uploaded successfully!")
+def render_excel_options(uploaded_file):
+    """Render sheet, header row and column selection for Excel uploads"""
+    header_row = st.number_input(
+        "📄 Header Row", min_value=1, value=1, step=1,
+        help="Worksheet row that holds the column names"
+    )
+
+    # Only the header rows are read here; layouts are kept per upload
+    layouts = st.session_state.setdefault('excel_layouts', {})
+    layout_key = (uploaded_file.file_id, header_row)
+    if layout_key not in layouts:
+        layouts[layout_key] = DataProcessor.get_excel_layout(uploaded_file, header_row)
+    layout = layouts[layout_key]
+
+    sheet_name = st.selectbox("📑 Sheet", options=list(layout), help="Worksheet to analyze")
+    available = layout[sheet_name]
+    columns = st.multiselect(
+        "🧾 Columns to Load",
+        options=available,
+        default=[col for col in REQUIRED_COLUMNS if col in available],
+        help="Only these columns are read from the workbook; leave empty to load all"
+    )
+    return {'sheet_name': sheet_name, 'header_row': int(header_row), 'columns': columns or None}
+
 
-            # Validate data
-            validator = DataValidator()
-            issues = validator.validate_data(df)
+def submit_processing_job(uploaded_file, read_options=None):
+    """Start a background processing job unless this upload is already processed
 
-            # Display validation results
-            display_validation_results(issues)
+    Returns the key identifying the job for this upload and read options.
+    """
+    jobs = st.session_state.setdefault('jobs', {})
+    job_key = (uploaded_file.file_id, repr(read_options))
+    if job_key in jobs:
+        return job_key
 
-            # Only proceed with analysis if no critical errors
-            if issues['severity'] != 'error':
-                perform_data_analysis(df, processor)
+    file_obj = ProcessingPipeline.make_file(uploaded_file.getvalue(), uploaded_file.name)
+    jobs[job_key] = JobRunner.submit(
+        uploaded_file.name, PIPELINE_STAGES, ProcessingPipeline.run, file_obj, read_options
+    )
+    return job_key
+
+
+def prune_session_history(current_job_key):
+    """Keep at most JOB_HISTORY results and finished jobs in the session
+
+    The displayed result and the current upload's job are always kept. A
+    job whose result was dropped is forgotten as well, so uploading that
+    file again processes it again.
+    """
+    jobs = st.session_state.get('jobs', {})
+    results = st.session_state.setdefault('results', {})
+    collected = st.session_state.setdefault('collected_jobs', set())
+    current = st.session_state.get('current_result')
+
+    older = [result_id for result_id in results if result_id != current]
+    for result_id in older[:max(len(results) - JOB_HISTORY, 0)]:
+        del results[result_id]
+    for job_key, job in list(jobs.items()):
+        if job.id in collected and job.id not in results and job_key != current_job_key:
+            del jobs[job_key]
+
+    JobRunner.prune(jobs, keep={current_job_key}, collected=collected)
+    collected.intersection_update(job.id for job in jobs.values())
 
-        except Exception as e:
-            st.error(f"❌ Error processing file: {str(e)}")
+
+def render_job_status(current_job_key):
+    """Show background job progress, polling only while a job is unfinished"""
+    prune_session_history(current_job_key)
+    jobs = st.session_state.get('jobs', {})
+    polling = any(not job.is_finished for job in jobs.values())
+    st.fragment(render_job_progress, run_every=JOB_POLL_INTERVAL if polling else None)(current_job_key, polling)
+
+
+def render_job_progress(current_job_key, polling):
+    """Show progress of background jobs and collect finished results"""
+    jobs = st.session_state.get('jobs', {})
+    results = st.session_state.setdefault('results', {})
+    collected = st.session_state.setdefault('collected_jobs', set())
+
+    new_results = False
+    for job_key, job in jobs.items():
+        if job.status in ('pending', 'running'):
+            st.progress(job.progress, text=f"⏳ Processing {job.name}: {job.describe()}")
+            if st.button("⏹️ Cancel", key=f"cancel_{job.id}", help="Stop processing this file"):
+                job.cancel()
+        elif job.status == 'done' and job.id not in collected:
+            collected.add(job.id)
+            results[job.id] = job.result
+            # The session holds the result from here on; results are pruned there
+            job.result = None
+            st.session_state.current_result = job.id
+            new_results = True
+        elif job_key == current_job_key and job.status == 'cancelled':
+            st.info(f"⏹️ Processing of {job.name} was cancelled. Re-upload the file to try again.")
+        elif job_key == current_job_key and job.status == 'failed':
+            st.error(f"❌ Error processing file: {str(job.error)}")
             st.info("💡 Please check your file format and try again.")
-            
+
             # Show detailed error in expander for debugging
             with st.expander("🔍 Technical Details"):
-                st.exception(e)
+                st.exception(job.error)
+
+    # Results are rendered outside this fragment, and polling stops with a full rerun
+    if new_results or (polling and all(job.is_finished for job in jobs.values())):
+        st.rerun()
+
+
+@st.cache_resource(show_spinner=False, validate=lambda watcher: watcher.running)
+def get_folder_watcher(folder):
+    """One running watcher per folder for the whole server process
+
+    Sessions watching the same folder share it, so observer threads do not
+    pile up as sessions come and go; a stopped watcher is replaced.
+    """
+    watcher = FolderWatcher(folder)
+    watcher.start()
+    return watcher
+
+
+def render_watch_folder_controls():
+    """Start or stop ingesting result files from a watched folder"""
+    with st.expander("📂 Watch Folder"):
+        st.caption("Result files saved to this folder are processed automatically; only new or changed files are read.")
+        folder = st.session_state.get('watch_folder')
+        if folder is None:
+            folder = st.text_input("Folder path", key="watch_folder_path", placeholder="/shared/results")
+            if st.button("▶️ Start Watching", disabled=not folder.strip()):
+                if not os.path.isdir(folder.strip()):
+                    st.error(f"❌ Folder not found: {folder.strip()}")
+                    return
+                st.session_state.watch_folder = os.path.abspath(folder.strip())
+                get_folder_watcher(st.session_state.watch_folder)
+        else:
+            st.caption(f"Watching `{folder}`")
+            if st.button("⏹️ Stop Watching"):
+                get_folder_watcher(folder).stop()
+                get_folder_watcher.clear(folder)
+                del st.session_state['watch_folder']
+                st.session_state.pop('watch_version', None)
+                st.session_state.setdefault('results', {}).pop('watch', None)
+                st.rerun()
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_watch_status():
+    """Show watch-folder progress and publish the combined result when files change"""
+    folder = st.session_state.get('watch_folder')
+    if folder is None:
+        return
+    watcher = get_folder_watcher(folder)
+    ingestor = watcher.ingestor
+
+    scan = ingestor.last_scan
+    if scan is None:
+        st.progress(0.0, text=f"⏳ Reading {watcher.folder}...")
+        return
+    files = len(ingestor.manifest)
+    status = "scanning..." if watcher.scan_pending else f"last scan took {scan['seconds']:.2f}s"
+    st.caption(
+        f"📂 {files} files in the watched folder ({status}): {len(scan['added'])} added, "
+        f"{len(scan['modified'])} changed, {len(scan['removed'])} removed, "
+        f"{len(scan['restored']) + len(scan['unchanged'])} unchanged"
+    )
+    for path, error in scan['failed']:
+        st.warning(f"⚠️ Could not read {path}, retrying on the next change: {error}")
+    for path, missing_columns in ingestor.rejected_files():
+        st.warning(f"⚠️ {path} skipped, missing columns: {', '.join(missing_columns)}")
+    if watcher.error is not None:
+        st.error(f"❌ Watching stopped working: {watcher.error}")
+
+    # Results are rendered outside this fragment, so refresh the whole page
+    if ingestor.version != st.session_state.get('watch_version'):
+        result = ingestor.result()
+        results = st.session_state.setdefault('results', {})
+        st.session_state.watch_version = result['version'] if result else ingestor.version
+        if result is None:
+            results.pop('watch', None)
+        else:
+            results['watch'] = result
+            st.session_state.current_result = 'watch'
+        st.rerun()
+
+
+def display_selected_result():
+    """Let the user pick among finished results and display the chosen one"""
+    results = st.session_state.results
+    result_ids = list(results)
+    current = st.session_state.get('current_result')
+    if current not in results:
+        current = result_ids[-1]
+
+    if len(result_ids) > 1:
+        current = st.selectbox(
+            "📂 Analysis Results",
+            options=result_ids,
+            index=result_ids.index(current),
+            format_func=lambda result_id: results[result_id]['name'],
+            help="Browse results of files processed in this session"
+        )
+    st.session_state.current_result = current
+
+    result = results[current]
+    if result.get('watch'):
+        st.success(f"✅ {result['name']} combined from the watched folder")
+    else:
+        st.success(f"✅ {result['name']} uploaded successfully!")
+    if result.get('snapshot'):
+        st.caption("⚡ Reopened from a saved snapshot of this file; processing was skipped")
+
+    # Display validation results
+    display_validation_results(result['issues'], result.get('identity_checked', IDENTITY_CHECK_ENABLED))
+    render_identity_check(result)
+
+    # Only proceed with analysis if no critical errors
+    if result['issues']['severity'] != 'error':
+        if 'histogram' in result:
+            with st.sidebar:
+                render_grade_simulator_section(result['histogram'])
+        perform_data_analysis(result, DataProcessor())
+
+
+def render_identity_check(result):
+    """Run identity matching on request; validation skips it by default"""
+    if result.get('identity_checked', IDENTITY_CHECK_ENABLED) or result['issues']['severity'] == 'error':
+        return
+    if st.button("🪪 Check Identity Conflicts", help="Look for the same student under different Roll Nos or name spellings"):
+        with st.spinner("Matching student identities..."):
+            DataValidator.add_identity_conflicts(result['df'], result['issues'])
+        result['identity_checked'] = True
+        st.rerun()
 
 
-def display_validation_results(issues):
+def display_validation_results(issues, identity_checked=True):
     """Display data validation results"""
     st.header("🧹 Data Validation")
     
@@ -136,35 +362,61 @@ def display_validation_results(issues):
         if issues['invalid_totals']:
             st.warning(f"⚠️ {len(issues['invalid_totals'])} invalid total scores")
 
+        # Text where numbers are expected
+        for col, rows in issues.get('non_numeric_values', {}).items():
+            shown = ', '.join(str(row) for row in rows[:10])
+            more = f" and {len(rows) - 10:,} more" if len(rows) > 10 else ""
+            st.error(f"❌ {col}: text instead of a number in {len(rows):,} rows (rows {shown}{more})")
+
+        # Suspected identity conflicts
+        if issues['identity_conflicts']:
+            st.warning(f"⚠️ {len(issues['identity_conflicts'])} suspected identity conflicts")
+            with st.expander("🪪 Identity Conflicts"):
+                st.dataframe(
+                    pd.DataFrame(issues['identity_conflicts']),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        elif identity_checked:
+            st.success("✅ No identity conflicts found")
+
+        # Statistical outliers (informational)
+        if issues.get('outliers'):
+            outliers = issues['outliers']
+            st.info(f"ℹ️ {len(outliers['rows'])} scores flagged as statistical outliers (IQR / MAD)")
+            with st.expander("🎯 Outlier Thresholds"):
+                st.dataframe(
+                    pd.DataFrame(outliers['thresholds']).round(2),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+
+def perform_data_analysis(result, processor):
+    """Display analysis for a processed result"""
+    df = result['df']
+    stats = result['stats']
 
-def perform_data_analysis(df, processor):
-    """Perform complete data analysis and display results"""
-    # Add grade column
-    if 'Total' in df.columns:
-        calculator = GradeCalculator()
-        df['Grade'] = calculator.assign_grades(df['Total'])
-    
     # Display statistics
     st.header("📊 Statistical Analysis")
     
     if 'Total' in df.columns:
-        stats = calculator.calculate_statistics(df)
-        
         # Use Analytics class for displaying metrics and charts
         analytics = Analytics()
         analytics.display_key_metrics(stats)
-        analytics.display_charts(df)
-        analytics.display_gender_analysis(df)
+        analytics.display_charts(df, result['issues'].get('outliers'))
+        analytics.display_group_analysis(df)
     
     # Data management tools
-    render_data_management_section(df, processor, stats)
+    render_data_management_section(result, processor)
     
     # Enhanced data preview with filtering
-    render_data_preview_section(df)
+    render_data_preview_section(result)
 
 
-def render_data_management_section(df, processor, stats):
+def render_data_management_section(result, processor):
     """Render data management tools section"""
+    df = result['df']
     st.header("🔧 Data Management")
     
     col1, col2, col3 = st.columns(3)
@@ -174,14 +426,22 @@ def render_data_management_section(df, processor, stats):
             cleaned_df, removed_count = processor.clean_data(df)
             if removed_count > 0:
                 st.success(f"✅ Cleaned! Removed {removed_count} problematic rows")
-                st.session_state.cleaned_df = cleaned_df
+                result['cleaned_df'] = cleaned_df
+                result.pop('cleaned_index', None)
+                result.pop('cleaned_filter_options', None)
             else:
                 st.info("ℹ️ No data needed cleaning!")
     
     with col2:
         # Export functionality
-        if 'Total' in df.columns:
-            report_data = processor.create_excel_report(df, stats)
+        if 'Total' in df.columns and result['report'] is None:
+            # Reports are rebuilt on demand after corrections were applied
+            if st.button("📊 Prepare Excel Report", help="Build the Excel report for the corrected data"):
+                with st.spinner("Building report..."):
+                    result['report'] = processor.create_excel_report(df, result['stats'])
+                st.rerun()
+        elif 'Total' in df.columns:
+            report_data = result['report']
             filename = processor.get_report_filename()
             
             st.download_button(
@@ -196,44 +456,236 @@ def render_data_management_section(df, processor, stats):
         if st.button("🔄 Reset Analysis", help="Clear all filters and start fresh"):
             st.rerun()
 
+    render_upsert_section(result)
+    render_report_cards_section(result)
+    render_split_export_section(result)
+
+
+@st.fragment
+def render_upsert_section(result):
+    """Apply a correction file to the dataset, matched by Roll No"""
+    if 'Roll No' not in result['df'].columns:
+        return
+
+    with st.expander("🔁 Apply Corrections"):
+        st.caption(
+            "Upload a file with a 'Roll No' column and the columns to change. "
+            "Matching rows are updated, new Roll Nos are added."
+        )
+        corrections = st.file_uploader(
+            "Correction file",
+            type=['csv', 'xlsx', 'parquet'],
+            key=f"corrections_{result['name']}"
+        )
+        if corrections is not None and st.button("Apply Corrections"):
+            try:
+                delta = DataProcessor.read_uploaded_file(corrections)
+                summary = ProcessingPipeline.apply_corrections(result, delta)
+            except Exception as e:
+                st.error(f"❌ Error applying corrections: {str(e)}")
+                return
+
+            if summary['inserted'] or summary['updated']:
+                result['report'] = None
+                for key in ('index', 'filter_options', 'cleaned_df', 'cleaned_index',
+                            'cleaned_filter_options', 'report_cards', 'split_export'):
+                    result.pop(key, None)
+            # Rerun so the metrics and charts above show the corrected data
+            st.rerun()
+
+        summary = result.get('last_upsert')
+        if summary is None:
+            return
+        st.success(
+            f"✅ {summary['updated']} updated, {summary['inserted']} added, "
+            f"{summary['unchanged']} unchanged in {summary['seconds']:.2f}s"
+        )
+        if summary['ignored_columns']:
+            st.info(f"ℹ️ Ignored columns not in dataset: {', '.join(summary['ignored_columns'])}")
+        if not summary['conflicts'].empty:
+            st.warning(f"⚠️ {len(summary['conflicts'])} rows were not applied")
+            st.dataframe(summary['conflicts'], use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def render_report_cards_section(result):
+    """Generate a zip of per-student PDF report cards"""
+    df = result['df']
+    if 'Total' not in df.columns:
+        return
+
+    with st.expander("🪪 Student Report Cards"):
+        st.caption("One PDF per student with score, grade, class percentile and class average.")
+        if st.button(f"Generate {len(df):,} Report Cards"):
+            progress_bar = st.progress(0.0, text="Rendering report cards...")
+
+            def update(cards_done):
+                progress_bar.progress(cards_done / len(df), text=f"Rendered {cards_done:,} of {len(df):,} cards")
+
+            try:
+                export = ExportFile(
+                    lambda output: ReportCardGenerator().write_zip(df, result['stats'], output, progress=update)
+                )
+            except Exception as e:
+                st.error(f"❌ Error generating report cards: {str(e)}")
+                return
+            progress_bar.empty()
+            # Only the temporary file's handle is kept; replacing it deletes the old zip
+            result['report_cards'] = export
+
+        if 'report_cards' in result:
+            export = result['report_cards']
+            summary = export.summary
+            st.caption(
+                f"{summary['cards']:,} cards in {summary['seconds']:.1f}s "
+                f"({summary['cards_per_minute']:,.0f} cards/minute)"
+            )
+            with export.open() as data:
+                st.download_button(
+                    label="📥 Download Report Cards (zip)",
+                    data=data,
+                    file_name=f"report_cards_{datetime.now().strftime(EXPORT_DATE_FORMAT)}.zip",
+                    mime="application/zip"
+                )
+
 
-def render_data_preview_section(df):
-    """Render data preview with filtering section"""
+@st.fragment
+def render_split_export_section(result):
+    """Export one file per section, grade or other group column as a zip"""
+    df = result['df']
+    dimensions = SplitExporter.dimensions(df)
+    if not dimensions:
+        return
+
+    with st.expander("🗂️ Split Export"):
+        st.caption("One file per group, e.g. per section or grade, bundled into a single zip.")
+        col1, col2 = st.columns(2)
+        with col1:
+            column = st.selectbox("Split by", options=dimensions, key="split_export_column")
+        with col2:
+            file_format = st.radio(
+                "File format", options=SPLIT_EXPORT_FORMATS, format_func=str.upper,
+                horizontal=True, key="split_export_format"
+            )
+
+        n_files = df[column].nunique(dropna=False)
+        if st.button(f"Export {n_files:,} Files"):
+            progress_bar = st.progress(0.0, text="Writing files...")
+
+            def update(files_done):
+                progress_bar.progress(files_done / n_files, text=f"Wrote {files_done:,} of {n_files:,} files")
+
+            try:
+                export = ExportFile(
+                    lambda output: SplitExporter(file_format).write_zip(df, column, output, progress=update)
+                )
+            except Exception as e:
+                st.error(f"❌ Error exporting files: {str(e)}")
+                return
+            progress_bar.empty()
+            result['split_export'] = (export, column, file_format)
+
+        if 'split_export' in result:
+            export, column, file_format = result['split_export']
+            summary = export.summary
+            st.caption(
+                f"{summary['files']:,} {file_format.upper()} files by {column} "
+                f"({summary['rows']:,} rows) in {summary['seconds']:.1f}s"
+            )
+            with export.open() as data:
+                st.download_button(
+                    label="📥 Download Split Export (zip)",
+                    data=data,
+                    file_name=f"gradeflow_by_{column}_{datetime.now().strftime(EXPORT_DATE_FORMAT)}.zip".replace(' ', '_'),
+                    mime="application/zip"
+                )
+
+
+@st.fragment
+@track_latency("Data preview")
+def render_data_preview_section(result):
+    """Render data preview with filtering section
+
+    Runs as a fragment: filter, search, sort and paging changes rerun only
+    this section, never the analytics above it.
+    """
     st.header("📋 Data Preview & Filtering")
     
     # Use cleaned data if available
-    display_df = st.session_state.get('cleaned_df', df)
-    
+    display_df = result.get('cleaned_df', result['df'])
+    cleaned = 'cleaned_df' in result
+
+    # Filter choices are computed once per displayed frame and kept with the result
+    options_key = 'cleaned_filter_options' if cleaned else 'filter_options'
+    if options_key not in result:
+        result[options_key] = Analytics.filter_options(display_df)
+
     # Create filter controls using Analytics class
     analytics = Analytics()
-    filters = analytics.create_filter_controls(display_df)
+    filters = analytics.create_filter_controls(display_df, result[options_key])
     
+    # Lookup index is built once per displayed frame and kept with the result
+    index_key = 'cleaned_index' if cleaned else 'index'
+    if index_key not in result:
+        result[index_key] = StudentIndex(display_df)
+    index = result[index_key]
+
     # Apply filters using DataProcessor
     processor = DataProcessor()
-    df_filtered = processor.filter_dataframe(
-        display_df,
+    filter_args = dict(
         grade_filter=filters.get('grade_filter'),
         gender_filter=filters.get('gender_filter'),
         score_range=filters.get('score_range')
     )
-    
+    try:
+        mask = processor.filter_mask(display_df, expression=filters.get('expression'), index=index, **filter_args)
+    except ExpressionError as e:
+        st.error(f"❌ {e}. The expression is ignored.")
+        mask = processor.filter_mask(display_df, **filter_args)
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        query = st.text_input("🔎 Find Student", placeholder="Roll No or name", help="Exact Roll No or start of a name")
+    with col2:
+        sort_by = st.selectbox("↕️ Sort By", options=[None] + list(display_df.columns), format_func=lambda col: col or "File order")
+    with col3:
+        ascending = st.radio("Order", options=[True, False], format_func=lambda asc: "Ascending" if asc else "Descending", horizontal=True)
+    with col4:
+        page_size = st.selectbox("Rows per Page", options=PREVIEW_PAGE_SIZES, index=1)
+
+    positions = index.search(query) if query.strip() else None
+    total_matches = int(mask.sum()) if positions is None else int(mask[positions].sum())
+    n_pages = max(-(-total_matches // page_size), 1)
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+
+    # Only the visible page is sent to the browser
+    page_df, total_matches = index.page(
+        display_df, mask=mask, positions=positions, sort_by=sort_by,
+        ascending=ascending, page=page, page_size=page_size
+    )
+
     # Display filtered data with enhanced formatting
-    if not df_filtered.empty:
+    if total_matches:
         st.dataframe(
-            df_filtered, 
+            page_df, 
             use_container_width=True, 
             height=DATAFRAME_HEIGHT,
             hide_index=True
         )
         
         # Summary info with color coding
-        if len(df_filtered) == len(display_df):
-            st.success(f"✅ Showing all {len(df_filtered)} students")
+        first_row = (page - 1) * page_size + 1
+        page_text = f"rows {first_row}-{first_row + len(page_df) - 1}"
+        if total_matches == len(display_df):
+            st.success(f"✅ Showing {page_text} of all {total_matches} students")
         else:
-            st.info(f"📊 Showing {len(df_filtered)} of {len(display_df)} students (filtered)")
+            st.info(f"📊 Showing {page_text} of {total_matches} matching students ({len(display_df)} total)")
     else:
         st.warning("⚠️ No data matches your filter criteria")
 
 
 if __name__ == "__main__":
     main()
+    # Drawn after main() so the panel includes this run's full page timing
+    with st.sidebar:
+        render_latency_section()
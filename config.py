@@ -35,7 +35,83 @@ MAX_FILE_SIZE_MB = 200
 DEFAULT_CHART_HEIGHT = 400
 DATAFRAME_HEIGHT = 400
 SIDEBAR_INITIAL_STATE = "expanded"
+PREVIEW_PAGE_SIZES = [25, 50, 100, 250]
 
 # Export Settings
 EXPORT_DATE_FORMAT = "%Y%m%d_%H%M"
 EXCEL_ENGINE = "openpyxl"
+
+# Parallel Execution Settings
+PARALLEL_MIN_ROWS = 250_000       # Smaller inputs are processed in-process
+PARALLEL_CHUNK_ROWS = 500_000     # Rows handed to each worker task
+PARALLEL_MAX_WORKERS = None       # None uses os.cpu_count()
+PARALLEL_START_METHOD = "spawn"   # Safe with Streamlit's script threads
+
+# Background Job Settings
+JOB_MAX_WORKERS = 4               # Concurrent background processing jobs
+JOB_POLL_INTERVAL = "0.5s"        # Progress refresh interval in the UI while a job is unfinished
+JOB_HISTORY = 10                  # Finished jobs and results kept per session
+
+# API Server Settings
+API_HOST = "127.0.0.1"
+API_PORT = 8600
+API_MAX_WORKERS = 4               # Requests processed concurrently
+API_MAX_QUEUE = 16                # Requests allowed to wait for a worker
+API_REQUEST_TIMEOUT = 300         # Seconds a request may wait for its result
+API_STREAM_CHUNK_ROWS = 50_000    # Rows per chunk of streamed responses
+API_METRICS_WINDOW = 1000         # Latency samples kept per endpoint
+
+# Excel Import Settings
+EXCEL_PROGRESS_ROWS = 10_000      # Rows between progress updates while streaming
+
+# Score Histogram Settings
+HISTOGRAM_RESOLUTION = 0.01       # Bin width used by the what-if simulator
+
+# Identity Matching Settings
+IDENTITY_CHECK_ENABLED = False    # Run identity matching on every validation (slow on large files)
+IDENTITY_WINDOW = 5               # Neighbours compared per record within a block
+IDENTITY_ROLL_PREFIX_DROP = 2     # Trailing Roll No characters ignored for prefix blocks
+
+# Report Card Settings
+REPORT_CARD_BATCH_SIZE = 500      # Cards rendered per worker task
+REPORT_CARD_MIN_PARALLEL = 2_000  # Fewer cards are rendered in-process
+
+# Outlier Detection Settings
+OUTLIER_GROUP_COLUMNS = ["Gender", "Section"]  # Columns scored per group when present
+OUTLIER_IQR_FACTOR = 1.5          # Fences at Q1 - k*IQR and Q3 + k*IQR
+OUTLIER_MAD_THRESHOLD = 3.5       # Modified z-score limit for the MAD rule
+OUTLIER_MIN_GROUP_SIZE = 20       # Smaller groups are not scored
+
+# Group Analytics Settings
+GROUP_EXCLUDED_COLUMNS = ["Roll No", "Name", "Total", "Grade"]  # Never offered as dimensions
+GROUP_CHART_MAX_BARS = 30         # Largest groups shown in the group charts
+
+# Resampling Settings (confidence intervals and significance tests)
+RESAMPLE_COUNT = 2000             # Bootstrap resamples / permutations per estimate
+RESAMPLE_TIME_BUDGET = 1.0        # Seconds allowed per analysis before stopping early
+RESAMPLE_MAX_CELLS = 4_000_000    # Indices drawn per vectorized batch
+CONFIDENCE_LEVEL = 0.95
+RESAMPLE_SEED = 42                # Fixed so reruns show the same intervals
+
+# Interaction Latency Settings
+LATENCY_BUDGET_MS = 250           # Target time for one interaction (fragment rerun)
+LATENCY_HISTORY = 200             # Timings kept per session
+LATENCY_REFRESH_INTERVAL = "2s"   # Live refresh of the latency panel after fragment reruns
+
+# Snapshot Settings (processed datasets cached on disk)
+SNAPSHOT_ENABLED = True
+SNAPSHOT_DIR = ".gradeflow_cache/snapshots"
+SNAPSHOT_DISK_BUDGET_MB = 2048    # Least recently used snapshots are evicted above this
+
+# Expression Filter Settings
+EXPRESSION_CACHE_SIZE = 128       # Compiled filter expressions kept per process
+
+# Split Export Settings (one file per group, bundled into a zip)
+SPLIT_EXPORT_FORMATS = ["csv", "parquet", "xlsx"]
+SPLIT_EXPORT_BATCH_ROWS = 50_000  # Rows written per worker task
+SPLIT_EXPORT_MIN_PARALLEL = 100_000  # Smaller exports are written in-process
+
+# Watch Folder Settings (ingest result files as they land in a folder)
+WATCH_STATE_DIR = ".gradeflow_cache/watch"  # Manifest of ingested files per folder
+WATCH_DEBOUNCE_SECONDS = 2.0      # Quiet time after the last change before a scan
+WATCH_USE_POLLING = False         # Poll the folder instead of OS events (e.g. network shares)
@@ -0,0 +1 @@
+# Headless HTTP API service modules
@@ -0,0 +1,46 @@
+"""
+Per-endpoint latency metrics for the GradeFlow API server.
+"""
+import threading
+from collections import defaultdict, deque
+
+import numpy as np
+from config import API_METRICS_WINDOW
+
+
+class LatencyMetrics:
+    def __init__(self, window=API_METRICS_WINDOW):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(lambda: {'requests': 0, 'errors': 0, 'rejected': 0})
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status_code):
+        """Record one completed request"""
+        with self._lock:
+            self._samples[endpoint].append(seconds * 1000)
+            counts = self._counts[endpoint]
+            counts['requests'] += 1
+            if status_code == 503:
+                counts['rejected'] += 1
+            elif status_code >= 400:
+                counts['errors'] += 1
+
+    def snapshot(self):
+        """Latency percentiles (ms) and request counts for every endpoint"""
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+            counts = {endpoint: dict(values) for endpoint, values in self._counts.items()}
+
+        report = {}
+        for endpoint, values in samples.items():
+            latencies = np.asarray(values)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            report[endpoint] = {
+                **counts[endpoint],
+                'mean_ms': round(float(latencies.mean()), 2),
+                'p50_ms': round(float(p50), 2),
+                'p95_ms': round(float(p95), 2),
+                'p99_ms': round(float(p99), 2),
+                'max_ms': round(float(latencies.max()), 2),
+            }
+        return report
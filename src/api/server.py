@@ -0,0 +1,266 @@
+"""
+Headless HTTP API for GradeFlow validation, grading and statistics.
+
+Endpoints accept a CSV (text/csv) or Parquet (application/vnd.apache.parquet)
+request body and answer with JSON, or with an Arrow IPC stream for graded
+rows when the client sends ``Accept: application/vnd.apache.arrow.stream``.
+Identity conflict matching is skipped unless the request adds ?identity=1.
+Work runs on a bounded worker pool; requests beyond the queue limit are
+rejected with 503 instead of piling up.
+
+Run with: python -m src.api.server --port 8600
+"""
+import argparse
+import io
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+import pyarrow as pa
+from flask import Flask, Response, g, jsonify, request
+from config import (
+    API_HOST, API_PORT, API_MAX_WORKERS, API_MAX_QUEUE, API_REQUEST_TIMEOUT, API_STREAM_CHUNK_ROWS,
+    IDENTITY_CHECK_ENABLED
+)
+from src.core.validators import DataValidator
+from src.core.grade_calculator import GradeCalculator
+from src.utils.data_processor import DataProcessor
+from src.utils.parallel_engine import ParallelEngine
+from src.utils.pipeline import ProcessingPipeline
+from .metrics import LatencyMetrics
+
+ARROW_STREAM_MIME = "application/vnd.apache.arrow.stream"
+INPUT_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+}
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the request queue is full"""
+
+
+class WorkerPool:
+    def __init__(self, max_workers=API_MAX_WORKERS, max_queue=API_MAX_QUEUE, timeout=API_REQUEST_TIMEOUT):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gradeflow-api")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._max_workers = max_workers
+        self._timeout = timeout
+        # Timed-out work that is still running and holding a worker
+        self._abandoned = 0
+        self._lock = threading.Lock()
+
+    def run(self, fn, *args):
+        """Run fn on the pool and wait for its result, or raise PoolSaturated
+
+        Work that times out keeps its slot until it actually finishes; work
+        still waiting in the queue is cancelled instead. Once every worker
+        is tied up by timed-out work, requests are rejected rather than
+        queued behind it.
+        """
+        with self._lock:
+            if self._abandoned >= self._max_workers or not self._slots.acquire(blocking=False):
+                raise PoolSaturated()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self._timeout)
+        except TimeoutError:
+            if not future.cancel():
+                with self._lock:
+                    self._abandoned += 1
+                future.add_done_callback(self._finish_abandoned)
+            raise
+
+    def _finish_abandoned(self, future):
+        with self._lock:
+            self._abandoned -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _TimedBody:
+    """Streamed response body that calls on_done once it is fully sent or closed"""
+
+    def __init__(self, body, on_done):
+        self._body = body
+        self._on_done = on_done
+
+    def __iter__(self):
+        try:
+            yield from self._body
+        finally:
+            self.close()
+
+    def close(self):
+        if hasattr(self._body, 'close'):
+            self._body.close()
+        if self._on_done is not None:
+            on_done, self._on_done = self._on_done, None
+            on_done()
+
+
+def _json_safe(value):
+    """Convert numpy scalars and NaN into JSON-serializable Python values"""
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _analyze(data, input_format, with_grades, check_identity=IDENTITY_CHECK_ENABLED):
+    """Parse, validate and optionally grade one request body"""
+    df = DataProcessor.read_uploaded_file(ProcessingPipeline.make_file(data, f"request.{input_format}"))
+    column_checks = ParallelEngine().run(df)
+    issues = DataValidator.validate_data(df, column_checks, check_identity)
+    if with_grades and issues['severity'] != 'error':
+        df['Grade'] = column_checks['grades']
+    return df, issues
+
+
+def _stream_json_rows(df):
+    """Yield the frame as a JSON array, one chunk of records at a time"""
+    yield '['
+    for start in range(0, len(df), API_STREAM_CHUNK_ROWS):
+        records = df.iloc[start:start + API_STREAM_CHUNK_ROWS].to_json(orient='records')
+        yield (',' if start else '') + records[1:-1]
+    yield ']'
+
+
+def _stream_arrow_rows(df):
+    """Yield the frame as an Arrow IPC stream, one record batch at a time"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=API_STREAM_CHUNK_ROWS):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def create_app(max_workers=API_MAX_WORKERS, max_queue=API_MAX_QUEUE):
+    """Create the Flask application with its own worker pool and metrics"""
+    app = Flask(__name__)
+    pool = WorkerPool(max_workers, max_queue)
+    metrics = LatencyMetrics()
+    app.extensions['gradeflow'] = {'pool': pool, 'metrics': metrics}
+
+    def read_body():
+        """Return (bytes, format) for the request body"""
+        input_format = request.args.get('format') or INPUT_FORMATS.get(request.mimetype)
+        if input_format not in ('csv', 'parquet'):
+            return None, None
+        return request.get_data(), input_format
+
+    def run_analysis(with_grades):
+        data, input_format = read_body()
+        if input_format is None:
+            return None, None, (jsonify(error="Send a CSV or Parquet body (set Content-Type or ?format=)"), 415)
+        # ?identity=1 adds identity matching, which is slow on large files
+        check_identity = request.args.get('identity', type=int, default=int(IDENTITY_CHECK_ENABLED)) == 1
+        df, issues = pool.run(_analyze, data, input_format, with_grades, check_identity)
+        return df, issues, None
+
+    def recorder(status_code):
+        """Callable that records the current request with this status"""
+        endpoint = request.url_rule.rule if request.url_rule else request.path
+        start_time = g.start_time
+        return lambda: metrics.record(endpoint, time.perf_counter() - start_time, status_code)
+
+    @app.before_request
+    def start_timer():
+        g.start_time = time.perf_counter()
+
+    @app.after_request
+    def time_streamed_body(response):
+        # Streamed responses are timed until the last chunk has been sent
+        if response.is_streamed:
+            response.response = _TimedBody(response.response, recorder(response.status_code))
+            g.streamed = True
+        g.status_code = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_latency(error):
+        # after_request is skipped when the request fails with an unhandled error
+        if 'start_time' in g and not g.get('streamed'):
+            recorder(g.get('status_code', 500))()
+
+    @app.errorhandler(PoolSaturated)
+    def handle_saturated(error):
+        response = jsonify(error="Server busy, retry later")
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    @app.errorhandler(TimeoutError)
+    def handle_timeout(error):
+        return jsonify(error="Processing timed out"), 504
+
+    @app.errorhandler(ValueError)
+    def handle_bad_input(error):
+        return jsonify(error=f"Could not process file: {error}"), 400
+
+    @app.get('/health')
+    def health():
+        return jsonify(status="ok")
+
+    @app.get('/metrics')
+    def latency_metrics():
+        return jsonify(metrics.snapshot())
+
+    @app.post('/validate')
+    def validate():
+        _, issues, error = run_analysis(with_grades=False)
+        if error:
+            return error
+        return jsonify(_json_safe(issues))
+
+    @app.post('/grade')
+    def grade():
+        df, issues, error = run_analysis(with_grades=True)
+        if error:
+            return error
+        if issues['severity'] == 'error':
+            return jsonify(error="Validation failed", issues=_json_safe(issues)), 422
+        if ARROW_STREAM_MIME in request.accept_mimetypes.values():
+            return Response(_stream_arrow_rows(df), mimetype=ARROW_STREAM_MIME)
+        return Response(_stream_json_rows(df), mimetype="application/json")
+
+    @app.post('/stats')
+    def stats():
+        df, issues, error = run_analysis(with_grades=True)
+        if error:
+            return error
+        if issues['severity'] == 'error':
+            return jsonify(error="Validation failed", issues=_json_safe(issues)), 422
+        return jsonify(_json_safe(GradeCalculator.calculate_statistics(df)))
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the GradeFlow API server")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_MAX_WORKERS)
+    parser.add_argument("--queue", type=int, default=API_MAX_QUEUE)
+    args = parser.parse_args()
+
+    app = create_app(max_workers=args.workers, max_queue=args.queue)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,18 @@
 Analytics and visualization components for GradeFlow application.
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from config import GRADE_SCALE, PASSING_SCORE
+from config import (
+    GRADE_SCALE, PASSING_SCORE, MIN_SCORE, MAX_SCORE, DATAFRAME_HEIGHT, GROUP_CHART_MAX_BARS,
+    CONFIDENCE_LEVEL, RESAMPLE_COUNT, RESAMPLE_TIME_BUDGET
+)
+from src.core.group_analytics import GroupAnalytics
+from src.core.group_significance import GroupComparison
+from src.utils.latency import track_latency
 
 
 class Analytics:
@@ -52,7 +59,7 @@ class Analytics:
             )
     
     @staticmethod
-    def display_charts(df):
+    def display_charts(df, outliers=None):
         """Display comprehensive charts including pie charts and heatmaps"""
         # Create tabs for different chart types
         tab1, tab2, tab3, tab4 = st.tabs(["📊 Bar Charts", "🥧 Pie Charts", "🔥 Heatmaps", "📈 Distribution"])
@@ -68,6 +75,8 @@ class Analytics:
         
         with tab4:
             Analytics.display_distribution_charts(df)
+            if outliers:
+                Analytics.display_outlier_analysis(df, outliers)
     
     @staticmethod
     def display_bar_charts(df):
@@ -257,71 +266,190 @@ class Analytics:
                 st.plotly_chart(fig_box, use_container_width=True)
     
     @staticmethod
-    def display_gender_analysis(df):
-        """Display performance analysis by gender with enhanced visualizations"""
-        if 'Gender' in df.columns:
-            st.subheader("👥 Performance Analysis by Gender")
-            
-            # Statistical table
-            gender_analysis = df.groupby('Gender').agg({
-                'Total': ['count', 'mean', 'std', 'min', 'max']
-            }).round(2)
-            gender_analysis.columns = ['Count', 'Mean', 'Std Dev', 'Min', 'Max']
-            st.dataframe(gender_analysis, use_container_width=True)
-            
-            # Interactive charts
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Pass rate by gender
-                gender_pass_rate = df.groupby('Gender').apply(
-                    lambda x: (x['Total'] >= PASSING_SCORE).sum() / len(x) * 100
-                ).round(1)
-                
-                fig_pass_rate = px.bar(
-                    x=gender_pass_rate.index,
-                    y=gender_pass_rate.values,
-                    title="Pass Rate by Gender",
-                    labels={'x': 'Gender', 'y': 'Pass Rate (%)'},
-                    color=gender_pass_rate.values,
-                    color_continuous_scale='RdYlGn'
-                )
-                fig_pass_rate.update_layout(
-                    showlegend=False,
-                    height=350,
-                    coloraxis_showscale=False
-                )
-                st.plotly_chart(fig_pass_rate, use_container_width=True)
-            
-            with col2:
-                # Average score by gender
-                avg_scores = df.groupby('Gender')['Total'].mean()
-                
-                fig_avg = px.bar(
-                    x=avg_scores.index,
-                    y=avg_scores.values,
-                    title="Average Score by Gender",
-                    labels={'x': 'Gender', 'y': 'Average Score'},
-                    color=avg_scores.values,
-                    color_continuous_scale='Viridis'
-                )
-                fig_avg.update_layout(
-                    showlegend=False,
-                    height=350,
-                    coloraxis_showscale=False
+    def display_outlier_analysis(df, outliers):
+        """Display scores flagged by the IQR / MAD outlier rules"""
+        st.subheader("🎯 Statistical Outliers")
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            # Bin counts are computed here so large datasets are not sent to the browser
+            totals = df['Total'].to_numpy(dtype=float)
+            flagged = np.zeros(len(df), dtype=bool)
+            positions = df.index.get_indexer(outliers['rows'])
+            flagged[positions[positions >= 0]] = True
+            edges = np.arange(MIN_SCORE, MAX_SCORE + 5, 5)
+            fig = go.Figure()
+            for name, mask, color in [('Typical', ~flagged, '#1f77b4'), ('Outlier', flagged, '#FF6B6B')]:
+                counts, _ = np.histogram(totals[mask], bins=edges)
+                fig.add_trace(go.Bar(x=edges[:-1] + 2.5, y=counts, name=name, marker_color=color))
+            fig.update_layout(
+                barmode='stack',
+                title="Score Distribution with Outliers",
+                height=400,
+                xaxis_title="Score",
+                yaxis_title="Number of Students"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        with col2:
+            counts = pd.DataFrame(
+                list(outliers['counts'].items()), columns=['Rule', 'Flagged']
+            )
+            st.dataframe(counts, use_container_width=True, hide_index=True)
+
+    @staticmethod
+    @st.fragment
+    @track_latency("Group analysis")
+    def display_group_analysis(df):
+        """Display performance analysis by a selectable grouping column
+
+        Runs as a fragment, so changing the dimension or toggling intervals
+        only reruns this section.
+        """
+        dimensions = GroupAnalytics.dimensions(df)
+        if not dimensions:
+            return
+
+        st.subheader("👥 Performance Analysis by Group")
+        dimension = st.selectbox(
+            "Group by",
+            dimensions,
+            index=dimensions.index('Gender') if 'Gender' in dimensions else 0,
+            key="group_analysis_dimension"
+        )
+
+        # Statistical table
+        summary = GroupAnalytics.summarize(df, dimension)
+        st.dataframe(summary.round(2), use_container_width=True, height=DATAFRAME_HEIGHT)
+
+        # Charts show the largest groups only so thousands of groups stay readable
+        chart_data = summary.nlargest(GROUP_CHART_MAX_BARS, 'Students').sort_index()
+        if len(summary) > GROUP_CHART_MAX_BARS:
+            st.caption(f"Charts show the {GROUP_CHART_MAX_BARS} largest of {len(summary)} groups")
+
+        # Resampling is opt-in so ordinary reruns stay within the page budget
+        show_intervals = len(summary) > 1 and st.toggle(
+            f"Show {CONFIDENCE_LEVEL:.0%} confidence intervals and significance tests",
+            key="group_analysis_intervals"
+        )
+        intervals = None
+        if show_intervals:
+            intervals = GroupComparison().group_intervals(df, dimension, chart_data.index.tolist())
+
+        # Interactive charts
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig_pass_rate = px.bar(
+                x=chart_data.index.astype(str),
+                y=chart_data['Pass Rate %'].round(1),
+                title=f"Pass Rate by {dimension}",
+                labels={'x': dimension, 'y': 'Pass Rate (%)'},
+                color=chart_data['Pass Rate %'],
+                color_continuous_scale='RdYlGn',
+                **Analytics._error_bars(intervals, 'Pass Rate %', 'Pass Low', 'Pass High')
+            )
+            fig_pass_rate.update_layout(
+                showlegend=False,
+                height=350,
+                coloraxis_showscale=False
+            )
+            st.plotly_chart(fig_pass_rate, use_container_width=True)
+
+        with col2:
+            fig_avg = px.bar(
+                x=chart_data.index.astype(str),
+                y=chart_data['Mean'],
+                title=f"Average Score by {dimension}",
+                labels={'x': dimension, 'y': 'Average Score'},
+                color=chart_data['Mean'],
+                color_continuous_scale='Viridis',
+                **Analytics._error_bars(intervals, 'Mean', 'Mean Low', 'Mean High')
+            )
+            fig_avg.update_layout(
+                showlegend=False,
+                height=350,
+                coloraxis_showscale=False
+            )
+            st.plotly_chart(fig_avg, use_container_width=True)
+
+        if show_intervals:
+            Analytics.display_group_comparison(df, dimension, summary)
+
+    @staticmethod
+    def _error_bars(intervals, value, low, high):
+        """px.bar error bar arguments from a GroupComparison interval table"""
+        if intervals is None:
+            return {}
+        # Bootstrap percentile intervals need not contain the estimate; a
+        # negative length would draw the bar inverted, so it is clipped at 0
+        return {
+            'error_y': (intervals[high] - intervals[value]).clip(lower=0).to_numpy(),
+            'error_y_minus': (intervals[value] - intervals[low]).clip(lower=0).to_numpy(),
+        }
+
+    @staticmethod
+    def display_group_comparison(df, dimension, summary):
+        """Display significance tests for the difference between two groups"""
+        st.markdown(f"**Compare two {dimension} groups**")
+        largest = summary.nlargest(2, 'Students').index.tolist()
+        groups = summary.index.tolist()
+        col1, col2 = st.columns(2)
+        with col1:
+            group_a = st.selectbox("Group A", groups, index=groups.index(largest[0]), key="compare_group_a")
+        with col2:
+            group_b = st.selectbox("Group B", groups, index=groups.index(largest[1]), key="compare_group_b")
+        if group_a == group_b:
+            st.info("ℹ️ Select two different groups to compare")
+            return
+
+        result = GroupComparison().compare(df, dimension, group_a, group_b)
+        alpha = 1 - CONFIDENCE_LEVEL
+        col1, col2 = st.columns(2)
+        for column, label, diff, ci, p_value in [
+            (col1, "Mean Score Difference", result['mean_diff'], result['mean_ci'], result['mean_p']),
+            (col2, "Pass Rate Difference (pts)", result['pass_diff'], result['pass_ci'], result['pass_p']),
+        ]:
+            with column:
+                st.metric(f"{label} ({group_a} − {group_b})", f"{diff:+.2f}")
+                verdict = "significant" if p_value < alpha else "not significant"
+                st.caption(
+                    f"{CONFIDENCE_LEVEL:.0%} CI [{ci[0]:+.2f}, {ci[1]:+.2f}] · "
+                    f"permutation p = {p_value:.3f} ({verdict})"
                 )
-                st.plotly_chart(fig_avg, use_container_width=True)
+
+        st.caption(
+            f"{result['resamples']:,} bootstrap resamples and {result['permutations']:,} permutations"
+            + (
+                f" (stopped early at the {RESAMPLE_TIME_BUDGET:g}s budget; "
+                f"p-values cannot go below {1 / (result['permutations'] + 1):.3f})"
+                if result['permutations'] < RESAMPLE_COUNT else ""
+            )
+        )
     
     @staticmethod
-    def create_filter_controls(df):
+    def filter_options(df):
+        """Choices and bounds for the filter controls, computed once per frame"""
+        options = {}
+        if 'Grade' in df.columns:
+            options['grades'] = sorted(df['Grade'].unique())
+        if 'Gender' in df.columns:
+            options['genders'] = df['Gender'].unique()
+        if 'Total' in df.columns:
+            options['score_bounds'] = (int(df['Total'].min()), int(df['Total'].max()))
+        return options
+
+    @staticmethod
+    def create_filter_controls(df, options=None):
         """Create filter controls and return filtered dataframe"""
+        options = options or Analytics.filter_options(df)
         col1, col2, col3 = st.columns(3)
         
         filters = {}
         
         with col1:
             if 'Grade' in df.columns:
-                grade_options = sorted(df['Grade'].unique())
+                grade_options = options['grades']
                 filters['grade_filter'] = st.multiselect(
                     "🎯 Filter by Grade", 
                     options=grade_options,
@@ -331,7 +459,7 @@ class Analytics:
         
         with col2:
             if 'Gender' in df.columns:
-                gender_options = df['Gender'].unique()
+                gender_options = options['genders']
                 filters['gender_filter'] = st.multiselect(
                     "👥 Filter by Gender",
                     options=gender_options,
@@ -341,12 +469,22 @@ class Analytics:
         
         with col3:
             if 'Total' in df.columns:
+                min_score, max_score = options['score_bounds']
                 filters['score_range'] = st.slider(
                     "📊 Score Range",
-                    min_value=int(df['Total'].min()),
-                    max_value=int(df['Total'].max()),
-                    value=(int(df['Total'].min()), int(df['Total'].max())),
+                    min_value=min_score,
+                    max_value=max_score,
+                    value=(min_score, max_score),
                     help="Filter by score range"
                 )
+
+        filters['expression'] = st.text_input(
+            "🧮 Filter Expression",
+            placeholder='Total >= 35 and Total < 40 and Gender == "Female"',
+            help="Combine conditions with and / or / not. Compare with == != < <= > >=, "
+                 "test lists with in / not in, e.g. Grade in [\"A\", \"A+\"]. "
+                 "Put column names with spaces in backticks: `Roll No` == \"2021001\". "
+                 "Also contains(Name, \"text\"), startswith(...), isna(...), notna(...)."
+        )
         
         return filters
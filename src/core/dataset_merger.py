@@ -0,0 +1,186 @@
+"""
+Keyed merge/upsert of correction files for GradeFlow application.
+
+The base dataset keeps a hash index of Roll No -> row position, so a delta
+file is matched with one hash probe per row instead of a sort-based
+pd.merge. Grades and statistics are refreshed from the touched rows only:
+RunningAggregates (running sums, grade counts and a ScoreHistogram) are
+adjusted by removing the old values and adding the new ones.
+"""
+import time
+import numpy as np
+import pandas as pd
+from src.core.grade_calculator import GradeCalculator
+from src.core.running_aggregates import RunningAggregates
+
+CONFLICT_COLUMNS = ['Roll No', 'Reason']
+
+
+def _normalize_keys(values):
+    return pd.Series(values).astype(str).str.strip().str.upper().to_numpy()
+
+
+class DatasetMerger:
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        if 'Total' in self.df.columns and 'Grade' not in self.df.columns:
+            self.df['Grade'] = GradeCalculator.assign_grades(self.df['Total'])
+        self._build_key_index()
+        self._build_aggregates()
+
+    def _build_key_index(self):
+        """Unique Roll No -> first row position, plus how often each key occurs"""
+        codes, uniques = pd.factorize(_normalize_keys(self.df['Roll No']))
+        self._keys = pd.Index(uniques)
+        self._key_rows = np.full(len(uniques), -1, dtype=np.int64)
+        # Reverse assignment leaves the first occurrence of each key
+        self._key_rows[codes[::-1]] = np.arange(len(codes))[::-1]
+        self._key_counts = np.bincount(codes, minlength=len(uniques))
+        # Keys inserted by upserts live in a dict so the large index is never rebuilt
+        self._inserted_rows = {}
+        # Build the hash table now rather than on the first upsert
+        self._keys.get_indexer(self._keys[:1])
+
+    def _probe(self, keys):
+        """Row position and occurrence count in the dataset for every key"""
+        key_codes = self._keys.get_indexer(keys)
+        found = key_codes >= 0
+        rows = np.where(found, self._key_rows[np.maximum(key_codes, 0)], -1)
+        counts = np.where(found, self._key_counts[np.maximum(key_codes, 0)], 0)
+        if self._inserted_rows:
+            extra = np.array([self._inserted_rows.get(key, -1) for key in keys[~found]], dtype=np.int64)
+            rows[~found] = extra
+            counts[~found] = extra >= 0
+        return rows, counts
+
+    def _build_aggregates(self):
+        """Running sums, grade counts and histogram over the whole dataset"""
+        self._aggregates = RunningAggregates()
+        self.histogram = self._aggregates.histogram
+        if 'Total' in self.df.columns:
+            self._aggregates.add(self.df)
+
+    def upsert(self, delta):
+        """Merge a delta frame into the dataset by Roll No
+
+        Blank cells in the delta leave the stored value unchanged, so a
+        partial correction file only changes the cells it fills in.
+        Returns a summary dict with 'inserted', 'updated' and 'unchanged'
+        row counts, 'conflicts' (DataFrame of rows that were not applied),
+        'ignored_columns' and 'seconds'.
+        """
+        started = time.perf_counter()
+        if 'Roll No' not in delta.columns:
+            raise ValueError("Correction file must contain a 'Roll No' column")
+
+        delta = delta.reset_index(drop=True)
+        ignored_columns = [col for col in delta.columns if col not in self.df.columns]
+        columns = [col for col in delta.columns if col in self.df.columns and col not in ('Roll No', 'Grade')]
+        keys = _normalize_keys(delta['Roll No'])
+
+        # Hash probe of every delta key against the base index
+        base_rows, key_counts = self._probe(keys)
+        conflicts = []
+
+        duplicated = pd.Series(keys).duplicated(keep=False).to_numpy()
+        conflicts.append((delta['Roll No'][duplicated], 'Roll No repeated in correction file'))
+
+        matched = (base_rows >= 0) & ~duplicated
+        ambiguous = matched & (key_counts > 1)
+        conflicts.append((delta['Roll No'][ambiguous], 'Roll No appears more than once in dataset'))
+        matched &= ~ambiguous
+
+        if 'Name' in columns:
+            old_names = _normalize_keys(self.df['Name'].to_numpy()[base_rows])
+            new_names = _normalize_keys(delta['Name'])
+            renamed = matched & delta['Name'].notna().to_numpy() & (old_names != new_names)
+            conflicts.append((delta['Roll No'][renamed], 'Name differs from dataset'))
+            matched &= ~renamed
+
+        updated, unchanged = self._apply_updates(delta[matched], base_rows[matched], columns)
+        inserted = self._apply_inserts(delta[(base_rows < 0) & ~duplicated])
+
+        conflict_frame = pd.DataFrame(
+            [(roll_no, reason) for rolls, reason in conflicts for roll_no in rolls],
+            columns=CONFLICT_COLUMNS
+        )
+        return {
+            'inserted': inserted,
+            'updated': updated,
+            'unchanged': unchanged,
+            'conflicts': conflict_frame,
+            'ignored_columns': ignored_columns,
+            'seconds': time.perf_counter() - started,
+        }
+
+    def _apply_updates(self, rows, positions, columns):
+        """Overwrite changed values in place; returns (updated, unchanged) counts"""
+        if not len(rows):
+            return 0, 0
+
+        # Blank cells mean "not provided" and keep the stored value
+        changed = np.zeros(len(rows), dtype=bool)
+        for col in columns:
+            old = self.df[col].iloc[positions].reset_index(drop=True)
+            new = rows[col].reset_index(drop=True)
+            changed |= (new.notna() & ~old.eq(new)).to_numpy()
+
+        positions = positions[changed]
+        rows = rows[changed]
+        if len(positions) and 'Total' in self.df.columns:
+            self._aggregates.remove(self.df.iloc[positions])
+
+        for col in columns:
+            provided = rows[col].notna().to_numpy()
+            if not provided.any():
+                continue
+            self._ensure_dtype(col, rows[col])
+            self.df.iloc[positions[provided], self.df.columns.get_loc(col)] = rows[col].to_numpy()[provided]
+
+        if len(positions) and 'Total' in self.df.columns:
+            # Regrade only the touched rows
+            self.df.iloc[positions, self.df.columns.get_loc('Grade')] = GradeCalculator.assign_grades(
+                self.df['Total'].iloc[positions]
+            )
+            self._aggregates.add(self.df.iloc[positions])
+
+        return int(changed.sum()), int((~changed).sum())
+
+    def _ensure_dtype(self, col, values):
+        """Widen a base column (e.g. int -> float) so it can hold the new values"""
+        current = self.df[col].dtype
+        if values.dtype == current:
+            return
+        if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(values.dtype):
+            target = np.result_type(current, values.dtype)
+        else:
+            target = np.dtype(object)
+        if target != current:
+            self.df[col] = self.df[col].astype(target)
+
+    def _apply_inserts(self, rows):
+        """Append new rows, grade them and add them to the index"""
+        if not len(rows):
+            return 0
+
+        new_rows = rows[[col for col in rows.columns if col in self.df.columns]].copy()
+        if 'Total' in self.df.columns:
+            new_rows['Grade'] = GradeCalculator.assign_grades(
+                new_rows['Total'] if 'Total' in new_rows.columns else np.full(len(new_rows), np.nan)
+            )
+        new_rows = new_rows.reindex(columns=self.df.columns)
+
+        first_position = len(self.df)
+        self.df = pd.concat([self.df, new_rows], ignore_index=True)
+        if 'Total' in self.df.columns:
+            self._aggregates.add(self.df.iloc[first_position:])
+
+        # New keys are unique (duplicates were rejected)
+        keys = _normalize_keys(new_rows['Roll No'])
+        self._inserted_rows.update(zip(keys, range(first_position, len(self.df))))
+        return len(new_rows)
+
+    def statistics(self):
+        """Statistics in the same shape as GradeCalculator.calculate_statistics"""
+        totals = self.df['Total']
+        return self._aggregates.statistics(len(self.df), totals.min(), totals.max(), totals.median())
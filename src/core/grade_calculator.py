@@ -1,34 +1,50 @@
 """
 Grade calculation module for GradeFlow application.
 """
+import numpy as np
 import pandas as pd
 from config import GRADE_SCALE, PASSING_SCORE
 
 
 class GradeCalculator:
+    @staticmethod
+    def grade_labels(grade_scale=None):
+        """Grade labels in code order: scale grades, fallback 'F', then 'N/A'"""
+        labels = list((grade_scale or GRADE_SCALE).keys())
+        if 'F' not in labels:
+            labels.append('F')
+        labels.append('N/A')
+        return labels
+
+    @staticmethod
+    def grade_codes(scores, grade_scale=None):
+        """Vectorized grade assignment returning int8 codes into grade_labels()"""
+        grade_scale = grade_scale or GRADE_SCALE
+        values = np.asarray(scores, dtype=np.float64)
+        labels = GradeCalculator.grade_labels(grade_scale)
+
+        # Scores outside every band fall back to 'F', missing scores to 'N/A'
+        codes = np.full(values.shape, labels.index('F'), dtype=np.int8)
+        codes[np.isnan(values)] = labels.index('N/A')
+
+        # Walk the scale in reverse so the first matching band wins
+        for code in range(len(grade_scale) - 1, -1, -1):
+            min_score, max_score = grade_scale[labels[code]]
+            codes[(values >= min_score) & (values <= max_score)] = code
+        return codes
+
     @staticmethod
     def assign_grades(scores):
         """Assign letter grades based on config grade scale"""
-        grades = []
-        for score in scores:
-            if pd.isna(score):
-                grades.append('N/A')
-                continue
-            
-            grade = 'F'
-            for letter, (min_score, max_score) in GRADE_SCALE.items():
-                if min_score <= score <= max_score:
-                    grade = letter
-                    break
-            grades.append(grade)
-        return grades
-    
+        labels = np.array(GradeCalculator.grade_labels(), dtype=object)
+        return labels[GradeCalculator.grade_codes(scores)].tolist()
+
     @staticmethod
     def calculate_statistics(df):
         """Calculate comprehensive statistics"""
         if 'Total' not in df.columns:
             return {}
-        
+
         stats = {
             'total_students': len(df),
             'mean_score': df['Total'].mean(),
@@ -38,10 +54,13 @@ class GradeCalculator:
             'max_score': df['Total'].max(),
             'pass_rate': (df['Total'] >= PASSING_SCORE).sum() / len(df) * 100,
         }
-        
-        # Grade distribution
-        grades = GradeCalculator.assign_grades(df['Total'])
+
+        # Grade distribution (reuse assigned grades when available)
+        if 'Grade' in df.columns:
+            grades = df['Grade']
+        else:
+            grades = GradeCalculator.assign_grades(df['Total'])
         grade_counts = pd.Series(grades).value_counts()
         stats['grade_distribution'] = grade_counts.to_dict()
-        
+
         return stats
@@ -0,0 +1,102 @@
+"""
+What-if grade scale simulation for GradeFlow application.
+
+Grade distributions and pass rates for a candidate grade scale are read
+from a precomputed ScoreHistogram, so changing a boundary costs a pass over
+the histogram bins rather than regrading every student. Boundaries that are
+multiples of HISTOGRAM_RESOLUTION (the simulator sliders use whole numbers)
+give the same counts as GradeCalculator.
+"""
+import numpy as np
+import pandas as pd
+from config import MIN_SCORE, MAX_SCORE
+from src.core.grade_calculator import GradeCalculator
+
+
+class GradeSimulator:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def simulate(self, grade_scale, passing_score):
+        """Grade distribution and pass rates under the given scale
+
+        Returns a dict with 'distribution' (DataFrame of counts per grade,
+        overall and per group), 'pass_rate', 'group_pass_rates' and
+        'unbanded' (students whose score falls in no band of the scale).
+        """
+        histogram = self.histogram
+        labels = GradeCalculator.grade_labels(grade_scale)
+        bin_codes = GradeCalculator.grade_codes(histogram.bin_scores, grade_scale)
+        fallback = labels.index('F')
+
+        # Scores outside any band take the fallback grade, like GradeCalculator
+        in_band = np.zeros(histogram.n_bins, dtype=bool)
+        for min_score, max_score in grade_scale.values():
+            in_band |= (histogram.bin_scores >= min_score) & (histogram.bin_scores <= max_score)
+
+        columns = {}
+        unbanded = 0
+        for row, group in enumerate(histogram.groups):
+            counts = np.bincount(bin_codes, weights=histogram.counts[row], minlength=len(labels))
+            counts[fallback] += histogram.below[row] + histogram.above[row]
+            counts[labels.index('N/A')] += histogram.missing[row]
+            columns[str(group)] = counts.astype(np.int64)
+            unbanded += int(histogram.counts[row][~in_band].sum() + histogram.below[row] + histogram.above[row])
+
+        distribution = pd.DataFrame(columns, index=labels)
+        distribution.insert(0, 'Count', distribution.sum(axis=1))
+        total = histogram.total()
+        distribution.insert(1, 'Share %', (distribution['Count'] / total * 100).round(1) if total else 0.0)
+        # Keep 'N/A' only when there are missing scores
+        if distribution.loc['N/A', 'Count'] == 0:
+            distribution = distribution.drop(index='N/A')
+
+        return {
+            'distribution': distribution,
+            'pass_rate': self._pass_rate(passing_score),
+            'group_pass_rates': {
+                str(group): self._pass_rate(passing_score, group) for group in histogram.groups
+            },
+            'unbanded': unbanded,
+        }
+
+    def _pass_rate(self, passing_score, group=None):
+        total = self.histogram.total(group)
+        if not total:
+            return 0.0
+        return self.histogram.count_at_least(passing_score, group) / total * 100
+
+    @staticmethod
+    def check_scale(grade_scale, min_score=MIN_SCORE, max_score=MAX_SCORE):
+        """Find uncovered score ranges and overlapping bands in a grade scale
+
+        Bands are treated as whole-number ranges, matching the config format.
+        Returns {'gaps': [(low, high)], 'overlaps': [(grade, grade, low, high)],
+        'inverted': [grade]}.
+        """
+        bands = sorted(
+            (band_min, band_max, grade) for grade, (band_min, band_max) in grade_scale.items()
+        )
+        report = {'gaps': [], 'overlaps': [], 'inverted': []}
+
+        cursor = min_score
+        for band_min, band_max, grade in bands:
+            if band_min > band_max:
+                report['inverted'].append(grade)
+                continue
+            if band_min > cursor:
+                report['gaps'].append((cursor, band_min - 1))
+            cursor = max(cursor, band_max + 1)
+        if cursor <= max_score:
+            report['gaps'].append((cursor, max_score))
+
+        # Overlaps are reported in scale order: the first grade takes precedence
+        order = list(grade_scale)
+        for i, (min_a, max_a, grade_a) in enumerate(bands):
+            for min_b, max_b, grade_b in bands[i + 1:]:
+                low, high = max(min_a, min_b), min(max_a, max_b)
+                if low <= high and min_a <= max_a and min_b <= max_b:
+                    first, second = sorted((grade_a, grade_b), key=order.index)
+                    report['overlaps'].append((first, second, low, high))
+
+        return report
@@ -0,0 +1,90 @@
+"""
+Grouped score analytics for GradeFlow application.
+
+Summarizes Total by any categorical column (Gender, Section, Department,
+Subject, ...). The dimension is factorized once and every measure - count,
+mean, std, min, max, pass rate and grade mix - is accumulated with
+bincount / ufunc.at over the integer group codes, so the cost stays linear
+in rows and nearly flat in the number of groups.
+"""
+import numpy as np
+import pandas as pd
+from config import PASSING_SCORE, GROUP_EXCLUDED_COLUMNS
+from src.core.grade_calculator import GradeCalculator
+
+SUMMARY_COLUMNS = ['Students', 'Count', 'Mean', 'Std Dev', 'Min', 'Max', 'Pass Rate %']
+
+
+class GroupAnalytics:
+    @staticmethod
+    def dimensions(df):
+        """Columns that can be used as a grouping dimension"""
+        return [
+            col for col in df.columns
+            if col not in GROUP_EXCLUDED_COLUMNS
+            and not pd.api.types.is_float_dtype(df[col])
+        ]
+
+    @staticmethod
+    def summarize(df, dimension, passing_score=PASSING_SCORE):
+        """Per-group score summary of df['Total'] by dimension
+
+        Returns a DataFrame indexed by group with 'Students' (rows),
+        'Count' (rows with a score), 'Mean', 'Std Dev', 'Min', 'Max',
+        'Pass Rate %' and one 'Grade <label> %' column per grade. Rows with
+        a missing dimension value are left out, like DataFrame.groupby.
+        """
+        try:
+            codes, groups = pd.factorize(df[dimension], sort=True)
+        except TypeError:
+            # Mixed value types cannot be ordered
+            codes, groups = pd.factorize(df[dimension])
+        totals = df['Total'].to_numpy(dtype=np.float64)
+        grouped = codes >= 0
+        codes, totals = codes[grouped], totals[grouped]
+        n_groups = len(groups)
+
+        scored = ~np.isnan(totals)
+        score_codes, scores = codes[scored], totals[scored]
+
+        students = np.bincount(codes, minlength=n_groups)
+        count = np.bincount(score_codes, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(score_codes, weights=scores, minlength=n_groups) / count
+            # Second pass over the deviations keeps the variance numerically stable
+            squares = np.bincount(score_codes, weights=(scores - mean[score_codes]) ** 2, minlength=n_groups)
+            std = np.sqrt(squares / (count - 1))
+            std[count < 2] = np.nan
+
+            minimum = np.full(n_groups, np.inf)
+            maximum = np.full(n_groups, -np.inf)
+            np.minimum.at(minimum, score_codes, scores)
+            np.maximum.at(maximum, score_codes, scores)
+            minimum[count == 0] = np.nan
+            maximum[count == 0] = np.nan
+
+            passed = np.bincount(codes, weights=totals >= passing_score, minlength=n_groups)
+            pass_rate = passed / students * 100
+
+            # Grade mix as a groups x grades count matrix from one bincount
+            labels = GradeCalculator.grade_labels()
+            grade_codes = GradeCalculator.grade_codes(totals).astype(np.int64)
+            mix = np.bincount(
+                codes * len(labels) + grade_codes, minlength=n_groups * len(labels)
+            ).reshape(n_groups, len(labels))
+            mix_share = mix / students[:, None] * 100
+
+        summary = pd.DataFrame({
+            'Students': students,
+            'Count': count,
+            'Mean': mean,
+            'Std Dev': std,
+            'Min': minimum,
+            'Max': maximum,
+            'Pass Rate %': pass_rate,
+        }, index=pd.Index(groups, name=dimension))
+        for position, label in enumerate(labels):
+            # Keep 'N/A' only when some scores are missing
+            if label != 'N/A' or mix[:, position].any():
+                summary[f'Grade {label} %'] = mix_share[:, position]
+        return summary
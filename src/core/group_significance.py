@@ -0,0 +1,170 @@
+"""
+Confidence intervals and significance tests for group comparisons in
+GradeFlow application.
+
+Bootstrap resamples and permutations are drawn as index matrices of shape
+(batch, rows), so thousands of resamples are evaluated in a few vectorized
+gathers. Batches are sized to RESAMPLE_MAX_CELLS indices and drawn until
+RESAMPLE_COUNT is reached or the time budget runs out; results report how
+many resamples were actually used.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from config import (
+    PASSING_SCORE, RESAMPLE_COUNT, RESAMPLE_TIME_BUDGET, RESAMPLE_MAX_CELLS,
+    CONFIDENCE_LEVEL, RESAMPLE_SEED
+)
+
+INTERVAL_COLUMNS = ['Mean', 'Mean Low', 'Mean High', 'Pass Rate %', 'Pass Low', 'Pass High', 'Resamples']
+
+
+class _Sample:
+    """Score columns of one group prepared for gathering by index"""
+
+    def __init__(self, totals, passing_score):
+        totals = np.asarray(totals, dtype=np.float64)
+        self.valid = ~np.isnan(totals)
+        self.values = np.where(self.valid, totals, 0.0)
+        # Missing scores count as not passed, like the pass rate elsewhere
+        self.passed = totals >= passing_score
+        self.size = len(totals)
+
+    def statistics(self, index):
+        """Mean score and pass rate for each row of an index matrix"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.values[index].sum(axis=1) / self.valid[index].sum(axis=1)
+        return means, self.passed[index].mean(axis=1) * 100
+
+
+class GroupComparison:
+    def __init__(self, n_resamples=RESAMPLE_COUNT, time_budget=RESAMPLE_TIME_BUDGET,
+                 confidence=CONFIDENCE_LEVEL, passing_score=PASSING_SCORE, seed=RESAMPLE_SEED):
+        self.n_resamples = n_resamples
+        self.time_budget = time_budget
+        self.confidence = confidence
+        self.passing_score = passing_score
+        self.seed = seed
+
+    def group_intervals(self, df, dimension, groups):
+        """Bootstrap intervals of mean score and pass rate for each group
+
+        The time budget is shared evenly by the groups.
+        """
+        rng = np.random.default_rng(self.seed)
+        budget = self.time_budget / max(len(groups), 1)
+        labels = df[dimension].to_numpy()
+        totals = df['Total'].to_numpy(dtype=np.float64)
+
+        rows = []
+        for group in groups:
+            sample = _Sample(totals[labels == group], self.passing_score)
+            means, pass_rates = self._bootstrap(rng, [sample], time.perf_counter() + budget)[0]
+            rows.append([
+                np.nanmean(np.where(sample.valid, sample.values, np.nan)) if sample.valid.any() else np.nan,
+                *self._interval(means),
+                sample.passed.mean() * 100 if sample.size else np.nan,
+                *self._interval(pass_rates),
+                len(means),
+            ])
+        return pd.DataFrame(rows, index=pd.Index(groups, name=dimension), columns=INTERVAL_COLUMNS)
+
+    def compare(self, df, dimension, group_a, group_b):
+        """Difference in mean score and pass rate between two groups (a - b)
+
+        Returns a dict with 'mean_diff', 'mean_ci', 'mean_p', 'pass_diff',
+        'pass_ci', 'pass_p', 'resamples' and 'permutations'. p-values come
+        from a two-sided permutation test, intervals from the bootstrap.
+        """
+        rng = np.random.default_rng(self.seed)
+        labels = df[dimension].to_numpy()
+        totals = df['Total'].to_numpy(dtype=np.float64)
+        sample_a = _Sample(totals[labels == group_a], self.passing_score)
+        sample_b = _Sample(totals[labels == group_b], self.passing_score)
+        if not sample_a.size or not sample_b.size:
+            raise ValueError("Both groups need at least one student")
+
+        full = np.arange(sample_a.size)[None, :], np.arange(sample_b.size)[None, :]
+        mean_a, pass_a = sample_a.statistics(full[0])
+        mean_b, pass_b = sample_b.statistics(full[1])
+        mean_diff, pass_diff = mean_a[0] - mean_b[0], pass_a[0] - pass_b[0]
+
+        # Half the budget for the bootstrap intervals, half for the permutation test
+        half = self.time_budget / 2
+        (means_a, passes_a), (means_b, passes_b) = self._bootstrap(
+            rng, [sample_a, sample_b], time.perf_counter() + half
+        )
+        perm_means, perm_passes = self._permute(rng, sample_a, sample_b, time.perf_counter() + half)
+
+        return {
+            'mean_diff': mean_diff,
+            'mean_ci': self._interval(means_a - means_b),
+            'mean_p': self._p_value(perm_means, mean_diff),
+            'pass_diff': pass_diff,
+            'pass_ci': self._interval(passes_a - passes_b),
+            'pass_p': self._p_value(perm_passes, pass_diff),
+            'resamples': len(means_a),
+            'permutations': len(perm_means),
+        }
+
+    def _batch_sizes(self, row_count, deadline):
+        """Resamples per batch until the target count or the deadline is hit
+
+        The first batch is always drawn so every estimate has some resamples.
+        """
+        batch = max(1, min(self.n_resamples, RESAMPLE_MAX_CELLS // max(row_count, 1)))
+        done = 0
+        while done < self.n_resamples:
+            size = min(batch, self.n_resamples - done)
+            yield size
+            done += size
+            if time.perf_counter() > deadline:
+                return
+
+    def _bootstrap(self, rng, samples, deadline):
+        """(means, pass rates) per sample, resampled with replacement together"""
+        results = [([], []) for _ in samples]
+        row_count = sum(sample.size for sample in samples)
+        for size in self._batch_sizes(row_count, deadline):
+            for sample, (means, passes) in zip(samples, results):
+                index = rng.integers(0, sample.size, size=(size, sample.size))
+                batch_means, batch_passes = sample.statistics(index)
+                means.append(batch_means)
+                passes.append(batch_passes)
+        return [(np.concatenate(means), np.concatenate(passes)) for means, passes in results]
+
+    def _permute(self, rng, sample_a, sample_b, deadline):
+        """Differences (a - b) after shuffling the group labels"""
+        pooled = _Sample(
+            np.concatenate([
+                np.where(sample_a.valid, sample_a.values, np.nan),
+                np.where(sample_b.valid, sample_b.values, np.nan),
+            ]),
+            self.passing_score
+        )
+        split = sample_a.size
+        mean_diffs, pass_diffs = [], []
+        for size in self._batch_sizes(pooled.size, deadline):
+            index = rng.permuted(np.broadcast_to(np.arange(pooled.size), (size, pooled.size)), axis=1)
+            means_a, passes_a = pooled.statistics(index[:, :split])
+            means_b, passes_b = pooled.statistics(index[:, split:])
+            mean_diffs.append(means_a - means_b)
+            pass_diffs.append(passes_a - passes_b)
+        return np.concatenate(mean_diffs), np.concatenate(pass_diffs)
+
+    def _interval(self, values):
+        """Percentile interval at the configured confidence level"""
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return np.nan, np.nan
+        tail = (1 - self.confidence) / 2 * 100
+        low, high = np.percentile(values, [tail, 100 - tail])
+        return low, high
+
+    @staticmethod
+    def _p_value(differences, observed):
+        """Two-sided permutation p-value with the +1 correction"""
+        differences = differences[~np.isnan(differences)]
+        extreme = np.count_nonzero(np.abs(differences) >= abs(observed) - 1e-12)
+        return (extreme + 1) / (len(differences) + 1)
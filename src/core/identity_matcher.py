@@ -0,0 +1,232 @@
+"""
+Identity conflict detection for GradeFlow application.
+
+Finds records that probably describe the same student under a different
+Roll No or name spelling ("A. Johnson" vs "Alice Johnson", transposed Roll
+Nos) without comparing every pair of rows. Distinct (Roll No, name) records
+are sorted by a blocking key and each record is only compared with the next
+few records of its own block (sorted neighbourhood), which keeps the work
+near-linear. Names are normalized and split with Arrow compute kernels and
+similarity is scored for all candidate pairs at once.
+
+Blocking passes:
+- Roll No: records sharing a Roll No but with different names
+- Name: records sharing last name, first initial and Roll No length,
+  ordered by Roll No
+- Roll No prefix: records with nearby Roll Nos and the same last name and
+  first initial, ordered by name
+
+A Roll No variant needs more than a matching name, since students with the
+same name often get consecutive Roll Nos: an adjacent swap of two
+characters, or a one-character change with identical names, the same
+gender and Roll Nos that are not consecutive numbers.
+
+Matching takes seconds on millions of rows, so it is an opt-in validation
+stage (IDENTITY_CHECK_ENABLED, or on request in the UI and API).
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from config import IDENTITY_WINDOW, IDENTITY_ROLL_PREFIX_DROP
+
+CONFLICT_COLUMNS = ['Conflict', 'Roll No A', 'Name A', 'Roll No B', 'Name B', 'Name Similarity']
+
+
+def _codes(values):
+    """Integer codes of an Arrow array (dictionary encoding)"""
+    return pc.dictionary_encode(values).indices.to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def _sorted_codes(values):
+    """Integer codes that follow the sort order of the values"""
+    return pc.rank(values, sort_keys='ascending', tiebreaker='dense').to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+class IdentityMatcher:
+    def __init__(self, window=IDENTITY_WINDOW):
+        self.window = window
+
+    def find_conflicts(self, df):
+        """DataFrame of suspected identity conflicts, one row per record pair"""
+        if 'Roll No' not in df.columns or 'Name' not in df.columns:
+            return pd.DataFrame(columns=CONFLICT_COLUMNS)
+
+        records = self._distinct_records(df)
+        if len(records['roll']) < 2:
+            return pd.DataFrame(columns=CONFLICT_COLUMNS)
+
+        roll, names = records['roll'], records['name']
+        # Normalized names are single-space separated words
+        words = pc.split_pattern(names, ' ')
+        word_counts = pc.list_value_length(words).to_numpy(zero_copy_only=False)
+        first = pc.list_element(words, 0)
+        last = pc.list_flatten(words).take(pa.array(np.cumsum(word_counts) - 1))
+        # Everything after the first name; with equal last names it compares the middle names
+        rest = pc.binary_join(pc.list_slice(words, 1), ' ')
+        initial = pc.utf8_slice_codeunits(first, 0, 1)
+
+        # Integer codes make the per-pair comparisons cheap
+        roll_codes, name_codes = records['roll_codes'], records['name_codes']
+        first_codes, rest_codes, last_codes = _codes(first), _codes(rest), _codes(last)
+        initial_codes = _codes(initial)
+        is_initial = pc.equal(pc.utf8_length(first), 1).to_numpy(zero_copy_only=False)
+        no_middle = word_counts < 3
+        roll_lengths = pc.utf8_length(roll).to_numpy(zero_copy_only=False).astype(np.int64)
+        roll_order, name_order = _sorted_codes(roll), _sorted_codes(names)
+
+        # Candidate pairs from each blocking pass, encoded as i * n + j
+        n_records = len(roll)
+        surname = last_codes * (initial_codes.max() + 1) + initial_codes
+        prefix_codes = _codes(pc.utf8_slice_codeunits(roll, 0, -IDENTITY_ROLL_PREFIX_DROP))
+        pair_keys = np.sort(np.concatenate([
+            self._block_pairs(roll_codes, name_order, n_records),
+            self._block_pairs(surname * (roll_lengths.max() + 1) + roll_lengths, roll_order, n_records),
+            self._block_pairs(prefix_codes * (surname.max() + 1) + surname, name_order, n_records),
+        ]))
+        if not len(pair_keys):
+            return pd.DataFrame(columns=CONFLICT_COLUMNS)
+        # Sorting then dropping repeats is much faster than np.unique's hashing here
+        pair_keys = pair_keys[np.concatenate([[True], pair_keys[1:] != pair_keys[:-1]])]
+        left, right = np.divmod(pair_keys, n_records)
+
+        name_similarity = self._name_similarity(
+            name_codes, first_codes, rest_codes, last_codes, initial_codes,
+            is_initial, no_middle, left, right
+        )
+        same_roll = roll_codes[left] == roll_codes[right]
+
+        # Only pairs with near-identical names need the Roll No comparison
+        close_roll = np.zeros(len(left), dtype=bool)
+        similar = np.flatnonzero(~same_roll & (name_similarity >= 0.9))
+        transposed, substituted = self._roll_edits(roll, left[similar], right[similar])
+        corroborated = (
+            (name_similarity[similar] == 1.0)
+            & (records['gender_codes'][left[similar]] == records['gender_codes'][right[similar]])
+            & ~self._consecutive(roll, left[similar], right[similar])
+        )
+        close_roll[similar] = transposed | (substituted & corroborated)
+
+        conflict = np.select(
+            [
+                same_roll & (name_similarity >= 0.6),
+                same_roll,
+                close_roll,
+            ],
+            ['Name variant under one Roll No', 'Different names share a Roll No', 'Roll No variant for one name'],
+            default=''
+        )
+        flagged = conflict != ''
+
+        original_roll, original_name = records['Roll No'], records['Name']
+        return pd.DataFrame({
+            'Conflict': conflict[flagged],
+            'Roll No A': original_roll[left[flagged]],
+            'Name A': original_name[left[flagged]],
+            'Roll No B': original_roll[right[flagged]],
+            'Name B': original_name[right[flagged]],
+            'Name Similarity': name_similarity[flagged].round(2),
+        }).sort_values(['Conflict', 'Roll No A'], ignore_index=True)
+
+    @staticmethod
+    def _distinct_records(df):
+        """Distinct (Roll No, normalized name) records as Arrow and numpy arrays"""
+        present = (df['Roll No'].notna() & df['Name'].notna()).to_numpy()
+        rows = df[['Roll No', 'Name']][present]
+        roll = pc.utf8_upper(pc.utf8_trim_whitespace(pa.array(rows['Roll No'].astype(str), type=pa.string())))
+        names = pa.array(rows['Name'].astype(str), type=pa.string())
+        names = pc.utf8_trim_whitespace(
+            pc.replace_substring_regex(pc.utf8_lower(names), r'[^\p{L}\p{N}_]+', ' ')
+        )
+
+        roll_codes, name_codes = _codes(roll), _codes(names)
+        keys = roll_codes * (name_codes.max() + 1 if len(name_codes) else 1) + name_codes
+        first_rows = np.flatnonzero(~pd.Series(keys).duplicated().to_numpy())
+        first_rows = first_rows[pc.not_equal(names, '').to_numpy(zero_copy_only=False)[first_rows]]
+
+        take = pa.array(first_rows)
+        genders = df['Gender'][present] if 'Gender' in df.columns else pd.Series('', index=rows.index)
+        return {
+            'Roll No': rows['Roll No'].to_numpy()[first_rows],
+            'Name': rows['Name'].to_numpy()[first_rows],
+            'roll': roll.take(take),
+            'name': names.take(take),
+            'roll_codes': roll_codes[first_rows],
+            'name_codes': name_codes[first_rows],
+            'gender_codes': pd.factorize(genders.to_numpy()[first_rows])[0],
+        }
+
+    def _block_pairs(self, block_codes, sort_codes, n_records):
+        """Keys i * n + j (i < j) of records in the same block within the window
+
+        Blocks with a single record are dropped before sorting.
+        """
+        sizes = np.bincount(block_codes)
+        candidates = np.flatnonzero(sizes[block_codes] > 1)
+        order = candidates[np.lexsort((sort_codes[candidates], block_codes[candidates]))]
+        sorted_blocks = block_codes[order]
+
+        pairs = []
+        for offset in range(1, self.window + 1):
+            same_block = sorted_blocks[offset:] == sorted_blocks[:-offset]
+            if not same_block.any():
+                break
+            left = order[:-offset][same_block]
+            right = order[offset:][same_block]
+            pairs.append(np.minimum(left, right) * n_records + np.maximum(left, right))
+        return np.concatenate(pairs) if pairs else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _name_similarity(names, first, rest, last, initial, is_initial, no_middle, left, right):
+        """Rule-based name similarity in [0, 1] for every candidate pair
+
+        All name parts are passed as integer codes; rest is the name after
+        the first word, so with equal last names it compares middle names.
+        """
+        same_first = first[left] == first[right]
+        same_last = last[left] == last[right]
+        # An initial is compatible with any first name starting with that letter
+        initial_match = (initial[left] == initial[right]) & (is_initial[left] | is_initial[right])
+        # Middle names only count against a match when both records have one
+        middle_match = (rest[left] == rest[right]) | no_middle[left] | no_middle[right]
+
+        return np.select(
+            [
+                names[left] == names[right],
+                same_last & same_first & middle_match,
+                same_last & initial_match & middle_match,
+                same_last,
+                same_first,
+            ],
+            [1.0, 0.95, 0.9, 0.6, 0.3],
+            default=0.0
+        )
+
+    @staticmethod
+    def _roll_edits(roll, left, right):
+        """(adjacent swap, one-character change) between Roll Nos of equal length"""
+        if not len(left):
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=bool)
+        pairs = np.unique(np.concatenate([left, right]))
+        values = roll.take(pa.array(pairs)).to_numpy(zero_copy_only=False).astype(str)
+        lengths = np.char.str_len(values)
+        codes = values.view(np.uint32).reshape(len(values), -1)
+        a, b = codes[np.searchsorted(pairs, left)], codes[np.searchsorted(pairs, right)]
+        same_length = lengths[np.searchsorted(pairs, left)] == lengths[np.searchsorted(pairs, right)]
+
+        differs = a != b
+        mismatches = differs.sum(axis=1)
+        # A transposition is two adjacent mismatches with the same characters
+        adjacent = (differs[:, 1:] & differs[:, :-1]).any(axis=1)
+        same_chars = (np.sort(a, axis=1) == np.sort(b, axis=1)).all(axis=1)
+        transposed = same_length & (mismatches == 2) & adjacent & same_chars
+        return transposed, same_length & (mismatches == 1)
+
+    @staticmethod
+    def _consecutive(roll, left, right):
+        """Pairs whose Roll Nos end in consecutive numbers (e.g. S1009 / S1010)"""
+        def trailing_number(rows):
+            digits = pc.extract_regex(roll.take(pa.array(rows, type=pa.int64())), r'(?P<digits>\d*)$')
+            return pd.to_numeric(pd.Series(digits.field('digits').to_numpy(zero_copy_only=False)), errors='coerce').to_numpy()
+
+        return np.abs(trailing_number(left) - trailing_number(right)) == 1
@@ -0,0 +1,168 @@
+"""
+Statistical outlier detection for GradeFlow application.
+
+Scores are flagged by two rules, overall and within each group of the
+configured columns (e.g. Gender, Section):
+- IQR: below Q1 - k*IQR or above Q3 + k*IQR
+- MAD: modified z-score 0.6745 * |score - median| / MAD above a threshold
+
+Quartiles, medians and MADs are read from ScoreHistogram bin counts, one
+histogram per grouping, for all groups at once. The histograms can be
+filled chunk by chunk (partial_fit) and the fences then applied to each
+chunk (flag), so the full column never has to be sorted or held at once.
+"""
+import numpy as np
+import pandas as pd
+from config import (
+    OUTLIER_GROUP_COLUMNS, OUTLIER_IQR_FACTOR, OUTLIER_MAD_THRESHOLD, OUTLIER_MIN_GROUP_SIZE
+)
+from src.core.score_histogram import ScoreHistogram
+
+OVERALL = 'Overall'
+RULES = ['IQR', 'MAD']
+THRESHOLD_COLUMNS = [
+    'Scope', 'Group', 'Count', 'Q1', 'Median', 'Q3',
+    'IQR Low', 'IQR High', 'MAD', 'MAD Low', 'MAD High'
+]
+
+
+class OutlierDetector:
+    def __init__(self, group_columns=OUTLIER_GROUP_COLUMNS, iqr_factor=OUTLIER_IQR_FACTOR,
+                 mad_threshold=OUTLIER_MAD_THRESHOLD, min_group_size=OUTLIER_MIN_GROUP_SIZE):
+        self.group_columns = group_columns
+        self.iqr_factor = iqr_factor
+        self.mad_threshold = mad_threshold
+        self.min_group_size = min_group_size
+        self.histograms = {}
+        self._fences = None
+
+    def detect(self, df):
+        """Fit on df and flag it; returns (flags, thresholds) DataFrames"""
+        self.histograms = {}
+        # Group labels are built once and shared by both passes
+        scopes = list(self._scopes(df))
+        self.partial_fit(df, scopes)
+        return self.flag(df, scopes), self.thresholds()
+
+    def partial_fit(self, chunk, scopes=None):
+        """Count one chunk of rows into the per-scope histograms"""
+        for scope, groups in scopes or self._scopes(chunk):
+            histogram = self.histograms.setdefault(scope, ScoreHistogram())
+            histogram.add(chunk['Total'], groups)
+        self._fences = None
+
+    def flag(self, chunk, scopes=None):
+        """Boolean DataFrame with one '<scope> <rule>' column per scope and rule"""
+        fences = self._compute_fences()
+        totals = chunk['Total'].to_numpy(dtype=np.float64)
+        flags = {}
+        for scope, groups in scopes or self._scopes(chunk):
+            if scope not in fences:
+                continue
+            histogram, bounds = self.histograms[scope], fences[scope]
+            if groups is None:
+                rows = np.zeros(len(totals), dtype=np.int64)
+            else:
+                # Map each row's group to its histogram row; unseen groups get the NaN row
+                lookup = np.array(
+                    [histogram.groups.index(g) if g in histogram.groups else -1 for g in groups.categories],
+                    dtype=np.int64
+                )
+                rows = lookup[groups.codes]
+            for rule in RULES:
+                low = np.append(bounds[f'{rule} Low'], np.nan)[rows]
+                high = np.append(bounds[f'{rule} High'], np.nan)[rows]
+                flags[f'{scope} {rule}'] = (totals < low) | (totals > high)
+        return pd.DataFrame(flags, index=chunk.index)
+
+    def thresholds(self):
+        """Fences of every scope and group as one DataFrame"""
+        fences = self._compute_fences()
+        frames = [
+            pd.DataFrame({'Scope': scope, 'Group': self.histograms[scope].groups, **bounds})
+            for scope, bounds in fences.items()
+        ]
+        if not frames:
+            return pd.DataFrame(columns=THRESHOLD_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[THRESHOLD_COLUMNS]
+
+    def _scopes(self, chunk):
+        """(scope name, group Categorical or None) for the overall scope and each group column"""
+        yield OVERALL, None
+        for column in self.group_columns:
+            if column in chunk.columns:
+                yield column, self._group_labels(chunk[column])
+
+    @staticmethod
+    def _group_labels(values):
+        """Group values as a Categorical of strings, missing values as 'Unknown'
+
+        Factorizing first keeps the string conversion to the distinct values.
+        """
+        codes, uniques = pd.factorize(values)
+        labels = [str(value) for value in uniques] + ['Unknown']
+        label_codes, labels = pd.factorize(pd.Index(labels))
+        # Missing values (-1) pick up the trailing 'Unknown' label
+        return pd.Categorical.from_codes(label_codes[codes], categories=labels)
+
+    def _compute_fences(self):
+        if self._fences is None:
+            self._fences = {scope: self._scope_fences(hist) for scope, hist in self.histograms.items()}
+        return self._fences
+
+    def _scope_fences(self, histogram):
+        """Quartiles, MAD and fences for every group of one histogram
+
+        Works on the nonzero bins only, as (group, bin) entries in group
+        order, so many groups with sparse counts stay cheap.
+        """
+        counts = histogram.counts
+        sizes = counts.sum(axis=1)
+        rows, bins = np.nonzero(counts)
+        weights = counts[rows, bins]
+        scores = histogram.bin_scores[bins]
+
+        q1 = self._quantiles(weights, scores, sizes, 0.25)
+        median = self._quantiles(weights, scores, sizes, 0.5)
+        q3 = self._quantiles(weights, scores, sizes, 0.75)
+
+        # MAD is the weighted median of the bin deviations from each group median
+        deviations = np.abs(scores - median[rows])
+        order = np.lexsort((deviations, rows))
+        mad = self._quantiles(weights[order], deviations[order], sizes, 0.5)
+
+        iqr = q3 - q1
+        # A zero MAD (heavily tied scores) would flag every score off the median
+        mad_scale = np.where(mad > 0, mad / 0.6745, np.inf)
+        fences = {
+            'Count': sizes,
+            'Q1': q1,
+            'Median': median,
+            'Q3': q3,
+            'IQR Low': q1 - self.iqr_factor * iqr,
+            'IQR High': q3 + self.iqr_factor * iqr,
+            'MAD': mad,
+            'MAD Low': median - self.mad_threshold * mad_scale,
+            'MAD High': median + self.mad_threshold * mad_scale,
+        }
+        too_small = sizes < self.min_group_size
+        for key in fences:
+            if key != 'Count':
+                fences[key] = np.where(too_small, np.nan, fences[key])
+        return fences
+
+    @staticmethod
+    def _quantiles(weights, values, sizes, q):
+        """Weighted q-quantile of each group, matching ScoreHistogram.quantile
+
+        weights and values are the nonzero bins of all groups, sorted by
+        group and then by value; sizes is the total weight of each group.
+        Empty groups get NaN.
+        """
+        cumulative = np.cumsum(weights)
+        # First entry whose running count reaches q of its group's count
+        before = np.cumsum(sizes) - sizes
+        position = np.searchsorted(cumulative, before + q * sizes, side='left')
+        position = np.minimum(position, max(len(values) - 1, 0))
+        quantiles = values[position] if len(values) else np.full(len(sizes), np.nan)
+        return np.where(sizes > 0, quantiles, np.nan)
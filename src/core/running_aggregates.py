@@ -0,0 +1,59 @@
+"""
+Incrementally maintained score aggregates for GradeFlow application.
+
+Running sums of Total, grade counts and a ScoreHistogram that rows can be
+added to or removed from, so statistics over a changing dataset are
+refreshed from the changed rows only. Used by DatasetMerger for correction
+files and by the watch-folder ingestion for changed result files.
+"""
+import numpy as np
+import pandas as pd
+from config import PASSING_SCORE
+from src.core.score_histogram import ScoreHistogram
+
+
+class RunningAggregates:
+    def __init__(self):
+        self.histogram = ScoreHistogram()
+        self.sums = {'count': 0, 'sum': 0.0, 'sum_sq': 0.0, 'passed': 0}
+        self.grade_counts = pd.Series(dtype=np.int64)
+
+    def add(self, rows, sign=1):
+        """Add (sign=1) or remove (sign=-1) graded rows"""
+        totals = rows['Total'].to_numpy(dtype=np.float64)
+        valid = totals[~np.isnan(totals)]
+        self.sums['count'] += sign * len(valid)
+        self.sums['sum'] += sign * valid.sum()
+        self.sums['sum_sq'] += sign * np.square(valid).sum()
+        self.sums['passed'] += sign * int(np.count_nonzero(valid >= PASSING_SCORE))
+
+        groups = rows['Gender'] if 'Gender' in rows.columns else None
+        self.histogram.add(totals, groups, sign=sign)
+
+        grade_counts = rows['Grade'].value_counts()
+        self.grade_counts = self.grade_counts.add(sign * grade_counts, fill_value=0).astype(np.int64)
+
+    def remove(self, rows):
+        """Remove previously added rows"""
+        self.add(rows, sign=-1)
+
+    def statistics(self, n_rows, min_score, max_score, median_score):
+        """Statistics in the same shape as GradeCalculator.calculate_statistics
+
+        Minimum, maximum and median cannot be kept exactly as running values
+        under removal, so the caller passes them in.
+        """
+        count, total, total_sq = self.sums['count'], self.sums['sum'], self.sums['sum_sq']
+        mean = total / count if count else np.nan
+        variance = (total_sq - total * mean) / (count - 1) if count > 1 else np.nan
+        grade_counts = self.grade_counts[self.grade_counts > 0].sort_values(ascending=False)
+        return {
+            'total_students': n_rows,
+            'mean_score': mean,
+            'median_score': median_score,
+            'std_score': np.sqrt(max(variance, 0.0)) if count > 1 else np.nan,
+            'min_score': min_score,
+            'max_score': max_score,
+            'pass_rate': self.sums['passed'] / n_rows * 100 if n_rows else 0.0,
+            'grade_distribution': grade_counts.to_dict(),
+        }
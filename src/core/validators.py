@@ -1,58 +1,122 @@
 """
 Data validation module for GradeFlow application.
 """
+import numpy as np
 import pandas as pd
-from config import REQUIRED_COLUMNS, VALID_GENDERS, MIN_SCORE, MAX_SCORE
+from config import REQUIRED_COLUMNS, VALID_GENDERS, MIN_SCORE, MAX_SCORE, IDENTITY_CHECK_ENABLED
+from src.core.identity_matcher import IdentityMatcher
+from src.core.outlier_detector import OutlierDetector
 
 
 class DataValidator:
     @staticmethod
-    def validate_data(df):
-        """Comprehensive data validation based on config"""
+    def invalid_gender_mask(genders):
+        """Boolean mask of gender entries not in VALID_GENDERS (case insensitive)"""
+        valid_genders_lower = [g.lower() for g in VALID_GENDERS]
+        return ~pd.Series(genders).astype(str).str.lower().isin(valid_genders_lower).to_numpy()
+
+    @staticmethod
+    def invalid_total_mask(totals):
+        """Boolean mask of scores outside MIN_SCORE-MAX_SCORE or missing"""
+        values = np.asarray(totals, dtype=np.float64)
+        return (values < MIN_SCORE) | (values > MAX_SCORE) | np.isnan(values)
+
+    @staticmethod
+    def add_identity_conflicts(df, issues):
+        """Run identity matching and add its conflicts to existing issues"""
+        if "Roll No" not in df.columns or "Name" not in df.columns:
+            return issues
+        conflicts = IdentityMatcher().find_conflicts(df)
+        issues['identity_conflicts'] = conflicts.to_dict('records')
+        if issues['identity_conflicts'] and issues['severity'] == 'success':
+            issues['severity'] = 'warning'
+        return issues
+
+    @staticmethod
+    def validate_data(df, column_checks=None, check_identity=IDENTITY_CHECK_ENABLED):
+        """Comprehensive data validation based on config
+
+        column_checks optionally carries precomputed 'invalid_genders' and
+        'invalid_totals' masks (see ParallelEngine) so the row-level checks
+        are not repeated here. Text read as NaN from numeric columns (listed
+        in df.attrs['non_numeric'] by the Excel reader) is an error rather
+        than a missing value. Identity matching only runs with
+        check_identity; see add_identity_conflicts() to run it later.
+        """
+        column_checks = column_checks or {}
         issues = {
             'missing_columns': [],
             'missing_values': {},
             'duplicates': 0,
             'invalid_genders': [],
             'invalid_totals': [],
+            'non_numeric_values': {},
+            'identity_conflicts': [],
+            'outliers': {},
             'severity': 'success'
         }
-        
+
         # Check missing columns
         missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         if missing_cols:
             issues['missing_columns'] = missing_cols
             issues['severity'] = 'error'
-        
+
+        # Check text in numeric columns
+        non_numeric = df.attrs.get('non_numeric', {})
+        if non_numeric:
+            issues['non_numeric_values'] = {col: df.index[rows].tolist() for col, rows in non_numeric.items()}
+            issues['severity'] = 'error'
+
         # Check missing values
         missing_values = df.isnull().sum()
+        for col, rows in non_numeric.items():
+            missing_values[col] -= len(rows)
         if missing_values.any():
             issues['missing_values'] = missing_values[missing_values > 0].to_dict()
             if issues['severity'] != 'error':
                 issues['severity'] = 'warning'
-        
+
         # Check duplicates
         duplicates = df.duplicated().sum()
         if duplicates > 0:
             issues['duplicates'] = duplicates
             if issues['severity'] != 'error':
                 issues['severity'] = 'warning'
-        
+
         # Check gender values
         if "Gender" in df.columns:
-            valid_genders_lower = [g.lower() for g in VALID_GENDERS]
-            invalid_genders = df[~df["Gender"].astype(str).str.lower().isin(valid_genders_lower)]
-            if not invalid_genders.empty:
-                issues['invalid_genders'] = invalid_genders.index.tolist()
+            mask = column_checks.get('invalid_genders')
+            if mask is None:
+                mask = DataValidator.invalid_gender_mask(df["Gender"])
+            if mask.any():
+                issues['invalid_genders'] = df.index[mask].tolist()
                 if issues['severity'] != 'error':
                     issues['severity'] = 'warning'
-        
+
         # Check total scores
         if "Total" in df.columns:
-            invalid_totals = df[(df["Total"] < MIN_SCORE) | (df["Total"] > MAX_SCORE) | pd.isna(df["Total"])]
-            if not invalid_totals.empty:
-                issues['invalid_totals'] = invalid_totals.index.tolist()
+            mask = column_checks.get('invalid_totals')
+            if mask is None:
+                mask = DataValidator.invalid_total_mask(df["Total"])
+            if mask.any():
+                issues['invalid_totals'] = df.index[mask].tolist()
                 if issues['severity'] != 'error':
                     issues['severity'] = 'warning'
-        
+
+        # Check for the same student under different Roll No / name spellings
+        if check_identity:
+            DataValidator.add_identity_conflicts(df, issues)
+
+        # Statistical outliers are reported for review but do not affect severity
+        if "Total" in df.columns:
+            flags, thresholds = OutlierDetector().detect(df)
+            flagged = flags.any(axis=1).to_numpy()
+            if flagged.any():
+                issues['outliers'] = {
+                    'rows': df.index[flagged].tolist(),
+                    'counts': {rule: int(count) for rule, count in flags.sum().items()},
+                    'thresholds': thresholds.to_dict('records'),
+                }
+
         return issues
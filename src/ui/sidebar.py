@@ -2,7 +2,12 @@
 Sidebar components for GradeFlow application.
 """
 import streamlit as st
-from config import PASSING_SCORE, MIN_SCORE, MAX_SCORE, ALLOWED_FILE_TYPES
+import pandas as pd
+from config import (
+    PASSING_SCORE, MIN_SCORE, MAX_SCORE, ALLOWED_FILE_TYPES, GRADE_SCALE, LATENCY_BUDGET_MS,
+    LATENCY_REFRESH_INTERVAL
+)
+from src.utils.latency import track_latency, latency_summary
 
 
 def render_sidebar():
@@ -20,14 +25,17 @@ def render_sidebar():
         render_system_info_section()
 
 
+@st.cache_data
+def get_sample_csv():
+    """Sample CSV, built once instead of on every rerun"""
+    from .ui_components import create_sample_data
+    return create_sample_data().to_csv(index=False)
+
+
 def render_sample_data_section():
     """Render sample data download section"""
-    from .ui_components import create_sample_data
-    
     st.subheader("📥 Sample Data")
-    sample_data = create_sample_data()
-    
-    csv_sample = sample_data.to_csv(index=False)
+    csv_sample = get_sample_csv()
     st.download_button(
         label="📄 Download Sample CSV",
         data=csv_sample,
@@ -53,3 +61,71 @@ def render_system_info_section():
     **Score Range**: {MIN_SCORE}-{MAX_SCORE}
     **File Types**: {', '.join(ALLOWED_FILE_TYPES)}
     """)
+
+
+@st.fragment
+@track_latency("Grade simulator")
+def render_grade_simulator_section(histogram):
+    """Render the what-if grade scale simulator; reruns on its own when dragged"""
+    from src.core.grade_simulator import GradeSimulator
+
+    st.subheader("🧪 What-if Simulator")
+    simulator = GradeSimulator(histogram)
+
+    scale = {}
+    with st.expander("🎚️ Grade Boundaries"):
+        for grade, (min_score, max_score) in GRADE_SCALE.items():
+            scale[grade] = st.slider(
+                grade, min_value=MIN_SCORE, max_value=MAX_SCORE,
+                value=(min_score, max_score), key=f"sim_scale_{grade}"
+            )
+    passing_score = st.slider(
+        "✅ Passing Score", min_value=MIN_SCORE, max_value=MAX_SCORE,
+        value=PASSING_SCORE, key="sim_passing_score"
+    )
+
+    # Flag problems in the candidate scale
+    scale_report = GradeSimulator.check_scale(scale)
+    for low, high in scale_report['gaps']:
+        st.warning(f"⚠️ Scores {low}-{high} match no grade and fall back to F")
+    for grade_a, grade_b, low, high in scale_report['overlaps']:
+        st.warning(f"⚠️ {grade_a} and {grade_b} overlap on {low}-{high} ({grade_a} takes precedence)")
+    for grade in scale_report['inverted']:
+        st.error(f"❌ {grade} has its minimum above its maximum")
+
+    simulation = simulator.simulate(scale, passing_score)
+    baseline = simulator.simulate(GRADE_SCALE, PASSING_SCORE)
+
+    st.metric(
+        "Simulated Pass Rate",
+        f"{simulation['pass_rate']:.1f}%",
+        delta=f"{simulation['pass_rate'] - baseline['pass_rate']:+.1f}% vs current"
+    )
+    if simulation['unbanded']:
+        st.caption(f"ℹ️ {simulation['unbanded']} students score between bands and receive F")
+
+    st.dataframe(simulation['distribution'], use_container_width=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Pass Rate %': simulation['group_pass_rates'],
+            'Current %': baseline['group_pass_rates'],
+        }).round(1),
+        use_container_width=True
+    )
+
+
+def render_latency_section():
+    """Render per-section timings against the interaction latency budget
+
+    Called after the page has been timed. Fragment reruns do not redraw
+    the sidebar, so with live updates on the table refreshes itself.
+    """
+    with st.expander("⏱️ Interaction Latency"):
+        st.caption(f"Budget: {LATENCY_BUDGET_MS} ms per interaction")
+        live = st.toggle("Live updates", key="latency_live", help="Refresh the table to include fragment reruns")
+        st.fragment(render_latency_table, run_every=LATENCY_REFRESH_INTERVAL if live else None)()
+
+
+def render_latency_table():
+    """Render the per-section latency summary"""
+    st.dataframe(latency_summary(), use_container_width=True)
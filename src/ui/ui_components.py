@@ -107,6 +107,7 @@ def display_metric_card(title, value, delta=None, help_text=""):
         st.caption(help_text)
 
 
+@st.cache_data
 def display_grade_scale():
     """Display the current grade scale"""
     grade_df = pd.DataFrame([
@@ -0,0 +1,122 @@
+"""
+Lookup and ordering indexes for the data preview in GradeFlow application.
+
+Built once per dataset so that paging, sorting and student lookup only
+touch the rows that are actually shown:
+- Roll No: hash lookup into a CSR table of row positions per roll number
+- Name: sorted index of lowercased name tokens for prefix search
+- Sort orders: argsort per column, computed on first use and cached
+"""
+import numpy as np
+import pandas as pd
+
+
+class StudentIndex:
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self._sort_orders = {}
+        self._build_roll_index(df)
+        self._build_name_index(df)
+
+    def _build_roll_index(self, df):
+        """Roll No -> row positions, stored as offsets into one position array"""
+        if 'Roll No' not in df.columns:
+            self._roll_keys = None
+            return
+        roll_numbers = df['Roll No'].astype(str).str.strip().to_numpy()
+        codes, uniques = pd.factorize(roll_numbers)
+        self._roll_keys = pd.Index(uniques)
+        self._roll_positions, self._roll_offsets = self._group_rows(codes, len(uniques))
+
+    def _build_name_index(self, df):
+        """Sorted distinct lowercased name tokens, each with its row positions"""
+        if 'Name' not in df.columns:
+            self._names = None
+            return
+        self._names = df['Name'].fillna('').astype(str).str.lower().to_numpy()
+        tokens = pd.Series(self._names, copy=False).str.split().explode().dropna()
+        # Sorting the distinct tokens is far cheaper than sorting every token
+        codes, uniques = pd.factorize(tokens.to_numpy(), sort=True)
+        self._name_tokens = uniques
+        order, self._name_offsets = self._group_rows(codes, len(uniques))
+        self._name_rows = tokens.index.to_numpy()[order]
+
+    @staticmethod
+    def _group_rows(codes, n_groups):
+        """Positions ordered by code plus offsets delimiting each code's run"""
+        order = np.argsort(codes, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_groups))])
+        return order, offsets
+
+    def lookup_roll_no(self, roll_no):
+        """Row positions whose Roll No equals roll_no exactly"""
+        if self._roll_keys is None:
+            return np.empty(0, dtype=np.int64)
+        try:
+            code = self._roll_keys.get_loc(str(roll_no).strip())
+        except KeyError:
+            return np.empty(0, dtype=np.int64)
+        return self._roll_positions[self._roll_offsets[code]:self._roll_offsets[code + 1]]
+
+    def search_name(self, query):
+        """Row positions whose name has a word starting with the first query
+        word and contains the whole query"""
+        query = query.strip().lower()
+        if self._names is None or not query:
+            return np.empty(0, dtype=np.int64)
+        prefix = query.split()[0]
+        first = np.searchsorted(self._name_tokens, prefix, side='left')
+        last = np.searchsorted(self._name_tokens, prefix + '\U0010ffff', side='left')
+        rows = self._name_rows[self._name_offsets[first]:self._name_offsets[last]]
+        candidates = np.unique(rows)
+        if ' ' in query:
+            contains = pd.Series(self._names[candidates]).str.contains(query, regex=False).to_numpy()
+            candidates = candidates[contains]
+        return candidates
+
+    def search(self, query):
+        """Roll No match if there is one, otherwise name prefix matches"""
+        positions = self.lookup_roll_no(query)
+        if len(positions):
+            return positions
+        return self.search_name(query)
+
+    def sort_order(self, df, column, ascending=True):
+        """Stable argsort of a column with missing values last in either direction
+
+        Only the non-missing values are sorted and cached; missing values
+        (including NaN/None in text columns) keep their row order at the end.
+        """
+        if column not in self._sort_orders:
+            values = df[column]
+            missing = values.isna().to_numpy()
+            present = np.flatnonzero(~missing)
+            values = values.iloc[present]
+            if values.dtype == object:
+                values = values.astype(str).str.lower()
+            order = present[np.argsort(values.to_numpy(), kind='stable')]
+            self._sort_orders[column] = (order, np.flatnonzero(missing))
+        order, missing_rows = self._sort_orders[column]
+        if not ascending:
+            order = order[::-1]
+        return np.concatenate([order, missing_rows])
+
+    def page(self, df, mask=None, positions=None, sort_by=None, ascending=True, page=1, page_size=50):
+        """Rows of one preview page plus the number of matching rows
+
+        mask restricts to filtered rows, positions to search results.
+        """
+        if sort_by:
+            order = self.sort_order(df, sort_by, ascending)
+        else:
+            order = np.arange(self.n_rows)
+
+        keep = np.ones(self.n_rows, dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+        if positions is not None:
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[positions] = True
+            keep &= selected
+        order = order[keep[order]]
+
+        start = (page - 1) * page_size
+        return df.iloc[order[start:start + page_size]], len(order)
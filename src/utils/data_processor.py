@@ -2,19 +2,145 @@
 Data processing utilities for GradeFlow application.
 """
 import pandas as pd
+import numpy as np
 import io
+from array import array
 from datetime import datetime
-from config import MIN_SCORE, MAX_SCORE, EXCEL_ENGINE, EXPORT_DATE_FORMAT
+from openpyxl import load_workbook
+from config import MIN_SCORE, MAX_SCORE, EXCEL_ENGINE, EXPORT_DATE_FORMAT, EXCEL_PROGRESS_ROWS
+from src.utils.expression_filter import compile_filter
+
+NUMERIC_COLUMNS = ['Total']
 
 
 class DataProcessor:
     @staticmethod
-    def read_uploaded_file(uploaded_file):
-        """Read uploaded CSV or Excel file"""
+    def read_uploaded_file(uploaded_file, sheet_name=None, header_row=1, columns=None, progress=None):
+        """Read uploaded CSV, Parquet or Excel file
+
+        sheet_name, header_row, columns and progress apply to Excel files
+        only, see read_excel_streaming.
+        """
         if uploaded_file.name.endswith('.csv'):
             return pd.read_csv(uploaded_file)
+        elif uploaded_file.name.endswith('.parquet'):
+            return pd.read_parquet(uploaded_file)
+        elif uploaded_file.name.endswith('.xlsx'):
+            return DataProcessor.read_excel_streaming(
+                uploaded_file, sheet_name=sheet_name, header_row=header_row,
+                columns=columns, progress=progress
+            )
         else:
             return pd.read_excel(uploaded_file)
+
+    @staticmethod
+    def get_excel_layout(file_obj, header_row=1):
+        """Return {sheet name: header column names} without loading the data"""
+        workbook = load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            layout = {}
+            for sheet in workbook.worksheets:
+                header = next(sheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True), ())
+                names = DataProcessor._dedupe_header(
+                    [str(name).strip() if name is not None else None for name in header]
+                )
+                layout[sheet.title] = [name for name in names if name is not None]
+            return layout
+        finally:
+            workbook.close()
+            file_obj.seek(0)
+
+    @staticmethod
+    def read_excel_streaming(file_obj, sheet_name=None, header_row=1, columns=None, progress=None):
+        """Stream an XLSX sheet row by row keeping only the requested columns
+
+        Uses openpyxl's read-only mode so cells are never materialised as
+        objects; numeric columns are accumulated straight into typed arrays.
+        Repeated header names get .1, .2 suffixes like pd.read_excel. Rows
+        with text in a numeric column are read as NaN and listed per column
+        in df.attrs['non_numeric'] for validation to report.
+        progress, if given, is called with (rows_read, estimated_total_rows).
+        """
+        workbook = load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            rows = sheet.iter_rows(min_row=header_row, values_only=True)
+            header = DataProcessor._dedupe_header(
+                [str(name).strip() if name is not None else None for name in next(rows, ())]
+            )
+
+            # Column positions to keep, in sheet order
+            keep = [
+                (position, name) for position, name in enumerate(header)
+                if name is not None and (columns is None or name in columns)
+            ]
+            values = {
+                name: array('d') if name in NUMERIC_COLUMNS else []
+                for _, name in keep
+            }
+            text_rows = {name: [] for _, name in keep if name in NUMERIC_COLUMNS}
+            appenders = [
+                (position, values[name].append, text_rows.get(name))
+                for position, name in keep
+            ]
+            estimated_rows = max((sheet.max_row or 0) - header_row, 0)
+
+            rows_read = 0
+            for row in rows:
+                cells = [row[position] if position < len(row) else None for position, _, _ in appenders]
+                # Skip fully blank rows the way pandas does
+                if all(cell is None for cell in cells):
+                    continue
+                for cell, (_, append, text) in zip(cells, appenders):
+                    if text is None:
+                        append(cell)
+                        continue
+                    number = DataProcessor._to_float(cell)
+                    if number != number and cell is not None and str(cell).strip():
+                        text.append(rows_read)
+                    append(number)
+                rows_read += 1
+                if progress and rows_read % EXCEL_PROGRESS_ROWS == 0:
+                    progress(rows_read, estimated_rows)
+
+            data = {
+                name: np.frombuffer(column, dtype=np.float64) if name in NUMERIC_COLUMNS
+                else pd.Series(column, dtype=object).infer_objects()
+                for name, column in values.items()
+            }
+            df = pd.DataFrame(data)
+            non_numeric = {name: rows for name, rows in text_rows.items() if rows}
+            if non_numeric:
+                df.attrs['non_numeric'] = non_numeric
+            return df
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _dedupe_header(names):
+        """Rename repeated column names to name.1, name.2, ... as pandas does"""
+        counts = {}
+        deduped = []
+        for name in names:
+            if name is not None:
+                count = counts.get(name, 0)
+                while count:
+                    counts[name] = count + 1
+                    name = f"{name}.{count}"
+                    count = counts.get(name, 0)
+                counts[name] = count + 1
+            deduped.append(name)
+        return deduped
+
+    @staticmethod
+    def _to_float(value):
+        """Convert a cell value to float, mapping blanks and text to NaN"""
+        if value is None:
+            return np.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
     
     @staticmethod
     def clean_data(df):
@@ -62,21 +188,32 @@ class DataProcessor:
         return f"gradeflow_report_{datetime.now().strftime(EXPORT_DATE_FORMAT)}.xlsx"
     
     @staticmethod
-    def filter_dataframe(df, grade_filter=None, gender_filter=None, score_range=None):
-        """Apply filters to dataframe"""
-        filtered_df = df.copy()
-        
+    def filter_mask(df, grade_filter=None, gender_filter=None, score_range=None, expression=None, index=None):
+        """Boolean row mask for the given filters
+
+        expression is a filter such as 'Total >= 35 and Gender == "Female"',
+        see src.utils.expression_filter; index is an optional StudentIndex
+        of df used for Roll No lookups. Raises ExpressionError for invalid
+        expressions.
+        """
+        mask = np.ones(len(df), dtype=bool)
+
         if grade_filter and 'Grade' in df.columns:
-            filtered_df = filtered_df[filtered_df['Grade'].isin(grade_filter)]
-        
+            mask &= df['Grade'].isin(grade_filter).to_numpy()
+
         if gender_filter and 'Gender' in df.columns:
-            filtered_df = filtered_df[filtered_df['Gender'].isin(gender_filter)]
-        
+            mask &= df['Gender'].isin(gender_filter).to_numpy()
+
         if score_range and 'Total' in df.columns:
             min_score, max_score = score_range
-            filtered_df = filtered_df[
-                (filtered_df['Total'] >= min_score) & 
-                (filtered_df['Total'] <= max_score)
-            ]
-        
-        return filtered_df
+            mask &= ((df['Total'] >= min_score) & (df['Total'] <= max_score)).to_numpy()
+
+        if expression and expression.strip():
+            mask &= compile_filter(expression.strip()).mask(df, index)
+
+        return mask
+
+    @staticmethod
+    def filter_dataframe(df, grade_filter=None, gender_filter=None, score_range=None, expression=None):
+        """Apply filters to dataframe"""
+        return df[DataProcessor.filter_mask(df, grade_filter, gender_filter, score_range, expression)].copy()
@@ -0,0 +1,101 @@
+"""
+Benchmark of ParallelEngine against its serial in-process path.
+
+Generates a frame of random Total and Gender values, runs the engine once
+in this process and once over the shared process pool, checks that both
+give the same masks, grades and gender codes, and reports the best time of
+each and the speedup. Worker processes are started before timing, so their
+start-up is not counted.
+
+    python -m src.utils.engine_benchmark --rows 10000000 --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from config import PARALLEL_CHUNK_ROWS
+from src.utils import parallel_engine
+from src.utils.parallel_engine import ParallelEngine, get_worker_count
+
+
+def generate_frame(rows, seed=0):
+    """Random Total and Gender columns with a few missing and invalid values"""
+    rng = np.random.default_rng(seed)
+    genders = np.array(['Male', 'Female', 'male', 'Other', None], dtype=object)
+    return pd.DataFrame({
+        'Total': np.clip(rng.normal(60, 20, rows), -5, 105).round(1),
+        'Gender': genders[rng.choice(len(genders), rows, p=[0.45, 0.45, 0.04, 0.03, 0.03])],
+    })
+
+
+def best_seconds(engine, df, repeat):
+    """Fastest of repeat runs, with the results of the last one"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = engine.run(df)
+        timings.append(time.perf_counter() - started)
+    return min(timings), results
+
+
+def run_benchmark(rows, workers=None, chunk_rows=PARALLEL_CHUNK_ROWS, repeat=3):
+    """Time the serial and parallel paths on the same frame"""
+    with mock.patch.object(parallel_engine, 'PARALLEL_MAX_WORKERS', workers or get_worker_count()):
+        n_workers = get_worker_count()
+        df = generate_frame(rows)
+        serial = ParallelEngine(min_rows=rows + 1, chunk_rows=chunk_rows)
+        parallel = ParallelEngine(min_rows=0, chunk_rows=chunk_rows)
+
+        # One-row chunks make the pool start every worker before timing
+        ParallelEngine(min_rows=0, chunk_rows=1).run(generate_frame(n_workers * 2))
+
+        serial_seconds, expected = best_seconds(serial, df, repeat)
+        parallel_seconds, results = best_seconds(parallel, df, repeat)
+
+    for key, values in expected.items():
+        if key == 'gender_categories':
+            assert results[key] == values, key
+        else:
+            np.testing.assert_array_equal(results[key], values, err_msg=key)
+    return {
+        'rows': rows,
+        'workers': n_workers,
+        'cpus': os.cpu_count(),
+        'chunk_rows': chunk_rows,
+        'serial_seconds': round(serial_seconds, 3),
+        'parallel_seconds': round(parallel_seconds, 3),
+        'speedup': round(serial_seconds / parallel_seconds, 2) if parallel_seconds else None,
+    }
+
+
+def print_report(report):
+    print(f"{report['rows']:,} rows, {report['workers']} workers on {report['cpus']} CPUs, "
+          f"chunks of {report['chunk_rows']:,} rows")
+    if report['workers'] == 1:
+        print("Only one worker: the parallel path falls back to in-process execution")
+    print(f"Serial:   {report['serial_seconds']}s")
+    print(f"Parallel: {report['parallel_seconds']}s ({report['speedup']}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parallel validation and grading engine")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows in the generated frame")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: PARALLEL_MAX_WORKERS or CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=PARALLEL_CHUNK_ROWS, help="Rows per worker task")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each path; the fastest is reported")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.rows, workers=args.workers, chunk_rows=args.chunk_rows, repeat=args.repeat)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Temporary export files for GradeFlow application.
+
+Large archives (report cards, split exports) are written straight to a
+temporary file instead of an in-memory buffer, and the UI keeps only this
+handle. The file is deleted once the handle is replaced or garbage
+collected, e.g. when the session ends.
+"""
+import os
+import tempfile
+import weakref
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ExportFile:
+    def __init__(self, write, suffix='.zip'):
+        """Create a temporary file and fill it with write(file_obj)
+
+        The return value of write is kept as summary. The file is removed
+        again if write raises.
+        """
+        handle, self.path = tempfile.mkstemp(prefix='gradeflow_', suffix=suffix)
+        self._finalizer = weakref.finalize(self, _remove, self.path)
+        try:
+            with os.fdopen(handle, 'wb') as file_obj:
+                self.summary = write(file_obj)
+        except BaseException:
+            self._finalizer()
+            raise
+
+    def open(self):
+        """The finished file, opened for reading"""
+        return open(self.path, 'rb')
@@ -0,0 +1,288 @@
+"""
+Expression filters for the data preview in GradeFlow application.
+
+A filter such as `Total >= 35 and Total < 40 and Gender == "Female"` is
+parsed with the ast module, checked against a small whitelist of node
+types and compiled once into a tree of closures that evaluate to numpy
+boolean masks over whole columns. Nothing is passed to eval(). Compiled
+filters are cached by expression text.
+
+Supported syntax:
+- columns by name, or in backticks when they contain spaces: `Roll No`
+- numbers, "text", True/False and lists of these
+- comparisons ==, !=, <, <=, >, >= (chained too), in, not in
+- and, or, not; + - * / on numeric columns
+- contains(col, "text"), startswith(col, "text"), isna(col), notna(col)
+
+Roll No equality (==, !=, in, not in) compares the stripped text of the
+roll number on both sides, so "2021001" and 2021001 match the same rows
+whether the column holds text or numbers. It uses the StudentIndex hash
+lookup when one is given and a scan of the same normalized text otherwise.
+"""
+import ast
+import operator
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from config import EXPRESSION_CACHE_SIZE
+
+QUOTED_COLUMN = re.compile(r'`([^`]+)`')
+COMPARISONS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+ARITHMETIC = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed, compiled or evaluated"""
+
+
+class _Context:
+    """One evaluation: the frame, its optional index and converted columns"""
+
+    def __init__(self, df, index):
+        self.df = df
+        self.index = index
+        self._columns = {}
+        self._roll_numbers = None
+
+    def column(self, name):
+        if name not in self.df.columns:
+            raise ExpressionError(f"Unknown column '{name}'")
+        if name not in self._columns:
+            self._columns[name] = self.df[name].to_numpy()
+        return self._columns[name]
+
+    def roll_numbers(self):
+        """Roll No as stripped text, normalized like StudentIndex keys"""
+        if 'Roll No' not in self.df.columns:
+            raise ExpressionError("Unknown column 'Roll No'")
+        if self._roll_numbers is None:
+            self._roll_numbers = self.df['Roll No'].astype(str).str.strip().to_numpy()
+        return self._roll_numbers
+
+
+class CompiledFilter:
+    def __init__(self, text, evaluate, columns):
+        self.text = text
+        self.columns = columns
+        self._evaluate = evaluate
+
+    def mask(self, df, index=None):
+        """Boolean mask over the rows of df"""
+        result = self._evaluate(_Context(df, index))
+        if not isinstance(result, np.ndarray) or result.dtype != bool or result.shape != (len(df),):
+            raise ExpressionError("Expression must be a condition on columns, e.g. Total >= 40")
+        return result
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_filter(text):
+    """Parse and compile an expression; cached by its text"""
+    quoted = {}
+
+    def placeholder(match):
+        name = f'__column_{len(quoted)}'
+        quoted[name] = match.group(1)
+        return name
+
+    source = QUOTED_COLUMN.sub(placeholder, text.strip())
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}") from None
+
+    compiler = _Compiler(quoted)
+    evaluate = compiler.compile(tree.body)
+    return CompiledFilter(text, evaluate, sorted(compiler.columns))
+
+
+class _Compiler:
+    """Turns a whitelisted expression tree into nested closures"""
+
+    def __init__(self, quoted):
+        self.quoted = quoted
+        self.columns = set()
+
+    def compile(self, node):
+        method = getattr(self, f'_compile_{type(node).__name__}', None)
+        if method is None:
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        return method(node)
+
+    def _column_name(self, node):
+        return self.quoted.get(node.id, node.id)
+
+    def _compile_Name(self, node):
+        if node.id in ('True', 'False'):
+            value = node.id == 'True'
+            return lambda ctx: value
+        name = self._column_name(node)
+        self.columns.add(name)
+        return lambda ctx: ctx.column(name)
+
+    def _compile_Constant(self, node):
+        if not isinstance(node.value, (str, int, float, bool)):
+            raise ExpressionError(f"Unsupported value: {node.value!r}")
+        value = node.value
+        return lambda ctx: value
+
+    def _compile_List(self, node):
+        values = [self._constant(element) for element in node.elts]
+        return lambda ctx: values
+
+    _compile_Tuple = _compile_List
+
+    def _constant(self, node):
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -self._constant(node.operand)
+        if not isinstance(node, ast.Constant) or not isinstance(node.value, (str, int, float, bool)):
+            raise ExpressionError("Lists may only contain numbers or text")
+        return node.value
+
+    def _compile_BoolOp(self, node):
+        parts = [self.compile(value) for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+        def evaluate(ctx):
+            result = parts[0](ctx)
+            for part in parts[1:]:
+                result = combine(result, part(ctx))
+            return result
+        return evaluate
+
+    def _compile_UnaryOp(self, node):
+        operand = self.compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda ctx: np.logical_not(operand(ctx))
+        if isinstance(node.op, ast.USub):
+            return lambda ctx: -_numeric(operand(ctx))
+        raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+
+    def _compile_BinOp(self, node):
+        op = ARITHMETIC.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = self.compile(node.left), self.compile(node.right)
+        return lambda ctx: op(_numeric(left(ctx)), _numeric(right(ctx)))
+
+    def _compile_Compare(self, node):
+        # a < b < c is evaluated as (a < b) and (b < c)
+        operands = [node.left] + node.comparators
+        steps = [
+            self._comparison(left, op, right)
+            for left, op, right in zip(operands, node.ops, operands[1:])
+        ]
+
+        def evaluate(ctx):
+            result = steps[0](ctx)
+            for step in steps[1:]:
+                result = np.logical_and(result, step(ctx))
+            return result
+        return evaluate
+
+    def _comparison(self, left_node, op, right_node):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            membership = self._membership(left_node, right_node)
+            if isinstance(op, ast.NotIn):
+                return lambda ctx: np.logical_not(membership(ctx))
+            return membership
+
+        compare = COMPARISONS.get(type(op))
+        if compare is None:
+            raise ExpressionError(f"Unsupported comparison: {type(op).__name__}")
+
+        if isinstance(op, (ast.Eq, ast.NotEq)):
+            roll_value = self._roll_value(left_node, right_node)
+            if roll_value is not None:
+                self.columns.add('Roll No')
+                if isinstance(op, ast.NotEq):
+                    return lambda ctx: np.logical_not(_roll_mask(ctx, [roll_value]))
+                return lambda ctx: _roll_mask(ctx, [roll_value])
+
+        left, right = self.compile(left_node), self.compile(right_node)
+        return lambda ctx: _compare(compare, left(ctx), right(ctx))
+
+    def _membership(self, left_node, right_node):
+        if not isinstance(right_node, (ast.List, ast.Tuple)):
+            raise ExpressionError("'in' needs a list, e.g. Grade in [\"A\", \"A+\"]")
+        values = [self._constant(element) for element in right_node.elts]
+        if self._is_roll_column(left_node):
+            self.columns.add('Roll No')
+            return lambda ctx: _roll_mask(ctx, values)
+
+        left = self.compile(left_node)
+        return lambda ctx: pd.Series(left(ctx)).isin(values).to_numpy()
+
+    def _is_roll_column(self, node):
+        return isinstance(node, ast.Name) and self._column_name(node) == 'Roll No'
+
+    def _roll_value(self, left_node, right_node):
+        """The constant of `Roll No` == constant (either side), else None"""
+        if self._is_roll_column(left_node) and isinstance(right_node, ast.Constant):
+            return self._constant(right_node)
+        if self._is_roll_column(right_node) and isinstance(left_node, ast.Constant):
+            return self._constant(left_node)
+        return None
+
+    def _compile_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ExpressionError("Only contains(), startswith(), isna() and notna() can be called")
+        name = node.func.id
+        args = [self.compile(arg) for arg in node.args]
+        if name in ('isna', 'notna') and len(args) == 1:
+            missing = lambda ctx: pd.isna(args[0](ctx))
+            return missing if name == 'isna' else (lambda ctx: np.logical_not(missing(ctx)))
+        if name in ('contains', 'startswith') and len(args) == 2:
+            def evaluate(ctx):
+                values = pd.Series(args[0](ctx))
+                text = str(args[1](ctx))
+                # Missing values never match; only present values are compared as text
+                present = values.notna().to_numpy()
+                strings = values[present].astype(str).str
+                if name == 'contains':
+                    found = strings.contains(text, case=False, regex=False, na=False)
+                else:
+                    found = strings.startswith(text, na=False)
+                matches = np.zeros(len(values), dtype=bool)
+                matches[present] = found.to_numpy(dtype=bool)
+                return matches
+            return evaluate
+        raise ExpressionError(f"Unknown function or wrong arguments: {name}()")
+
+
+def _roll_mask(ctx, values):
+    """Rows whose Roll No text matches any value, via the index when there is one"""
+    if ctx.index is None:
+        keys = [str(value).strip() for value in values]
+        return pd.Series(ctx.roll_numbers(), copy=False).isin(keys).to_numpy()
+    if 'Roll No' not in ctx.df.columns:
+        raise ExpressionError("Unknown column 'Roll No'")
+    mask = np.zeros(len(ctx.df), dtype=bool)
+    for value in values:
+        mask[ctx.index.lookup_roll_no(value)] = True
+    return mask
+
+
+def _numeric(values):
+    if isinstance(values, str) or (isinstance(values, np.ndarray) and values.dtype == object):
+        raise ExpressionError("Arithmetic needs numeric columns")
+    return values
+
+
+def _compare(compare, left, right):
+    """Vectorized comparison with a clear error for text vs number"""
+    left_text = isinstance(left, str) or (isinstance(left, np.ndarray) and left.dtype == object)
+    right_text = isinstance(right, str) or (isinstance(right, np.ndarray) and right.dtype == object)
+    left_number = isinstance(left, (int, float)) or (isinstance(left, np.ndarray) and left.dtype.kind in 'iufb')
+    right_number = isinstance(right, (int, float)) or (isinstance(right, np.ndarray) and right.dtype.kind in 'iufb')
+    if (left_text and right_number) or (left_number and right_text):
+        raise ExpressionError("Cannot compare text with a number; quote numbers stored as text")
+    try:
+        return np.asarray(compare(left, right), dtype=bool)
+    except TypeError as e:
+        raise ExpressionError(f"Cannot compare these values: {e}") from None
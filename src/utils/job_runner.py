@@ -0,0 +1,130 @@
+"""
+Background job execution for GradeFlow application.
+
+Jobs run on a shared thread pool so long-running work never blocks the
+Streamlit script thread. A job reports its current stage and row counts,
+which the UI polls to drive a progress bar, and can be cancelled
+cooperatively between units of work.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_MAX_WORKERS, JOB_HISTORY
+
+_executor = ThreadPoolExecutor(max_workers=JOB_MAX_WORKERS, thread_name_prefix="gradeflow-job")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested"""
+
+
+class Job:
+    def __init__(self, name, stages):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.stages = list(stages)
+        self.status = 'pending'
+        self.stage = None
+        self.rows_processed = 0
+        self.total_rows = 0
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def update(self, stage=None, rows_processed=None, total_rows=None):
+        """Record progress; raises JobCancelled if the job was cancelled"""
+        with self._lock:
+            if stage is not None and stage != self.stage:
+                self.stage = stage
+                self.rows_processed = 0
+            if total_rows is not None:
+                self.total_rows = total_rows
+            if rows_processed is not None:
+                self.rows_processed = rows_processed
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation has been requested"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"Job '{self.name}' was cancelled")
+
+    def cancel(self):
+        """Request cancellation; the job stops at its next progress update"""
+        self._cancel_event.set()
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+    @property
+    def progress(self):
+        """Overall completion as a fraction between 0 and 1"""
+        with self._lock:
+            if self.status == 'done':
+                return 1.0
+            if self.stage not in self.stages:
+                return 0.0
+            stage_fraction = 0.0
+            if self.total_rows:
+                stage_fraction = min(self.rows_processed / self.total_rows, 1.0)
+            return (self.stages.index(self.stage) + stage_fraction) / len(self.stages)
+
+    @property
+    def elapsed(self):
+        """Seconds since the job started running"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def describe(self):
+        """Human readable one-line status"""
+        if self.status == 'running' and self.stage:
+            text = f"{self.stage.title()}"
+            if self.total_rows:
+                text += f" – {self.rows_processed:,} / {self.total_rows:,} rows"
+            return text
+        return self.status.title()
+
+    def _run(self, target, args, kwargs):
+        self.status = 'running'
+        self.started_at = time.perf_counter()
+        try:
+            self.check_cancelled()
+            self.result = target(self, *args, **kwargs)
+            self.status = 'done'
+        except JobCancelled:
+            self.status = 'cancelled'
+        except Exception as e:
+            self.error = e
+            self.status = 'failed'
+        finally:
+            self.finished_at = time.perf_counter()
+
+
+class JobRunner:
+    @staticmethod
+    def submit(name, stages, target, *args, **kwargs):
+        """Run target(job, *args, **kwargs) in the background and return the Job"""
+        job = Job(name, stages)
+        _executor.submit(job._run, target, args, kwargs)
+        return job
+
+    @staticmethod
+    def prune(jobs, keep=(), max_finished=JOB_HISTORY, collected=None):
+        """Drop the oldest finished jobs from a {key: Job} dict beyond max_finished
+
+        Unfinished jobs and jobs under the keys in keep are never dropped.
+        With a set of collected job ids, done jobs whose result has not been
+        collected yet are kept as well.
+        """
+        finished = [
+            key for key, job in jobs.items()
+            if job.is_finished and key not in keep
+            and not (collected is not None and job.status == 'done' and job.id not in collected)
+        ]
+        for key in finished[:max(len(finished) - max_finished, 0)]:
+            del jobs[key]
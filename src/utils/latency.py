@@ -0,0 +1,53 @@
+"""
+Per-interaction latency tracking for GradeFlow application.
+
+Sections of the page (the full script run and each fragment) are timed on
+every run and the timings are kept in session state, so each interaction
+can be checked against LATENCY_BUDGET_MS.
+"""
+import functools
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import LATENCY_BUDGET_MS, LATENCY_HISTORY
+
+
+def record_latency(section, milliseconds):
+    """Store one timing in the session history"""
+    if 'latency' not in st.session_state:
+        st.session_state.latency = deque(maxlen=LATENCY_HISTORY)
+    st.session_state.latency.append({'Section': section, 'ms': milliseconds})
+
+
+def track_latency(section):
+    """Decorator timing each call of a page section or fragment"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Also runs when the section stops early with st.rerun()
+                record_latency(section, (time.perf_counter() - started) * 1000)
+        return wrapper
+    return decorator
+
+
+def latency_summary():
+    """Per-section count, last, median, p95 and over-budget runs"""
+    history = list(st.session_state.get('latency', []))
+    if not history:
+        return pd.DataFrame(columns=['Runs', 'Last ms', 'Median ms', 'P95 ms', 'Over Budget'])
+    timings = pd.DataFrame(history)
+    grouped = timings.groupby('Section', sort=False)['ms']
+    return pd.DataFrame({
+        'Runs': grouped.size(),
+        'Last ms': grouped.last(),
+        'Median ms': grouped.median(),
+        'P95 ms': grouped.quantile(0.95),
+        'Over Budget': grouped.agg(lambda values: int(np.sum(values > LATENCY_BUDGET_MS))),
+    }).round(1)
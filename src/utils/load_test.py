@@ -0,0 +1,387 @@
+"""
+Concurrent-session load test for the GradeFlow Streamlit app.
+
+Drives app.py headlessly through streamlit.testing's AppTest. All simulated
+sessions run as threads against one app instance in this process, sharing
+its module state, caches, job runner and CPU the way browser sessions share
+a Streamlit server. A session opens the page, uploads a generated dataset
+through the real file uploader, waits for processing, moves the filters,
+searches, sorts, pages and runs the split export.
+
+AppTest was written for one app per process, so run_load_test replaces its
+per-run mock runtime with one shared runtime and gives every session its
+own uploaded-file store (see _SharedRuntime). These patches rely on
+streamlit.testing internals and are only installed by the load test.
+
+Reports rerun latency percentiles per step, throughput, processing time,
+the app's own per-section timings and memory growth (process RSS growth and
+the data each session retains). AppTest reruns the whole script for every
+interaction, while a browser reruns only the fragment holding the widget.
+Interaction latency, which is checked against LATENCY_BUDGET_MS, is
+therefore the app's own timing of that fragment during the rerun; the full
+rerun times are reported alongside as an upper bound.
+
+    python -m src.utils.load_test --sessions 8 --rows 50000
+"""
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from streamlit import config as streamlit_config
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.uploaded_file_manager import UploadedFileRec
+from streamlit.testing.v1 import AppTest
+import streamlit.testing.v1.app_test as app_test_module
+import streamlit.testing.v1.local_script_runner as local_script_runner
+from config import LATENCY_BUDGET_MS
+from src.utils.export_file import ExportFile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+APP_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'app.py')
+PERCENTILES = [50, 95, 99]
+# AppTest runs every script with this session id
+TEST_SESSION_ID = 'test session id'
+
+
+class _SharedRuntime:
+    """Lets several AppTest sessions run concurrently in one process
+
+    AppTest installs a fresh mock Runtime around each run and resets it
+    afterwards, which breaks other sessions running at the same time. This
+    installs one mock runtime for the whole load test, stops AppTest from
+    replacing it, compiles the script once for all sessions and hands each
+    run the uploaded-file store of the session it belongs to.
+    """
+    _current = threading.local()
+
+    class _Unused:
+        """Takes the place of Runtime inside AppTest so runs leave the shared one alone"""
+        _instance = None
+
+    @classmethod
+    @contextlib.contextmanager
+    def installed(cls):
+        runtime = mock.MagicMock(spec=Runtime)
+        runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+        runtime.cache_storage_manager = MemoryCacheStorageManager()
+        script_cache = ScriptCache()
+        previous = Runtime._instance
+        Runtime._instance = runtime
+        streamlit_config.set_option('global.appTest', True)
+        try:
+            with mock.patch.object(app_test_module, 'Runtime', cls._Unused), \
+                    mock.patch.object(app_test_module, 'patch_config_options', lambda *_: contextlib.nullcontext()), \
+                    mock.patch.object(local_script_runner, 'ScriptCache', lambda: script_cache), \
+                    mock.patch.object(local_script_runner, 'MemoryUploadedFileManager',
+                                      lambda *_: cls._current.file_manager):
+                yield
+        finally:
+            Runtime._instance = previous
+
+    @classmethod
+    def use_files(cls, file_manager):
+        """Uploaded-file store for the runs of the current thread"""
+        cls._current.file_manager = file_manager
+
+
+class UploadAppTest(AppTest):
+    """AppTest that can hand files to st.file_uploader widgets"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.file_manager = MemoryUploadedFileManager('/mock/upload')
+        self._uploads = {}
+
+    def upload(self, label, name, data, mime_type='text/csv'):
+        """Select a file in the uploader with this label for the next run"""
+        uploader = next(element for element in self.get('file_uploader') if element.proto.label == label)
+        record = UploadedFileRec(uuid.uuid4().hex, name, mime_type, data)
+        self.file_manager.add_file(TEST_SESSION_ID, record)
+
+        state = WidgetState(id=uploader.proto.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id, info.name, info.size = record.file_id, name, len(data)
+        self._uploads[uploader.proto.id] = state
+        return self
+
+    def _run(self, widget_state=None, timeout=None):
+        # The element tree has no value for uploaders, so their state is added to every run
+        if widget_state is not None:
+            present = {state.id for state in widget_state.widgets}
+            widget_state.widgets.extend(
+                state for widget_id, state in self._uploads.items() if widget_id not in present
+            )
+        _SharedRuntime.use_files(self.file_manager)
+        return super()._run(widget_state, timeout)
+
+
+def generate_dataset(rows, seed):
+    """Random student results in the upload format"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Roll No': np.char.add('S', np.arange(seed * rows, (seed + 1) * rows).astype(str)),
+        'Name': np.char.add('Student ', np.arange(rows).astype(str)),
+        'Gender': rng.choice(['Male', 'Female'], rows),
+        'Section': rng.choice(list('ABCDEF'), rows),
+        'Total': np.clip(rng.normal(60, 15, rows), 0, 100).round(1),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        if resource is None:
+            return float('nan')
+        # Peak rather than current RSS where /proc is unavailable
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def session_state_mb(session_state):
+    """Approximate size of the data a session keeps (frames, bytes and export files)"""
+    def size(value):
+        if isinstance(value, pd.DataFrame):
+            return value.memory_usage(deep=True).sum()
+        if isinstance(value, bytes):
+            return len(value)
+        if isinstance(value, ExportFile):
+            return os.path.getsize(value.path)
+        if isinstance(value, tuple):
+            return sum(size(item) for item in value)
+        return 0
+
+    results = session_state['results'].values() if 'results' in session_state else []
+    return sum(size(value) for result in results for value in result.values()) / 1024 ** 2
+
+
+class SessionDriver:
+    """One simulated user session"""
+
+    def __init__(self, session_id, data, timeout, export):
+        self.session_id = session_id
+        self.data = data
+        self.timeout = timeout
+        self.export = export
+        self.timings = []
+        self.fragment_timings = []
+        self.processing_seconds = None
+        self.state_mb = 0.0
+        self.section_timings = []
+        self.error = None
+
+    def timed(self, step, action, at=None, fragment=None):
+        """Time one rerun; for fragment steps also keep what the app timed for the fragment
+
+        In a browser such a step reruns only the fragment, so its own timing
+        is what LATENCY_BUDGET_MS applies to.
+        """
+        started = time.perf_counter()
+        action()
+        self.timings.append((step, (time.perf_counter() - started) * 1000))
+        if fragment is not None:
+            runs = [entry['ms'] for entry in at.session_state['latency'] if entry['Section'] == fragment]
+            self.fragment_timings.append((step, runs[-1]))
+
+    def run(self):
+        try:
+            self._scenario()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        return self
+
+    def _scenario(self):
+        at = UploadAppTest(APP_PATH, default_timeout=self.timeout)
+        self.timed('open page', at.run)
+
+        # Upload and wait for the background job, polling like the status fragment
+        at.upload('Upload student result file', f'session_{self.session_id}.csv', self.data)
+        started = time.perf_counter()
+        self.timed('upload', at.run)
+        while not ('results' in at.session_state and at.session_state['results']):
+            failed = [job for job in at.session_state['jobs'].values() if job.status in ('failed', 'cancelled')]
+            if failed:
+                raise RuntimeError(f"processing {failed[0].status}: {failed[0].error}")
+            if time.perf_counter() - started > self.timeout:
+                raise TimeoutError("processing did not finish")
+            time.sleep(0.2)
+            self.timed('poll', at.run)
+        self.processing_seconds = time.perf_counter() - started
+        self._check(at)
+
+        # Filter, search, sort and page through the preview. Widgets are looked
+        # up again before every step because each run replaces the element tree.
+        preview = dict(at=at, fragment='Data preview')
+        self.timed('score filter', self._widget(at, 'slider', '📊 Score Range').set_value((30, 90)).run, **preview)
+        gender_filter = self._widget(at, 'multiselect', '👥')
+        self.timed('gender filter', gender_filter.set_value(gender_filter.value[:1]).run, **preview)
+        self.timed('search', self._widget(at, 'text_input', '🔎').set_value('Student 12').run, **preview)
+        self.timed('clear search', self._widget(at, 'text_input', '🔎').set_value('').run, **preview)
+        self.timed('sort', self._widget(at, 'selectbox', '↕️').set_value('Total').run, **preview)
+        page = self._widget(at, 'number_input', 'Page')
+        self.timed('next page', page.set_value(min(2, page.max)).run, **preview)
+        group_by = at.selectbox(key='group_analysis_dimension')
+        self.timed('group by', group_by.set_value(group_by.options[-1]).run, at=at, fragment='Group analysis')
+        self._check(at)
+
+        if self.export:
+            split_column = at.selectbox(key='split_export_column')
+            if 'Section' in split_column.options:
+                self.timed('split by', split_column.set_value('Section').run)
+            self.timed('split export', self._widget(at, 'button', 'Export ').click().run)
+            self._check(at)
+            if 'split_export' not in at.session_state['results'][at.session_state['current_result']]:
+                raise RuntimeError("split export produced no file")
+
+        self.state_mb = session_state_mb(at.session_state)
+        self.section_timings = list(at.session_state['latency']) if 'latency' in at.session_state else []
+
+    @staticmethod
+    def _widget(at, kind, label_prefix):
+        """First widget of a kind whose label starts with label_prefix"""
+        return next(widget for widget in getattr(at, kind) if widget.label.startswith(label_prefix))
+
+    @staticmethod
+    def _check(at):
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+
+def summarize(drivers, wall_seconds, budget_ms):
+    """Report dict of latency percentiles, throughput and memory"""
+    timings = pd.DataFrame(
+        [(step, ms) for driver in drivers for step, ms in driver.timings], columns=['step', 'ms']
+    )
+    # Interactions are the fragment steps; the budget applies to the fragment's own time
+    interactions = pd.DataFrame(
+        [(step, ms) for driver in drivers for step, ms in driver.fragment_timings], columns=['step', 'ms']
+    )
+    full_reruns = timings[timings['step'].isin(interactions['step'])]
+
+    def percentiles(values):
+        if not len(values):
+            return {f'p{p}': None for p in PERCENTILES}
+        return {f'p{p}': round(float(np.percentile(values, p)), 1) for p in PERCENTILES}
+
+    sections = pd.DataFrame(
+        [row for driver in drivers for row in driver.section_timings], columns=['Section', 'ms']
+    )
+    processing = [d.processing_seconds for d in drivers if d.processing_seconds is not None]
+    return {
+        'sessions': len(drivers),
+        'failed_sessions': [f"{d.session_id}: {d.error}" for d in drivers if d.error],
+        'wall_seconds': round(wall_seconds, 2),
+        'reruns': len(timings),
+        'reruns_per_second': round(len(timings) / wall_seconds, 2) if wall_seconds else None,
+        'interaction_ms': percentiles(interactions['ms']),
+        'interaction_full_rerun_ms': percentiles(full_reruns['ms']),
+        'interaction_over_budget': int((interactions['ms'] > budget_ms).sum()),
+        'budget_ms': budget_ms,
+        'steps_ms': {step: percentiles(group['ms']) for step, group in timings.groupby('step', sort=False)},
+        'sections_ms': {name: percentiles(group['ms']) for name, group in sections.groupby('Section', sort=False)},
+        'processing_seconds': percentiles(processing),
+        'state_mb_per_session': round(float(np.mean([d.state_mb for d in drivers])), 1) if drivers else 0.0,
+    }
+
+
+def run_load_test(sessions, rows, timeout=300, export=True, snapshots=False, ramp_seconds=0.0,
+                  budget_ms=LATENCY_BUDGET_MS):
+    """Run concurrent sessions against one app instance and return the summary report"""
+    import src.utils.pipeline as pipeline
+    drivers = [
+        SessionDriver(session_id, generate_dataset(rows, session_id), timeout, export)
+        for session_id in range(sessions)
+    ]
+
+    rss_before = current_rss_mb()
+    # Otherwise repeated runs reopen earlier snapshots instead of processing
+    with _SharedRuntime.installed(), mock.patch.object(pipeline, 'SNAPSHOT_ENABLED', snapshots):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            futures = []
+            for driver in drivers:
+                futures.append(pool.submit(driver.run))
+                if ramp_seconds:
+                    time.sleep(ramp_seconds / sessions)
+            drivers = [future.result() for future in futures]
+        wall_seconds = time.perf_counter() - started
+
+    report = summarize(drivers, wall_seconds, budget_ms)
+    report['rows_per_session'] = rows
+    # Sessions share one process, so memory growth is only known for all of them together
+    rss_growth = current_rss_mb() - rss_before
+    report['rss_growth_mb_per_session'] = round(rss_growth / sessions, 1) if sessions else 0.0
+    return report
+
+
+def print_report(report):
+    print(f"Sessions: {report['sessions']} x {report['rows_per_session']:,} rows, "
+          f"{report['reruns']} reruns in {report['wall_seconds']}s "
+          f"({report['reruns_per_second']} reruns/s)")
+    for failure in report['failed_sessions']:
+        print(f"  FAILED session {failure}")
+    print(f"Interaction latency ms: {report['interaction_ms']} "
+          f"({report['interaction_over_budget']} over the {report['budget_ms']} ms budget)")
+    print(f"Same interactions as full-script reruns ms: {report['interaction_full_rerun_ms']}")
+    print(f"Processing seconds: {report['processing_seconds']}")
+    print("Per step ms:")
+    for step, values in report['steps_ms'].items():
+        print(f"  {step:<14} {values}")
+    print("Per app section ms:")
+    for section, values in report['sections_ms'].items():
+        print(f"  {section:<16} {values}")
+    print(f"Memory growth per session MB: {report['rss_growth_mb_per_session']}, "
+          f"{report['state_mb_per_session']} MB/session of retained data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the GradeFlow Streamlit app")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent simulated sessions")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in each generated upload")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per rerun and for processing")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which sessions are started")
+    parser.add_argument("--no-export", action="store_true", help="Skip the export step")
+    parser.add_argument("--snapshots", action="store_true", help="Allow reopening processed snapshots")
+    parser.add_argument("--budget-ms", type=float, default=LATENCY_BUDGET_MS)
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with status 1 on failed sessions or a p95 interaction over budget")
+    args = parser.parse_args()
+
+    report = run_load_test(
+        args.sessions, args.rows, timeout=args.timeout, export=not args.no_export,
+        snapshots=args.snapshots, ramp_seconds=args.ramp, budget_ms=args.budget_ms
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    p95 = report['interaction_ms']['p95']
+    if args.strict and (report['failed_sessions'] or p95 is None or p95 > args.budget_ms):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Multi-core chunked execution engine for GradeFlow application.
+
+Large frames have their Total column copied once into shared memory, in
+its own dtype; worker processes attach to the segments by name, convert
+and grade a row range and write the results into shared output arrays.
+Gender is factorized by the workers on their row slices, and the parent
+only maps the per-chunk codes onto one set of categories afterwards. The
+frame and the per-chunk results are never pickled, only Gender slices.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from config import (
+    PARALLEL_MIN_ROWS, PARALLEL_CHUNK_ROWS, PARALLEL_MAX_WORKERS, PARALLEL_START_METHOD
+)
+from src.core.validators import DataValidator
+from src.core.grade_calculator import GradeCalculator
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_count():
+    """Number of worker processes used by the shared pool"""
+    return PARALLEL_MAX_WORKERS or os.cpu_count() or 1
+
+
+def get_process_pool():
+    """Return the process pool shared by all sessions, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context(PARALLEL_START_METHOD)
+            _pool = ProcessPoolExecutor(max_workers=get_worker_count(), mp_context=context)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+class LocalArrays:
+    """In-process counterpart of SharedArrays used for small inputs"""
+
+    def __init__(self):
+        self.arrays = {}
+
+    def add(self, key, length, dtype, source=None):
+        array = np.empty(length, dtype=dtype)
+        if source is not None:
+            array[:] = source
+        self.arrays[key] = array
+        return array
+
+    def copy(self, key):
+        return self.arrays[key]
+
+    def release(self):
+        self.arrays = {}
+
+
+class SharedArrays:
+    """Set of named numpy arrays backed by shared memory segments"""
+
+    def __init__(self):
+        self._segments = {}
+        self.arrays = {}
+
+    def add(self, key, length, dtype, source=None):
+        """Allocate a shared array, optionally filled from source"""
+        dtype = np.dtype(dtype)
+        segment = shared_memory.SharedMemory(create=True, size=max(length * dtype.itemsize, 1))
+        array = np.ndarray((length,), dtype=dtype, buffer=segment.buf)
+        if source is not None:
+            array[:] = source
+        self._segments[key] = segment
+        self.arrays[key] = array
+        return array
+
+    def spec(self):
+        """Picklable description workers use to attach to the segments"""
+        return {
+            key: (self._segments[key].name, array.dtype.str, len(array))
+            for key, array in self.arrays.items()
+        }
+
+    def copy(self, key):
+        """Copy an array out of shared memory so it outlives the segment"""
+        return self.arrays[key].copy()
+
+    def release(self):
+        """Close and unlink every segment"""
+        self.arrays.clear()
+        for segment in self._segments.values():
+            segment.close()
+            segment.unlink()
+        self._segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _process_rows(arrays, start, stop, genders=None):
+    """Validate and grade rows [start, stop) of the given arrays in place
+
+    genders is the Gender column for the same rows. It is factorized here;
+    the codes written to arrays['gender_codes'] index the returned uniques
+    and are mapped onto categories shared by all chunks afterwards.
+    """
+    if 'totals' in arrays:
+        totals = arrays['totals'][start:stop].astype(np.float64, copy=False)
+        arrays['invalid_totals'][start:stop] = DataValidator.invalid_total_mask(totals)
+        arrays['grade_codes'][start:stop] = GradeCalculator.grade_codes(totals)
+    if genders is None:
+        return None
+    codes, uniques = pd.factorize(genders)
+    # Factorize marks missing values as -1, which indexes the trailing entry
+    gender_lookup = np.append(DataValidator.invalid_gender_mask(uniques), True)
+    arrays['invalid_genders'][start:stop] = gender_lookup[codes]
+    arrays['gender_codes'][start:stop] = codes
+    return list(uniques)
+
+
+def _process_chunk(spec, start, stop, genders=None):
+    """Worker entry point: attach to shared segments and process one chunk"""
+    segments = {key: shared_memory.SharedMemory(name=name) for key, (name, _, _) in spec.items()}
+    try:
+        arrays = {
+            key: np.ndarray((length,), dtype=np.dtype(dtype), buffer=segments[key].buf)
+            for key, (_, dtype, length) in spec.items()
+        }
+        uniques = _process_rows(arrays, start, stop, genders)
+        # Drop the views before closing, otherwise the buffers stay exported
+        del arrays
+    finally:
+        for segment in segments.values():
+            segment.close()
+    return uniques
+
+
+class ParallelEngine:
+    def __init__(self, min_rows=PARALLEL_MIN_ROWS, chunk_rows=PARALLEL_CHUNK_ROWS):
+        self.min_rows = min_rows
+        self.chunk_rows = chunk_rows
+
+    def run(self, df, progress=None):
+        """Run row-level validation and grading over the Total/Gender columns
+
+        Returns a dict with 'invalid_totals', 'invalid_genders' (boolean
+        masks) and 'grades' for whichever of those columns are present,
+        plus 'gender_codes' and 'gender_categories' matching
+        pd.factorize(df['Gender']). progress, if given, is called with the
+        number of rows finished so far after every chunk; an exception it
+        raises aborts the run.
+        """
+        n_rows = len(df)
+        in_process = n_rows < self.min_rows or get_worker_count() == 1
+        shared = LocalArrays() if in_process else SharedArrays()
+        genders = df['Gender'] if 'Gender' in df.columns else None
+        try:
+            if 'Total' in df.columns:
+                # Workers convert their slice to float64; only other dtypes are converted here
+                totals = df['Total'].to_numpy()
+                if totals.dtype.kind not in 'iufb':
+                    totals = df['Total'].to_numpy(dtype=np.float64)
+                shared.add('totals', n_rows, totals.dtype, totals)
+                shared.add('invalid_totals', n_rows, np.bool_)
+                shared.add('grade_codes', n_rows, np.int8)
+            if genders is not None:
+                shared.add('gender_codes', n_rows, np.int32)
+                shared.add('invalid_genders', n_rows, np.bool_)
+
+            if in_process:
+                chunk_uniques = self._run_local(shared.arrays, genders, n_rows, progress)
+            else:
+                chunk_uniques = self._run_chunks(shared.spec(), genders, n_rows, progress)
+
+            results = self._collect(shared)
+            if genders is not None:
+                results['gender_categories'] = self._merge_codes(results['gender_codes'], chunk_uniques)
+            return results
+        finally:
+            shared.release()
+
+    def _chunks(self, n_rows):
+        return [(start, min(start + self.chunk_rows, n_rows)) for start in range(0, n_rows, self.chunk_rows)]
+
+    def _run_local(self, arrays, genders, n_rows, progress):
+        """Process the row ranges one after another in this process"""
+        chunk_uniques = {}
+        for start, stop in self._chunks(n_rows):
+            rows = None if genders is None else genders.iloc[start:stop]
+            chunk_uniques[start, stop] = _process_rows(arrays, start, stop, rows)
+            if progress:
+                progress(stop)
+        return chunk_uniques
+
+    def _run_chunks(self, spec, genders, n_rows, progress):
+        """Fan the row ranges out over the shared process pool
+
+        Only the Gender slice of each chunk is pickled; repeated values are
+        memoized by pickle, so a low-cardinality slice stays small, and the
+        pool pickles it on its own thread while earlier chunks run.
+        """
+        pool = get_process_pool()
+        futures = {
+            pool.submit(
+                _process_chunk, spec, start, stop, None if genders is None else genders.iloc[start:stop]
+            ): (start, stop)
+            for start, stop in self._chunks(n_rows)
+        }
+        chunk_uniques = {}
+        rows_done = 0
+        try:
+            for future in as_completed(futures):
+                start, stop = futures[future]
+                chunk_uniques[start, stop] = future.result()
+                rows_done += stop - start
+                if progress:
+                    progress(rows_done)
+        finally:
+            # Workers must be off the segments before they are unlinked
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+        return chunk_uniques
+
+    @staticmethod
+    def _merge_codes(codes, chunk_uniques):
+        """Map per-chunk codes in place onto categories in first-seen order"""
+        categories = {}
+        for (start, stop), uniques in sorted(chunk_uniques.items()):
+            # The trailing -1 keeps missing values at -1
+            remap = np.array([categories.setdefault(value, len(categories)) for value in uniques] + [-1], dtype=np.int32)
+            codes[start:stop] = remap[codes[start:stop]]
+        return list(categories)
+
+    @staticmethod
+    def _collect(shared):
+        """Copy results out of shared memory and decode grade labels"""
+        results = {}
+        if 'invalid_totals' in shared.arrays:
+            results['invalid_totals'] = shared.copy('invalid_totals')
+            labels = np.array(GradeCalculator.grade_labels(), dtype=object)
+            results['grades'] = labels[shared.arrays['grade_codes']]
+        if 'invalid_genders' in shared.arrays:
+            results['invalid_genders'] = shared.copy('invalid_genders')
+            results['gender_codes'] = shared.copy('gender_codes')
+        return results
@@ -0,0 +1,132 @@
+"""
+End-to-end processing pipeline for GradeFlow application.
+
+Runs parse, validation, grading, statistics and report generation for one
+uploaded file without touching Streamlit, so it can execute inside a
+background Job and report progress as it goes.
+"""
+import io
+from config import SNAPSHOT_ENABLED, IDENTITY_CHECK_ENABLED
+from src.core.dataset_merger import DatasetMerger
+from src.core.validators import DataValidator
+from src.core.grade_calculator import GradeCalculator
+from src.core.score_histogram import ScoreHistogram
+from src.utils.data_processor import DataProcessor
+from src.utils.parallel_engine import ParallelEngine
+from src.utils.snapshot_store import SnapshotStore
+
+PIPELINE_STAGES = ['parsing', 'validating', 'grading', 'statistics', 'report']
+
+
+class _NullJob:
+    """Stand-in used when the pipeline runs outside a background job"""
+
+    def update(self, stage=None, rows_processed=None, total_rows=None):
+        pass
+
+    def check_cancelled(self):
+        pass
+
+
+class ProcessingPipeline:
+    @staticmethod
+    def make_file(data, name):
+        """Wrap raw upload bytes in a named file object DataProcessor can read"""
+        file_obj = io.BytesIO(data)
+        file_obj.name = name
+        return file_obj
+
+    @staticmethod
+    def run(job, file_obj, read_options=None, create_report=True):
+        """Process one file and return a result dict for the UI
+
+        read_options are passed on to DataProcessor.read_uploaded_file
+        (sheet, header row and column selection for Excel files). With
+        create_report=False the Excel report is skipped and 'report' is
+        None. The result holds 'name', 'df', 'issues' and, when validation
+        has no critical errors, 'stats' and 'report'. A file processed
+        before with the same options is reopened from its snapshot instead;
+        its 'report' is None and 'snapshot' is True, and the numeric columns
+        of its 'df' are read-only, so copy the frame before changing it in
+        place (DatasetMerger works on its own copy).
+        """
+        job = job or _NullJob()
+        processor = DataProcessor()
+
+        job.update(stage='parsing')
+        store = SnapshotStore() if SNAPSHOT_ENABLED else None
+        if store:
+            snapshot_key = store.key(file_obj.getbuffer(), read_options)
+            snapshot = store.load(snapshot_key)
+            if snapshot is not None:
+                snapshot['name'] = file_obj.name
+                snapshot['report'] = None
+                snapshot['snapshot'] = True
+                return snapshot
+
+        df = processor.read_uploaded_file(
+            file_obj,
+            progress=lambda rows, total: job.update(rows_processed=rows, total_rows=total),
+            **(read_options or {})
+        )
+        n_rows = len(df)
+
+        # Row-level checks and grading run chunked across worker processes
+        job.update(stage='validating', rows_processed=0, total_rows=n_rows)
+        column_checks = ParallelEngine().run(
+            df, progress=lambda rows: job.update(rows_processed=rows)
+        )
+        issues = DataValidator().validate_data(df, column_checks)
+        result = {'name': file_obj.name, 'df': df, 'issues': issues}
+
+        # Only proceed with analysis if no critical errors
+        if issues['severity'] == 'error':
+            if store:
+                store.save(snapshot_key, result)
+            return result
+
+        job.update(stage='grading', rows_processed=0)
+        if 'Total' in df.columns:
+            df['Grade'] = column_checks['grades']
+        job.update(rows_processed=n_rows)
+
+        job.update(stage='statistics', rows_processed=0)
+        result['stats'] = GradeCalculator().calculate_statistics(df)
+        if 'Total' in df.columns:
+            result['histogram'] = ScoreHistogram.from_frame(df)
+        job.update(rows_processed=n_rows)
+
+        job.update(stage='report', rows_processed=0)
+        result['report'] = None
+        if 'Total' in df.columns and create_report:
+            result['report'] = processor.create_excel_report(df, result['stats'])
+        if store:
+            store.save(snapshot_key, result)
+        job.update(rows_processed=n_rows)
+
+        return result
+
+    @staticmethod
+    def apply_corrections(result, delta):
+        """Upsert a correction frame into a processed result and refresh it
+
+        When rows were inserted or updated, 'df', 'stats', 'histogram' and
+        'issues' are replaced: the corrected dataset is validated again, so
+        invalid rows, row numbers and outlier fences refer to the new frame.
+        Identity matching is repeated only if it had been run. Returns the
+        upsert summary, also kept as result['last_upsert'].
+        """
+        if 'merger' not in result:
+            result['merger'] = DatasetMerger(result['df'])
+        merger = result['merger']
+        summary = merger.upsert(delta)
+        result['last_upsert'] = summary
+
+        if summary['inserted'] or summary['updated']:
+            result['df'] = merger.df
+            result['stats'] = merger.statistics()
+            result['histogram'] = merger.histogram
+            result['issues'] = DataValidator.validate_data(
+                merger.df, check_identity=result.get('identity_checked', IDENTITY_CHECK_ENABLED)
+            )
+        return summary
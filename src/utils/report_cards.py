@@ -0,0 +1,207 @@
+"""
+Bulk per-student PDF report cards for GradeFlow application.
+
+Class-level values (average, percentiles, grade scale) are computed once in
+the parent process. Students are sent to the shared process pool in
+batches; each worker computes the card layout once per batch. The static
+parts (labels, box, grade scale table) go into a form XObject that the
+card places with a Do operator, using only reportlab's public
+beginForm/endForm/doForm API. Finished batches are written into a zip on disk
+as they arrive, so only a few batches are held in memory at a time.
+"""
+import io
+import re
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from config import (
+    APP_TITLE, GRADE_SCALE, PASSING_SCORE, REPORT_CARD_BATCH_SIZE, REPORT_CARD_MIN_PARALLEL
+)
+from src.utils.parallel_engine import get_process_pool, get_worker_count
+
+STATIC_FORM = 'CardStatic'
+FIELD_LABELS = ['Name', 'Roll No', 'Gender', 'Total Score', 'Grade', 'Result', 'Class Percentile', 'Class Average']
+
+
+class CardLayout:
+    """Static parts of a report card, computed once and drawn on every card"""
+
+    def __init__(self, context):
+        width, height = A4
+        self.page_size = (width, height)
+        self.margin = 56
+        self.title = (self.margin, height - 72, context['title'])
+        self.subtitle = (self.margin, height - 96, 'Student Report Card')
+        self.footer = (self.margin, 40, f"Generated {context['generated']} - class of {context['class_size']} students")
+        average = context['class_average']
+        self.class_average = 'N/A' if pd.isna(average) else f'{average:.1f}'
+
+        # Field labels and the x/y position of each value
+        top = height - 150
+        self.labels = [(self.margin, top - i * 24, f'{label}:') for i, label in enumerate(FIELD_LABELS)]
+        self.value_x = self.margin + 130
+        self.value_y = {label: top - i * 24 for i, label in enumerate(FIELD_LABELS)}
+        self.box = (self.margin - 12, top - len(FIELD_LABELS) * 24 + 6, width - 2 * self.margin + 24, len(FIELD_LABELS) * 24 + 18)
+
+        table_top = self.box[1] - 48
+        self.scale_heading = (self.margin, table_top, f"Grade Scale (passing score {context['passing_score']})")
+        self.scale_rows = [
+            (self.margin + 12, table_top - 20 - i * 16, grade, f'{low} - {high}')
+            for i, (grade, (low, high)) in enumerate(context['grade_scale'].items())
+        ]
+
+    def draw_static(self, pdf):
+        pdf.setFont('Helvetica-Bold', 18)
+        pdf.drawString(*self.title)
+        pdf.setFont('Helvetica', 13)
+        pdf.setFillColor(colors.grey)
+        pdf.drawString(*self.subtitle)
+        pdf.setFillColor(colors.black)
+
+        pdf.setStrokeColor(colors.lightgrey)
+        pdf.rect(*self.box)
+        pdf.setFont('Helvetica-Bold', 11)
+        for x, y, text in self.labels:
+            pdf.drawString(x, y, text)
+
+        pdf.drawString(*self.scale_heading)
+        pdf.setFont('Helvetica', 10)
+        for x, y, grade, band in self.scale_rows:
+            pdf.drawString(x, y, grade)
+            pdf.drawString(x + 60, y, band)
+
+        pdf.setFont('Helvetica', 8)
+        pdf.setFillColor(colors.grey)
+        pdf.drawString(*self.footer)
+        pdf.setFillColor(colors.black)
+
+    def render(self, values):
+        """PDF bytes of one card with the given field values"""
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=self.page_size, invariant=1)
+        # Forms belong to one document, so each card defines its own
+        pdf.beginForm(STATIC_FORM)
+        self.draw_static(pdf)
+        pdf.endForm()
+        pdf.doForm(STATIC_FORM)
+        pdf.setFont('Helvetica', 11)
+        for label, value in values.items():
+            pdf.drawString(self.value_x, self.value_y[label], value)
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+
+def _render_batch(context, records):
+    """Worker entry point: render (filename, pdf bytes) for each record"""
+    layout = CardLayout(context)
+    cards = []
+    for filename, roll_no, name, gender, total, grade, percentile in records:
+        has_score = not np.isnan(total)
+        cards.append((filename, layout.render({
+            'Name': str(name),
+            'Roll No': str(roll_no),
+            'Gender': str(gender),
+            'Total Score': f'{total:g}' if has_score else 'N/A',
+            'Grade': str(grade),
+            'Result': ('Pass' if total >= context['passing_score'] else 'Fail') if has_score else 'N/A',
+            'Class Percentile': f'{percentile:.0f}' if has_score else 'N/A',
+            'Class Average': layout.class_average,
+        })))
+    return cards
+
+
+class ReportCardGenerator:
+    def __init__(self, batch_size=REPORT_CARD_BATCH_SIZE, min_parallel=REPORT_CARD_MIN_PARALLEL):
+        self.batch_size = batch_size
+        self.min_parallel = min_parallel
+
+    def write_zip(self, df, stats, file_obj, progress=None):
+        """Write one PDF card per student into a zip archive on file_obj
+
+        progress, if given, is called with the number of cards written so
+        far. Returns a dict with 'cards', 'seconds' and 'cards_per_minute'.
+        """
+        started = time.perf_counter()
+        context = {
+            'title': APP_TITLE,
+            'generated': datetime.now().strftime('%Y-%m-%d'),
+            'class_size': len(df),
+            'class_average': stats['mean_score'],
+            'passing_score': PASSING_SCORE,
+            'grade_scale': dict(GRADE_SCALE),
+        }
+        records = self._records(df)
+        batches = [records[start:start + self.batch_size] for start in range(0, len(records), self.batch_size)]
+
+        written = 0
+        # PDF pages are already compressed, so the archive only stores them
+        with zipfile.ZipFile(file_obj, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for cards in self._render(context, batches):
+                for filename, data in cards:
+                    archive.writestr(filename, data)
+                written += len(cards)
+                if progress:
+                    progress(written)
+
+        seconds = time.perf_counter() - started
+        return {
+            'cards': written,
+            'seconds': seconds,
+            'cards_per_minute': written / seconds * 60 if seconds else 0.0,
+        }
+
+    def _render(self, context, batches):
+        """Yield rendered batches, in-process for small classes"""
+        if sum(len(batch) for batch in batches) < self.min_parallel or get_worker_count() == 1:
+            for batch in batches:
+                yield _render_batch(context, batch)
+            return
+
+        pool = get_process_pool()
+        # Keep a couple of batches per worker in flight to bound memory
+        window = get_worker_count() * 2
+        pending = set()
+        remaining = iter(batches)
+        try:
+            while True:
+                for batch in remaining:
+                    pending.add(pool.submit(_render_batch, context, batch))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _records(df):
+        """Picklable per-student tuples with a unique zip entry name each"""
+        n_rows = len(df)
+        totals = df['Total'].to_numpy(dtype=np.float64)
+        # Share of the class scoring at or below each student
+        percentiles = pd.Series(totals).rank(method='max', pct=True).mul(100).to_numpy()
+
+        def column(name):
+            return df[name].fillna('').astype(str).to_numpy() if name in df.columns else np.full(n_rows, '')
+
+        roll_numbers = column('Roll No')
+        stems = pd.Series(roll_numbers).map(lambda value: re.sub(r'[^\w.-]+', '_', value) or 'student')
+        repeat = stems.groupby(stems).cumcount()
+        filenames = (stems + np.where(repeat > 0, '_' + repeat.astype(str), '') + '.pdf').to_numpy()
+
+        return list(zip(
+            filenames, roll_numbers, column('Name'), column('Gender'),
+            totals, column('Grade'), percentiles
+        ))
@@ -0,0 +1,204 @@
+"""
+On-disk snapshots of processed datasets for GradeFlow application.
+
+A processed result is stored under a hash of the uploaded bytes, the read
+options and the grading/validation settings:
+- <key>.arrow: the graded frame as an uncompressed Arrow IPC file
+- <key>.json: name, issues, statistics and the score histogram's bins
+- <key>.npy: the score histogram's counts (loaded with allow_pickle=False)
+
+Nothing in a snapshot is unpickled, so a writable cache directory does not
+let anyone run code in the processes that read it. Reopening memory-maps
+the Arrow file, so numeric columns are read-only views onto the page cache
+that every server process opening the same snapshot shares; copy the frame
+before changing it in place. Snapshots are evicted least recently used
+first once the directory grows past SNAPSHOT_DISK_BUDGET_MB.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+from config import (
+    SNAPSHOT_DIR, SNAPSHOT_DISK_BUDGET_MB, GRADE_SCALE, PASSING_SCORE, MIN_SCORE, MAX_SCORE,
+    VALID_GENDERS, REQUIRED_COLUMNS, HISTOGRAM_RESOLUTION, OUTLIER_GROUP_COLUMNS,
+    OUTLIER_IQR_FACTOR, OUTLIER_MAD_THRESHOLD, OUTLIER_MIN_GROUP_SIZE,
+    IDENTITY_CHECK_ENABLED, IDENTITY_WINDOW, IDENTITY_ROLL_PREFIX_DROP
+)
+from src.core.score_histogram import ScoreHistogram
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes so older snapshots are ignored
+SNAPSHOT_VERSION = 3
+HASH_BLOCK_SIZE = 1 << 20
+# '.meta' pickles written by older versions are never read, only evicted
+SNAPSHOT_EXTENSIONS = ('.arrow', '.json', '.npy', '.meta')
+
+
+def _settings_fingerprint():
+    """Settings that change graded columns, issues or statistics"""
+    return repr((
+        SNAPSHOT_VERSION, GRADE_SCALE, PASSING_SCORE, MIN_SCORE, MAX_SCORE, VALID_GENDERS,
+        REQUIRED_COLUMNS, HISTOGRAM_RESOLUTION, OUTLIER_GROUP_COLUMNS, OUTLIER_IQR_FACTOR,
+        OUTLIER_MAD_THRESHOLD, OUTLIER_MIN_GROUP_SIZE, IDENTITY_CHECK_ENABLED, IDENTITY_WINDOW,
+        IDENTITY_ROLL_PREFIX_DROP
+    )).encode()
+
+
+def _json_default(value):
+    """JSON form of numpy values in issues and statistics"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot store {type(value).__name__} in a snapshot")
+
+
+class SnapshotStore:
+    def __init__(self, directory=SNAPSHOT_DIR, budget_mb=SNAPSHOT_DISK_BUDGET_MB):
+        self.directory = directory
+        self.budget_bytes = budget_mb * 1024 * 1024
+
+    @staticmethod
+    def key(data, read_options=None):
+        """Content hash of the upload bytes, read options and settings"""
+        digest = hashlib.blake2b(digest_size=20)
+        view = memoryview(data)
+        for start in range(0, len(view), HASH_BLOCK_SIZE):
+            digest.update(view[start:start + HASH_BLOCK_SIZE])
+        digest.update(repr(read_options).encode())
+        digest.update(_settings_fingerprint())
+        return digest.hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.arrow', base + '.json', base + '.npy'
+
+    def load(self, key):
+        """Reopen a snapshot as a result dict, or None if there is none
+
+        Numeric columns of the returned 'df' are read-only views onto the
+        memory map; in-place assignment needs a copy of the frame first.
+        """
+        table_path, meta_path, histogram_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as meta_file:
+                result = json.load(meta_file)
+            if 'histogram' in result:
+                result['histogram'] = self._load_histogram(result['histogram'], histogram_path)
+            table = pa.ipc.open_file(pa.memory_map(table_path, 'r')).read_all()
+        except (OSError, ValueError, KeyError, TypeError, pa.ArrowException) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Discarding unreadable snapshot %s: %s", key, e)
+                self._remove(key)
+            return None
+
+        # split_blocks keeps numeric columns as zero-copy views onto the mapping
+        result['df'] = table.to_pandas(split_blocks=True)
+        self._touch(key)
+        return result
+
+    def save(self, key, result):
+        """Write a result dict as a snapshot; returns False if it cannot be stored"""
+        meta = {name: value for name, value in result.items() if name not in ('df', 'report', 'histogram')}
+        histogram = result.get('histogram')
+        if histogram is not None:
+            meta['histogram'] = {
+                'min_score': histogram.min_score, 'max_score': histogram.max_score,
+                'resolution': histogram.resolution, 'groups': list(histogram.groups),
+            }
+        try:
+            table = pa.Table.from_pandas(result['df'], preserve_index=False)
+            meta_text = json.dumps(meta, default=_json_default)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            # e.g. a column mixing numbers and text
+            logger.warning("Snapshot skipped for %s: %s", result.get('name'), e)
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        table_path, meta_path, histogram_path = self._paths(key)
+        # Write to temporary files and rename, so readers never see partial
+        # snapshots; the metadata goes last because load() starts from it
+        self._write_atomic(table_path, lambda file: self._write_table(file, table))
+        if histogram is not None:
+            self._write_atomic(histogram_path, lambda file: np.save(file, np.column_stack([
+                histogram.counts, histogram.below, histogram.above, histogram.missing
+            ]), allow_pickle=False))
+        self._write_atomic(meta_path, lambda file: file.write(meta_text.encode('utf-8')))
+        self.evict()
+        return True
+
+    @staticmethod
+    def _load_histogram(layout, path):
+        """Rebuild a ScoreHistogram from its stored bins and counts"""
+        histogram = ScoreHistogram(layout['min_score'], layout['max_score'], layout['resolution'])
+        counts = np.load(path, allow_pickle=False)
+        if counts.ndim != 2 or counts.shape != (len(layout['groups']), histogram.n_bins + 3):
+            raise ValueError("histogram counts do not match the stored bins")
+        histogram.groups = list(layout['groups'])
+        histogram.counts = np.ascontiguousarray(counts[:, :histogram.n_bins], dtype=np.int64)
+        histogram.below, histogram.above, histogram.missing = (
+            np.ascontiguousarray(counts[:, histogram.n_bins + i], dtype=np.int64) for i in range(3)
+        )
+        return histogram
+
+    @staticmethod
+    def _write_table(file, table):
+        with pa.ipc.new_file(file, table.schema) as writer:
+            writer.write_table(table)
+
+    def _write_atomic(self, path, write):
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                write(file)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _touch(self, key):
+        """Mark a snapshot as recently used"""
+        for path in self._paths(key):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def _remove(self, key):
+        base = os.path.join(self.directory, key)
+        for path in (base + extension for extension in SNAPSHOT_EXTENSIONS):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def snapshots(self):
+        """(last used, size in bytes, key) of every stored snapshot"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = {}
+        for entry in os.scandir(self.directory):
+            key, extension = os.path.splitext(entry.name)
+            if extension not in SNAPSHOT_EXTENSIONS:
+                continue
+            stat = entry.stat()
+            used, size = entries.get(key, (0.0, 0))
+            entries[key] = (max(used, stat.st_mtime), size + stat.st_size)
+        return [(used, size, key) for key, (used, size) in entries.items()]
+
+    def evict(self):
+        """Remove least recently used snapshots until within the disk budget"""
+        snapshots = sorted(self.snapshots())
+        total = sum(size for _, size, _ in snapshots)
+        for _, size, key in snapshots:
+            if total <= self.budget_bytes:
+                break
+            # Open memory maps stay valid after the files are unlinked
+            self._remove(key)
+            total -= size
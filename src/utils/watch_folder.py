@@ -0,0 +1,379 @@
+"""
+Watch-folder ingestion for GradeFlow application.
+
+Result files dropped into a folder (or its subfolders) are processed
+through the same ProcessingPipeline as uploads and combined into one
+result. A manifest records the content hash, size and modification time of
+every ingested file:
+- files whose size and modification time are unchanged are skipped unread;
+  after a restart they reopen from their snapshot by the recorded hash
+- touched files whose content hash is unchanged are not reprocessed
+- new or changed files are parsed, validated and graded; their rows are
+  added to RunningAggregates and the rows of the previous version removed
+
+The hash is SnapshotStore.key, so the manifest is discarded and every file
+reprocessed when grading settings change. The combined frame is updated in
+place of a full rebuild: rows of removed or changed files are dropped and
+only the rows of new versions appended. Validation runs per file:
+duplicates and identity conflicts across files are not reported.
+
+watchdog reports changes; a scan runs once the folder has been quiet for
+WATCH_DEBOUNCE_SECONDS, so files that are still being copied are not read
+half-written.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+from config import (
+    ALLOWED_FILE_TYPES, SNAPSHOT_ENABLED, WATCH_STATE_DIR, WATCH_DEBOUNCE_SECONDS, WATCH_USE_POLLING
+)
+from src.core.running_aggregates import RunningAggregates
+from src.utils.pipeline import ProcessingPipeline
+from src.utils.snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COLUMN = 'Source File'
+# Events that can change file contents; opening or reading a file is not one
+CHANGE_EVENTS = ('created', 'modified', 'deleted', 'moved', 'closed')
+
+
+def _is_result_file(relative_path):
+    """Supported result file that is not hidden or an editor lock file"""
+    parts = relative_path.split(os.sep)
+    if any(part.startswith(('.', '~$')) for part in parts):
+        return False
+    return os.path.splitext(relative_path)[1].lstrip('.').lower() in ALLOWED_FILE_TYPES
+
+
+class FolderIngestor:
+    def __init__(self, folder, state_dir=WATCH_STATE_DIR):
+        self.folder = os.path.abspath(folder)
+        folder_key = hashlib.blake2b(self.folder.encode(), digest_size=8).hexdigest()
+        self.state_dir = state_dir
+        self.manifest_path = os.path.join(state_dir, f'{folder_key}.json')
+        # The key of empty content changes whenever the grading settings do
+        self.settings = SnapshotStore.key(b'')
+        self.manifest = self._load_manifest()
+        self.aggregates = RunningAggregates()
+        self.version = 0
+        self.last_scan = None
+        self._files = {}
+        self._lock = threading.Lock()
+        # Combined rows of graded files in _sources order, without the source column
+        self._frame = None
+        self._sources = []
+        self._source_codes = np.empty(0, dtype=np.int64)
+        self._stale = set()
+        self._pending = []
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+            return manifest['files'] if manifest.get('settings') == self.settings else {}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.state_dir, suffix='.tmp')
+        with os.fdopen(handle, 'w') as manifest_file:
+            json.dump({'folder': self.folder, 'settings': self.settings, 'files': self.manifest}, manifest_file, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def _listing(self):
+        """Relative path -> os.stat_result of every result file in the folder"""
+        listing = {}
+        for root, directories, files in os.walk(self.folder):
+            directories[:] = [name for name in directories if not name.startswith('.')]
+            for name in files:
+                path = os.path.join(root, name)
+                relative_path = os.path.relpath(path, self.folder)
+                if _is_result_file(relative_path):
+                    try:
+                        listing[relative_path] = os.stat(path)
+                    except OSError:
+                        # Removed between listing and stat
+                        pass
+        return listing
+
+    def scan(self):
+        """Ingest new and changed files and drop removed ones
+
+        Returns a summary dict with 'added', 'modified', 'removed',
+        'restored' (reopened from snapshots after a restart) and 'unchanged'
+        file lists, 'failed' ((file, error) pairs, retried on the next scan)
+        and 'seconds'.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            summary = {'added': [], 'modified': [], 'removed': [], 'restored': [], 'unchanged': [], 'failed': []}
+            listing = self._listing()
+
+            for relative_path in sorted(set(self._files) | set(self.manifest)):
+                if relative_path not in listing:
+                    self._drop(relative_path)
+                    self.manifest.pop(relative_path, None)
+                    summary['removed'].append(relative_path)
+
+            for relative_path, stat in sorted(listing.items()):
+                status = self._ingest(relative_path, stat)
+                if isinstance(status, Exception):
+                    summary['failed'].append((relative_path, str(status)))
+                else:
+                    summary[status].append(relative_path)
+
+            if summary['added'] or summary['modified'] or summary['removed'] or summary['restored']:
+                self.version += 1
+                self._save_manifest()
+            summary['seconds'] = time.perf_counter() - started
+            self.last_scan = summary
+            return summary
+
+    def _ingest(self, relative_path, stat):
+        """Process one file if it changed; returns its status or the error"""
+        entry = self.manifest.get(relative_path)
+        loaded = relative_path in self._files
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            if loaded:
+                return 'unchanged'
+            # Ingested by an earlier run: reopen its snapshot without reading the file
+            result = SnapshotStore().load(entry['hash']) if SNAPSHOT_ENABLED else None
+            if result is not None:
+                result.update(name=relative_path, report=None, snapshot=True)
+                self._add(relative_path, result)
+                return 'restored'
+
+        try:
+            with open(os.path.join(self.folder, relative_path), 'rb') as result_file:
+                data = result_file.read()
+            content_hash = SnapshotStore.key(data)
+            if loaded and entry['hash'] == content_hash:
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                return 'unchanged'
+            result = ProcessingPipeline.run(
+                None, ProcessingPipeline.make_file(data, relative_path), create_report=False
+            )
+        except Exception as e:
+            logger.warning("Could not ingest %s: %s", relative_path, e)
+            return e
+
+        self._add(relative_path, result)
+        self.manifest[relative_path] = {
+            'hash': content_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'rows': len(result['df']),
+            'severity': result['issues']['severity'],
+            'ingested_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        return 'modified' if entry is not None else 'added'
+
+    def _add(self, relative_path, result):
+        """Replace a file's result; its rows join the frame on the next result()"""
+        self._drop(relative_path)
+        self._files[relative_path] = result
+        if self._is_graded(result):
+            self.aggregates.add(result['df'])
+            self._pending.append(relative_path)
+
+    def _drop(self, relative_path):
+        """Remove a file's rows from the aggregates and mark them for removal from the frame"""
+        result = self._files.pop(relative_path, None)
+        if result is not None and self._is_graded(result):
+            self.aggregates.remove(result['df'])
+            if relative_path in self._pending:
+                self._pending.remove(relative_path)
+            else:
+                self._stale.add(relative_path)
+
+    @staticmethod
+    def _is_graded(result):
+        return result['issues']['severity'] != 'error' and 'Total' in result['df'].columns
+
+    def rejected_files(self):
+        """(file, missing columns) of files that failed validation"""
+        with self._lock:
+            return [
+                (relative_path, result['issues']['missing_columns'])
+                for relative_path, result in self._files.items()
+                if not self._is_graded(result)
+            ]
+
+    def result(self):
+        """Combined result dict of all graded files, or None if there are none
+
+        Has the same keys as a ProcessingPipeline result plus 'version',
+        'files' and 'watch'; the frame gains a 'Source File' column.
+        """
+        with self._lock:
+            self._update_frame()
+            graded = [(path, self._files[path]) for path in self._sources]
+            if not graded:
+                return None
+
+            # Shallow copy, so adding the source column leaves the cached frame untouched
+            df = self._frame.copy(deep=False)
+            df[SOURCE_COLUMN] = pd.Categorical.from_codes(self._source_codes, categories=self._sources)
+            lengths = [len(result['df']) for _, result in graded]
+            offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+            stats = [result['stats'] for _, result in graded]
+            return {
+                'name': f"📂 {os.path.basename(self.folder) or self.folder} ({len(graded)} files)",
+                'df': df,
+                'issues': self._combined_issues(graded, offsets),
+                'stats': self.aggregates.statistics(
+                    len(df),
+                    np.nanmin([s['min_score'] for s in stats]),
+                    np.nanmax([s['max_score'] for s in stats]),
+                    df['Total'].median(),
+                ),
+                # Copied so later scans cannot change it under the UI
+                'histogram': copy.deepcopy(self.aggregates.histogram),
+                'report': None,
+                'version': self.version,
+                'files': len(graded),
+                'watch': True,
+            }
+
+    def _update_frame(self):
+        """Drop the rows of stale files from the combined frame and append pending ones"""
+        if self._stale:
+            stale_codes = [code for code, path in enumerate(self._sources) if path in self._stale]
+            keep = ~np.isin(self._source_codes, stale_codes)
+            remaining = np.flatnonzero(~np.isin(np.arange(len(self._sources)), stale_codes))
+            # Rows keep their order, so every file still occupies one contiguous block
+            new_codes = np.full(len(self._sources), -1, dtype=np.int64)
+            new_codes[remaining] = np.arange(len(remaining))
+            self._frame = self._frame[keep].reset_index(drop=True)
+            self._source_codes = new_codes[self._source_codes[keep]]
+            self._sources = [self._sources[code] for code in remaining]
+            self._stale.clear()
+
+        if self._pending:
+            frames = [self._files[path]['df'] for path in self._pending]
+            if self._frame is not None:
+                frames.insert(0, self._frame)
+            self._frame = pd.concat(frames, ignore_index=True)
+            self._source_codes = np.concatenate([self._source_codes] + [
+                np.full(len(self._files[path]['df']), len(self._sources) + position, dtype=np.int64)
+                for position, path in enumerate(self._pending)
+            ])
+            self._sources.extend(self._pending)
+            self._pending = []
+
+    @staticmethod
+    def _combined_issues(graded, offsets):
+        """Per-file validation issues with row numbers shifted into the combined frame"""
+        issues = {
+            'missing_columns': [],
+            'missing_values': {},
+            'duplicates': 0,
+            'invalid_genders': [],
+            'invalid_totals': [],
+            'identity_conflicts': [],
+            'outliers': {},
+            'severity': 'success'
+        }
+        outlier_counts = {}
+        for (path, result), offset in zip(graded, offsets):
+            file_issues = result['issues']
+            if file_issues['severity'] == 'warning':
+                issues['severity'] = 'warning'
+            for col, count in file_issues['missing_values'].items():
+                issues['missing_values'][col] = issues['missing_values'].get(col, 0) + count
+            issues['duplicates'] += file_issues['duplicates']
+            for key in ('invalid_genders', 'invalid_totals'):
+                issues[key].extend(int(row) + offset for row in file_issues[key])
+            issues['identity_conflicts'].extend(
+                {**conflict, SOURCE_COLUMN: path} for conflict in file_issues['identity_conflicts']
+            )
+
+            outliers = file_issues.get('outliers')
+            if outliers:
+                combined = issues['outliers'].setdefault('rows', [])
+                combined.extend(int(row) + offset for row in outliers['rows'])
+                for rule, count in outliers['counts'].items():
+                    outlier_counts[rule] = outlier_counts.get(rule, 0) + count
+                issues['outliers'].setdefault('thresholds', []).extend(
+                    {SOURCE_COLUMN: path, **threshold} for threshold in outliers['thresholds']
+                )
+        if outlier_counts:
+            issues['outliers']['counts'] = outlier_counts
+        return issues
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in CHANGE_EVENTS:
+            return
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        if any(path and _is_result_file(os.path.relpath(path, self.watcher.folder)) for path in paths):
+            self.watcher.schedule()
+
+
+class FolderWatcher:
+    """Runs FolderIngestor scans whenever the folder changes"""
+
+    def __init__(self, folder, debounce=WATCH_DEBOUNCE_SECONDS, polling=WATCH_USE_POLLING):
+        self.ingestor = FolderIngestor(folder)
+        self.folder = self.ingestor.folder
+        self.debounce = debounce
+        self.error = None
+        self._observer = PollingObserver() if polling else Observer()
+        self._observer.daemon = True
+        self._timer = None
+        self._timer_lock = threading.Lock()
+
+    def start(self):
+        """Start watching and run the initial scan in the background"""
+        self._observer.schedule(_ChangeHandler(self), self.folder, recursive=True)
+        self._observer.start()
+        self.schedule(delay=0)
+
+    def stop(self):
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self._observer.stop()
+
+    @property
+    def running(self):
+        return self._observer.is_alive()
+
+    @property
+    def scan_pending(self):
+        return self._timer is not None and self._timer.is_alive()
+
+    def schedule(self, delay=None):
+        """Scan after delay seconds (default: the debounce) without further changes"""
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce if delay is None else delay, self._scan)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _scan(self):
+        try:
+            self.ingestor.scan()
+            self.error = None
+        except Exception as e:
+            logger.exception("Scan of %s failed", self.folder)
+            self.error = e
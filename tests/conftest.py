@@ -0,0 +1,16 @@
+"""
+Shared fixtures.
+"""
+import pytest
+
+from src.utils import parallel_engine
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A private two-worker process pool, even on a single CPU"""
+    monkeypatch.setattr(parallel_engine, 'PARALLEL_MAX_WORKERS', 2)
+    monkeypatch.setattr(parallel_engine, '_pool', None)
+    yield
+    if parallel_engine._pool is not None:
+        parallel_engine._pool.shutdown(cancel_futures=True)
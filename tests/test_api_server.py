@@ -0,0 +1,81 @@
+"""
+Tests for the GradeFlow API server's status codes and /metrics.
+"""
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from src.api.server import PoolSaturated, WorkerPool, create_app
+
+CSV_BODY = (
+    "Roll No,Name,Gender,Total\n"
+    "S001,Alice Johnson,Female,78\n"
+    "S002,Bob Smith,Male,45\n"
+    "S003,Carol White,Female,91\n"
+).encode()
+
+
+@pytest.fixture
+def client():
+    app = create_app(max_workers=1, max_queue=1)
+    yield app.test_client()
+    app.extensions['gradeflow']['pool'].shutdown()
+
+
+def test_status_codes_and_metrics(client):
+    assert client.get('/health').status_code == 200
+    assert client.post('/validate', data=CSV_BODY, content_type='text/csv').status_code == 200
+    assert client.post('/validate', data=b'hello', content_type='text/plain').status_code == 415
+
+    # Streamed rows are recorded once the body has been read
+    response = client.post('/grade', data=CSV_BODY, content_type='text/csv')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    metrics = response.get_json()
+    assert metrics['/health']['requests'] == 1
+    assert metrics['/validate']['requests'] == 2
+    assert metrics['/validate']['errors'] == 1
+    assert metrics['/grade']['requests'] == 1
+    assert metrics['/grade']['errors'] == 0
+    assert metrics['/grade']['p95_ms'] >= 0
+    # The /metrics request itself is recorded after it has been answered
+    assert '/metrics' not in metrics
+    assert client.get('/metrics').get_json()['/metrics']['requests'] == 1
+
+
+def test_timed_out_work_keeps_its_slot_and_saturates_the_pool():
+    pool = WorkerPool(max_workers=1, max_queue=2, timeout=0.05)
+    release = threading.Event()
+    finished = threading.Event()
+
+    def stuck():
+        release.wait(10)
+        finished.set()
+        return 'late'
+
+    try:
+        with pytest.raises(TimeoutError):
+            pool.run(stuck)
+        # The only worker is still busy, so nothing is queued behind it
+        with pytest.raises(PoolSaturated):
+            pool.run(lambda: 'queued')
+
+        release.set()
+        assert finished.wait(5)
+        for _ in range(100):
+            try:
+                assert pool.run(lambda: 'ok') == 'ok'
+                break
+            except PoolSaturated:
+                # The done callbacks may not have run yet
+                time.sleep(0.01)
+        else:
+            pytest.fail("Slot was not released after the work finished")
+    finally:
+        release.set()
+        pool.shutdown()
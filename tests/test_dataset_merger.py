@@ -0,0 +1,102 @@
+"""
+Tests for correction upserts and the incrementally maintained aggregates.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.dataset_merger import DatasetMerger
+from src.core.grade_calculator import GradeCalculator
+from src.core.validators import DataValidator
+from src.utils.pipeline import ProcessingPipeline
+
+
+def make_frame(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Roll No': [f'S{i:04d}' for i in range(rows)],
+        'Name': [f'Student {i}' for i in range(rows)],
+        'Gender': rng.choice(['Male', 'Female'], rows),
+        'Total': rng.normal(60, 8, rows).clip(0, 100).round(1),
+    })
+
+
+def make_result(df):
+    df = df.copy()
+    df['Grade'] = GradeCalculator.assign_grades(df['Total'])
+    return {
+        'name': 'results.csv',
+        'df': df,
+        'issues': DataValidator.validate_data(df),
+        'stats': GradeCalculator.calculate_statistics(df),
+    }
+
+
+def test_upsert_updates_inserts_and_reports_conflicts():
+    merger = DatasetMerger(make_frame())
+    delta = pd.DataFrame({
+        'Roll No': [' s0001 ', 'S0002', 'S9000', 'S9001', 'S9001', 'S0003'],
+        'Name': [None, 'Student 2', 'New Student', 'Twin', 'Twin', 'Someone Else'],
+        'Total': [95.0, np.nan, 51.0, 40.0, 41.0, 10.0],
+        'Extra': 1,
+    })
+    summary = merger.upsert(delta)
+
+    assert summary['updated'] == 1
+    assert summary['unchanged'] == 1
+    assert summary['inserted'] == 1
+    assert summary['ignored_columns'] == ['Extra']
+    assert sorted(summary['conflicts']['Reason']) == [
+        'Name differs from dataset',
+        'Roll No repeated in correction file',
+        'Roll No repeated in correction file',
+    ]
+    df = merger.df
+    assert df.loc[1, 'Total'] == 95.0
+    assert df.loc[1, 'Grade'] == GradeCalculator.assign_grades([95.0])[0]
+    assert df['Roll No'].iloc[-1] == 'S9000'
+    assert len(df) == 201
+
+
+def test_running_statistics_match_full_recomputation():
+    merger = DatasetMerger(make_frame())
+    merger.upsert(pd.DataFrame({'Roll No': ['S0005', 'S0006', 'S7000'], 'Total': [12.0, 99.5, 33.0]}))
+    merger.upsert(pd.DataFrame({'Roll No': ['S0005', 'S7000'], 'Total': [88.0, 70.0]}))
+
+    incremental = merger.statistics()
+    expected = GradeCalculator.calculate_statistics(merger.df)
+    for key in ('total_students', 'mean_score', 'median_score', 'std_score', 'min_score', 'max_score', 'pass_rate'):
+        assert incremental[key] == pytest.approx(expected[key])
+    assert incremental['grade_distribution'] == expected['grade_distribution']
+    assert merger.histogram.total() == len(merger.df)
+
+
+def test_apply_corrections_validates_corrected_rows():
+    result = make_result(make_frame())
+    assert result['issues']['invalid_totals'] == []
+    assert result['issues']['invalid_genders'] == []
+
+    delta = pd.DataFrame({
+        'Roll No': ['S0010', 'S8000', 'S8001'],
+        'Gender': [None, 'Unknown', np.nan],
+        'Total': [150.0, 55.0, 0.0],
+    })
+    summary = ProcessingPipeline.apply_corrections(result, delta)
+
+    assert summary['updated'] == 1 and summary['inserted'] == 2
+    issues = result['issues']
+    df = result['df']
+    assert issues['invalid_totals'] == [10]
+    assert issues['invalid_genders'] == [len(df) - 2, len(df) - 1]
+    assert issues['severity'] == 'warning'
+    # Outliers are detected on the corrected frame
+    assert len(df) - 1 in issues['outliers']['rows']
+    assert result['stats']['total_students'] == len(df)
+
+
+def test_apply_corrections_without_changes_keeps_issues():
+    result = make_result(make_frame())
+    issues = result['issues']
+    summary = ProcessingPipeline.apply_corrections(result, pd.DataFrame({'Roll No': ['S0001'], 'Total': [np.nan]}))
+    assert summary['unchanged'] == 1
+    assert result['issues'] is issues
@@ -0,0 +1,60 @@
+"""
+Tests for the expression filters of the data preview.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.expression_filter import ExpressionError, compile_filter
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Roll No': ['2021001', '2021002', '2021003', '2021004', '2021005'],
+        'Name': ['Alice Nonan', None, np.nan, 'Nadia Khan', 'Bob Smith'],
+        'Gender': ['Female', 'Male', 'Male', 'Female', 'Male'],
+        'Total': [35.0, 72.5, np.nan, 91.0, 39.5],
+    })
+
+
+def rows(df, text):
+    return np.flatnonzero(compile_filter(text).mask(df)).tolist()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('contains(Name, "non")', [0]),
+    ('contains(Name, "nan")', [0]),
+    ('contains(Name, "NONE")', []),
+    ('startswith(Name, "Na")', [3]),
+    ('startswith(Name, "na")', []),
+    ('not contains(Name, "nan")', [1, 2, 3, 4]),
+])
+def test_text_functions_skip_missing_values(df, text, expected):
+    assert rows(df, text) == expected
+
+
+def test_comparisons_and_arithmetic(df):
+    assert rows(df, 'Total >= 35 and Total < 40 and Gender == "Female"') == [0]
+    assert rows(df, '35 <= Total < 40') == [0, 4]
+    assert rows(df, 'Total * 2 > 150') == [3]
+    assert rows(df, 'isna(Total)') == [2]
+    assert rows(df, 'Gender in ["Male"] and notna(Name)') == [4]
+
+
+def test_roll_no_matches_text_and_numbers(df):
+    assert rows(df, '`Roll No` == 2021002') == [1]
+    assert rows(df, '`Roll No` in ["2021001", 2021005]') == [0, 4]
+    assert rows(df, '`Roll No` != "2021001"') == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('text', [
+    'Total >',
+    '__import__("os")',
+    'Name > 5',
+    'Missing == 1',
+    'Total',
+])
+def test_invalid_expressions_raise(df, text):
+    with pytest.raises(ExpressionError):
+        compile_filter(text).mask(df)
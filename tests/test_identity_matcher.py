@@ -0,0 +1,85 @@
+"""
+Tests for identity conflict detection.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.identity_matcher import CONFLICT_COLUMNS, IdentityMatcher
+
+
+def conflicts(rows):
+    df = pd.DataFrame(rows, columns=['Roll No', 'Name', 'Gender'])
+    found = IdentityMatcher().find_conflicts(df)
+    return {(row['Conflict'], row['Roll No A'], row['Roll No B']) for _, row in found.iterrows()}
+
+
+def test_name_variants_and_shared_roll_numbers():
+    found = conflicts([
+        ('S100', 'Alice Johnson', 'Female'),
+        ('S100', 'A. Johnson', 'Female'),
+        ('S200', 'Brian Lee', 'Male'),
+        ('S200', 'Carla Gomez', 'Female'),
+        # Same record repeated with different spacing and case is not a conflict
+        ('S300', 'Dana  Smith', 'Female'),
+        ('s300 ', 'dana smith', 'Female'),
+    ])
+    assert found == {
+        ('Name variant under one Roll No', 'S100', 'S100'),
+        ('Different names share a Roll No', 'S200', 'S200'),
+    }
+
+
+def test_roll_number_variants():
+    found = conflicts([
+        # Adjacent characters swapped
+        ('S4512', 'Priya Nair', 'Female'),
+        ('S4152', 'Priya Nair', 'Female'),
+        # One character changed, identical name and gender
+        ('S7301', 'Omar Haddad', 'Male'),
+        ('S7381', 'Omar Haddad', 'Male'),
+    ])
+    assert found == {
+        ('Roll No variant for one name', 'S4512', 'S4152'),
+        ('Roll No variant for one name', 'S7301', 'S7381'),
+    }
+
+
+@pytest.mark.parametrize('rows', [
+    # Consecutive Roll Nos are usually different students with the same name
+    [('S1009', 'Wei Chen', 'Male'), ('S1010', 'Wei Chen', 'Male')],
+    # A one-character change needs the same gender as well
+    [('S7301', 'Omar Haddad', 'Male'), ('S7381', 'Omar Haddad', 'Female')],
+    # Shared last name only
+    [('S5000', 'Maria Garcia', 'Female'), ('S5001', 'Jose Garcia', 'Male')],
+])
+def test_different_students_are_not_flagged(rows):
+    assert conflicts(rows) == set()
+
+
+def test_missing_values_and_columns():
+    df = pd.DataFrame({
+        'Roll No': ['S1', None, 'S1', 'S2'],
+        'Name': ['Ann Lee', 'Ann Lee', np.nan, 'Bo Kim'],
+    })
+    found = IdentityMatcher().find_conflicts(df)
+    assert found.empty and found.columns.tolist() == CONFLICT_COLUMNS
+    assert IdentityMatcher().find_conflicts(df[['Name']]).empty
+
+
+def test_conflicts_are_found_at_scale():
+    rng = np.random.default_rng(2)
+    rows = 20_000
+    first = rng.choice(['Ann', 'Ben', 'Cara', 'Dev', 'Eli', 'Fay'], rows)
+    last = np.char.add('Family', rng.integers(0, 5_000, rows).astype(str))
+    df = pd.DataFrame({
+        'Roll No': np.char.add('R', np.arange(100_000, 100_000 + rows).astype(str)),
+        'Name': np.char.add(np.char.add(first, ' '), last),
+        'Gender': rng.choice(['Male', 'Female'], rows),
+    })
+    # Plant a second spelling of one student under the same Roll No
+    planted = pd.DataFrame({'Roll No': [df['Roll No'][123]], 'Name': [f"{first[123][0]}. {last[123]}"],
+                            'Gender': [df['Gender'][123]]})
+    found = IdentityMatcher().find_conflicts(pd.concat([df, planted], ignore_index=True))
+    assert (found['Conflict'] == 'Name variant under one Roll No').sum() == 1
+    assert found.loc[found['Conflict'] == 'Name variant under one Roll No', 'Roll No A'].item() == df['Roll No'][123]
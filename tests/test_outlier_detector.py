@@ -0,0 +1,47 @@
+"""
+Tests for histogram-based outlier fences.
+"""
+import numpy as np
+import pandas as pd
+
+from src.core.outlier_detector import OutlierDetector
+
+
+def lower_quantile(values, q):
+    """q-quantile as the first sorted value whose running count reaches q * n"""
+    values = np.sort(values)
+    return values[int(np.ceil(q * len(values))) - 1]
+
+
+def test_fences_match_exact_quantiles_per_group():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'Total': rng.integers(20, 95, 3000).astype(float),
+        'Section': rng.choice([f'S{i}' for i in range(40)] + [None], 3000),
+    })
+    detector = OutlierDetector(group_columns=['Section'], min_group_size=1)
+    flags, thresholds = detector.detect(df)
+
+    sections = thresholds[thresholds['Scope'] == 'Section'].set_index('Group')
+    labels = df['Section'].fillna('Unknown')
+    for group, totals in df['Total'].groupby(labels):
+        row = sections.loc[group]
+        median = lower_quantile(totals, 0.5)
+        assert row['Count'] == len(totals)
+        assert row['Q1'] == lower_quantile(totals, 0.25)
+        assert row['Median'] == median
+        assert row['Q3'] == lower_quantile(totals, 0.75)
+        assert row['MAD'] == lower_quantile(np.abs(totals - median), 0.5)
+    assert flags.columns.tolist() == ['Overall IQR', 'Overall MAD', 'Section IQR', 'Section MAD']
+
+
+def test_extreme_scores_are_flagged_and_small_groups_skipped():
+    totals = np.r_[np.linspace(40, 80, 100), [2.0, 0.5]]
+    df = pd.DataFrame({'Total': totals, 'Gender': ['Male'] * 101 + ['Female']})
+    flags, thresholds = OutlierDetector(group_columns=['Gender'], min_group_size=5).detect(df)
+
+    assert flags['Overall IQR'].iloc[-2:].tolist() == [True, True]
+    assert not flags['Overall IQR'].iloc[:100].any()
+    female = thresholds[(thresholds['Scope'] == 'Gender') & (thresholds['Group'] == 'Female')].iloc[0]
+    assert np.isnan(female['IQR Low'])
+    assert not flags['Gender IQR'].iloc[-1]
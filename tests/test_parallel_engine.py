@@ -0,0 +1,46 @@
+"""
+Tests for chunked validation and grading in worker processes.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.grade_calculator import GradeCalculator
+from src.core.validators import DataValidator
+from src.utils.engine_benchmark import generate_frame
+from src.utils.parallel_engine import ParallelEngine
+
+
+def check_results(df, results):
+    codes, uniques = pd.factorize(df['Gender'])
+    np.testing.assert_array_equal(results['gender_codes'], codes)
+    assert results['gender_categories'] == list(uniques)
+    np.testing.assert_array_equal(results['invalid_genders'], DataValidator.invalid_gender_mask(df['Gender']))
+    np.testing.assert_array_equal(results['invalid_totals'], DataValidator.invalid_total_mask(df['Total']))
+    assert results['grades'].tolist() == list(GradeCalculator.assign_grades(df['Total'].astype(float)))
+
+
+@pytest.mark.parametrize('min_rows', [10_000, 0])
+def test_chunks_match_whole_column_results(pool, min_rows):
+    df = generate_frame(5_000, seed=4)
+    # Later chunks see categories first seen in earlier ones and a new one
+    df.loc[4_990:, 'Gender'] = 'Unknown'
+    rows = []
+    results = ParallelEngine(min_rows=min_rows, chunk_rows=700).run(df, progress=rows.append)
+    check_results(df, results)
+    assert max(rows) == len(df)
+
+
+@pytest.mark.parametrize('min_rows', [10_000, 0])
+def test_integer_totals_and_categorical_genders(pool, min_rows):
+    df = pd.DataFrame({
+        'Total': np.arange(-3, 117, dtype=np.int64),
+        'Gender': pd.Categorical(['Female', None, 'Male'] * 40),
+    })
+    check_results(df, ParallelEngine(min_rows=min_rows, chunk_rows=25).run(df))
+
+
+def test_missing_columns_are_skipped():
+    df = pd.DataFrame({'Total': [10.0, 50.0]})
+    results = ParallelEngine().run(df)
+    assert set(results) == {'invalid_totals', 'grades'}
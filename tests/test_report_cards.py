@@ -0,0 +1,73 @@
+"""
+Tests for bulk report card generation.
+"""
+import base64
+import io
+import re
+import zipfile
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.report_cards import ReportCardGenerator
+
+# Dictionary and data of each stream object, without running into other objects
+STREAM = re.compile(rb'\bobj\s*<<((?:(?!endobj).)*?)>>\s*stream\r?\n(.*?)endstream', re.S)
+
+
+def streams(pdf):
+    """Decoded content of every stream in a PDF, keyed by its object type"""
+    decoded = {'page': [], 'form': []}
+    for dictionary, data in STREAM.findall(pdf):
+        if b'/ASCII85Decode' in dictionary:
+            data = base64.a85decode(data.strip(), adobe=True)
+        if b'/FlateDecode' in dictionary:
+            data = zlib.decompress(data)
+        decoded['form' if b'/Subtype /Form' in dictionary else 'page'].append(data)
+    return decoded
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(1)
+    rows = 7
+    return pd.DataFrame({
+        'Roll No': ['2021001', '2021001', 'A/7', '2021004', '2021005', '2021006', '2021007'],
+        'Name': [f'Student {i}' for i in range(rows)],
+        'Gender': rng.choice(['Male', 'Female'], rows),
+        'Total': [88.0, 31.5, np.nan, 64.0, 72.0, 45.0, 99.0],
+        'Grade': ['A', 'F', '', 'C', 'B', 'D', 'A+'],
+    })
+
+
+@pytest.mark.parametrize('min_parallel', [10_000, 0])
+def test_every_card_is_a_complete_pdf(df, min_parallel):
+    archive = io.BytesIO()
+    written = []
+    summary = ReportCardGenerator(batch_size=3, min_parallel=min_parallel).write_zip(
+        df, {'mean_score': df['Total'].mean()}, archive, progress=written.append
+    )
+
+    assert summary['cards'] == len(df)
+    assert written[-1] == len(df)
+    with zipfile.ZipFile(archive) as cards:
+        names = cards.namelist()
+        assert sorted(names) == sorted([
+            '2021001.pdf', '2021001_1.pdf', 'A_7.pdf', '2021004.pdf', '2021005.pdf', '2021006.pdf', '2021007.pdf'
+        ])
+        for name in names:
+            pdf = cards.read(name)
+            assert pdf.startswith(b'%PDF-') and pdf.rstrip().endswith(b'%%EOF')
+            assert b'/Count 1' in pdf
+            content = streams(pdf)
+            # Static parts live in the form, the page only places it and adds the fields
+            assert len(content['form']) == 1 and len(content['page']) == 1
+            assert b'Grade Scale' in content['form'][0]
+            assert b'/FormXob.CardStatic Do' in content['page'][0]
+
+        page = streams(cards.read('2021001_1.pdf'))['page'][0]
+        assert b'(Student 1)' in page and b'(31.5)' in page and b'(Fail)' in page
+        page = streams(cards.read('A_7.pdf'))['page'][0]
+        assert b'(N/A)' in page
@@ -0,0 +1,83 @@
+"""
+Tests for the score histogram and the what-if grade simulator.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import GRADE_SCALE
+from src.core.grade_calculator import GradeCalculator
+from src.core.grade_simulator import GradeSimulator
+from src.core.score_histogram import ScoreHistogram
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(7)
+    rows = 4_000
+    # Two-decimal scores, fractions just around whole-number cutoffs, out-of-range and missing values
+    totals = np.r_[
+        rng.uniform(0, 100, rows).round(2),
+        [39.99, 40.0, 40.005, 49.995, 89.99, 90.0, 100.0, 0.0, -1.0, 100.5, np.nan],
+    ]
+    return pd.DataFrame({
+        'Total': totals,
+        'Gender': rng.choice(['Male', 'Female', None], len(totals)),
+    })
+
+
+def grade_counts(totals, grade_scale):
+    codes = GradeCalculator.grade_codes(totals, grade_scale)
+    return np.bincount(codes, minlength=len(GradeCalculator.grade_labels(grade_scale)))
+
+
+def test_bins_split_on_and_between_grid_points():
+    histogram = ScoreHistogram()
+    assert histogram.bin_index(40.0) == 8000
+    assert histogram.bin_index(40.005) == 8001
+    assert histogram.bin_index(39.999) == 7999
+    # 89.99 / 0.01 is 8998.999... in floating point
+    assert histogram.bin_index(89.99) == 17998
+    assert histogram.bin_scores[8000] == 40.0
+    assert histogram.bin_scores[8001] == 40.005
+
+
+@pytest.mark.parametrize('grade_scale', [
+    GRADE_SCALE,
+    {'A': (75, 100), 'B': (50, 74), 'C': (40, 49), 'F': (0, 39)},
+])
+def test_simulated_distribution_matches_grader(df, grade_scale):
+    histogram = ScoreHistogram.from_frame(df)
+    distribution = GradeSimulator(histogram).simulate(grade_scale, 40)['distribution']
+
+    expected = grade_counts(df['Total'].to_numpy(), grade_scale)
+    labels = GradeCalculator.grade_labels(grade_scale)
+    assert distribution['Count'].to_dict() == dict(zip(labels, expected.tolist()))
+
+    female = df['Gender'] == 'Female'
+    expected_female = grade_counts(df.loc[female, 'Total'].to_numpy(), grade_scale)
+    assert distribution['Female'].tolist() == expected_female.tolist()
+    assert distribution['Unknown'].sum() == df['Gender'].isna().sum()
+
+
+@pytest.mark.parametrize('cutoff', [0, 35, 39.99, 40, 40.005, 49.995, 90, 100, 100.25])
+def test_count_at_least_matches_comparison(df, cutoff):
+    histogram = ScoreHistogram.from_frame(df)
+    assert histogram.count_at_least(cutoff) == int((df['Total'] >= cutoff).sum())
+    male = df['Gender'] == 'Male'
+    assert histogram.count_at_least(cutoff, 'Male') == int((df.loc[male, 'Total'] >= cutoff).sum())
+
+
+def test_remove_and_merge(df):
+    histogram = ScoreHistogram.from_frame(df)
+    assert histogram.total() == len(df)
+    assert histogram.missing.sum() == 1
+    assert histogram.below.sum() == 1 and histogram.above.sum() == 1
+
+    half = ScoreHistogram.from_frame(df.iloc[:2_000])
+    half.merge(ScoreHistogram.from_frame(df.iloc[2_000:]))
+    for group in histogram.groups:
+        assert half.count_at_least(40, group) == histogram.count_at_least(40, group)
+
+    histogram.remove(df['Total'], df['Gender'])
+    assert histogram.total() == 0
@@ -0,0 +1,65 @@
+"""
+Tests for on-disk snapshots of processed results.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.pipeline import ProcessingPipeline
+from src.utils.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    # Process for real instead of reopening the shared snapshot cache
+    monkeypatch.setattr('src.utils.pipeline.SNAPSHOT_ENABLED', False)
+    rng = np.random.default_rng(0)
+    rows = 300
+    df = pd.DataFrame({
+        'Roll No': [f'S{i:03d}' for i in range(rows)],
+        'Name': [f'Student {i}' for i in range(rows)],
+        'Gender': rng.choice(['Male', 'Female', 'Other'], rows),
+        'Total': rng.normal(60, 20, rows).round(1),
+    })
+    data = df.to_csv(index=False).encode()
+    return data, ProcessingPipeline.run(None, ProcessingPipeline.make_file(data, 'results.csv'))
+
+
+def test_round_trip_restores_frame_issues_and_histogram(tmp_path, processed):
+    data, result = processed
+    store = SnapshotStore(str(tmp_path))
+    key = store.key(data)
+    assert store.save(key, result)
+
+    restored = store.load(key)
+    pd.testing.assert_frame_equal(restored['df'], result['df'])
+    assert restored['issues'] == result['issues']
+    assert restored['stats'] == result['stats']
+    histogram, expected = restored['histogram'], result['histogram']
+    assert histogram.groups == expected.groups
+    np.testing.assert_array_equal(histogram.counts, expected.counts)
+    np.testing.assert_array_equal(histogram.missing, expected.missing)
+
+    # Numeric columns are views onto the memory map
+    with pytest.raises(ValueError, match='read-only'):
+        restored['df']['Total'].to_numpy()[0] = 0.0
+
+
+def test_nothing_is_unpickled(tmp_path, processed):
+    data, result = processed
+    store = SnapshotStore(str(tmp_path))
+    key = store.key(data)
+    store.save(key, result)
+
+    with open(os.path.join(str(tmp_path), key + '.npy'), 'wb') as file:
+        np.save(file, np.array([{'payload': 1}], dtype=object), allow_pickle=True)
+    assert store.load(key) is None
+    assert os.listdir(str(tmp_path)) == []
+
+    store.save(key, result)
+    with open(os.path.join(str(tmp_path), key + '.json'), 'wb') as file:
+        pickle.dump(result['issues'], file)
+    assert store.load(key) is None
@@ -0,0 +1,64 @@
+"""
+Tests for split export: one file per group, bundled into a zip.
+"""
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.split_export import MISSING_GROUP, SplitExporter
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Roll No': [f'S{i:02d}' for i in range(10)],
+        'Section': ['B', 'A', 'A/1', 'B', None, 'A 1', 'A', 'B', np.nan, 'A/1'],
+        'Total': [55.0, 71.0, 40.0, 66.5, 90.0, 12.0, 83.0, 47.0, 38.0, 99.0],
+    })
+
+
+def test_partition_keeps_file_order_and_puts_missing_last(df):
+    labels, order, offsets = SplitExporter.partition(df, 'Section')
+    assert labels == ['A', 'A 1', 'A/1', 'B', MISSING_GROUP]
+    groups = {label: order[offsets[i]:offsets[i + 1]].tolist() for i, label in enumerate(labels)}
+    assert groups == {'A': [1, 6], 'A 1': [5], 'A/1': [2, 9], 'B': [0, 3, 7], MISSING_GROUP: [4, 8]}
+
+
+def test_mixed_types_partition_in_file_order():
+    labels, order, offsets = SplitExporter.partition(pd.DataFrame({'Section': [2, 'A', 2, None]}), 'Section')
+    assert labels == ['2', 'A', MISSING_GROUP]
+    assert order.tolist() == [0, 2, 1, 3]
+    assert offsets.tolist() == [0, 2, 3, 4]
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+@pytest.mark.parametrize('min_parallel', [10_000, 0])
+def test_zip_has_one_safely_named_file_per_group(pool, df, file_format, min_parallel):
+    archive = io.BytesIO()
+    written = []
+    summary = SplitExporter(file_format, batch_rows=3, min_parallel=min_parallel).write_zip(
+        df, 'Section', archive, progress=written.append
+    )
+
+    assert summary['files'] == 5 and summary['rows'] == len(df)
+    assert written[-1] == 5
+    with zipfile.ZipFile(archive) as files:
+        # 'A 1' and 'A/1' both become A_1, so the second one is numbered
+        assert sorted(files.namelist()) == sorted(
+            f'Section_{stem}.{file_format}' for stem in ['A', 'A_1', 'A_1_1', 'B', MISSING_GROUP]
+        )
+        read = pd.read_csv if file_format == 'csv' else pd.read_parquet
+        parts = {name: read(io.BytesIO(files.read(name))) for name in files.namelist()}
+
+    assert parts[f'Section_B.{file_format}']['Roll No'].tolist() == ['S00', 'S03', 'S07']
+    assert parts[f'Section_A_1.{file_format}']['Roll No'].tolist() == ['S05']
+    assert parts[f'Section_A_1_1.{file_format}']['Roll No'].tolist() == ['S02', 'S09']
+    assert sum(len(part) for part in parts.values()) == len(df)
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(ValueError):
+        SplitExporter('json')